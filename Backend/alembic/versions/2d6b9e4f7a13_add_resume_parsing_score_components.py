@@ -0,0 +1,34 @@
+"""Score components on resume_parsing
+
+Revision ID: 2d6b9e4f7a13
+Revises: 8c1f4e7a2b59
+Create Date: 2026-10-19 21:04:17.530912
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2d6b9e4f7a13'
+down_revision: Union[str, Sequence[str], None] = '8c1f4e7a2b59'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('resume_parsing', sa.Column('keyword_coverage', sa.Float(), nullable=True))
+    op.add_column('resume_parsing', sa.Column('skill_similarity', sa.Float(), nullable=True))
+    op.add_column('resume_parsing', sa.Column('description_similarity', sa.Float(), nullable=True))
+    op.add_column('resume_parsing', sa.Column('experience_years', sa.Float(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('resume_parsing', 'experience_years')
+    op.drop_column('resume_parsing', 'description_similarity')
+    op.drop_column('resume_parsing', 'skill_similarity')
+    op.drop_column('resume_parsing', 'keyword_coverage')
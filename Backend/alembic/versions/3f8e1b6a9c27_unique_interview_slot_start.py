@@ -0,0 +1,57 @@
+"""Unique interview slot per availability and start time
+
+Revision ID: 3f8e1b6a9c27
+Revises: 9c4d2a7f51b3
+Create Date: 2026-10-19 16:21:48.310274
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f8e1b6a9c27'
+down_revision: Union[str, Sequence[str], None] = '9c4d2a7f51b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # /hr/generate-slots stored the day at midnight in `date`; the slot's start is date + start_time
+    op.execute("""
+        UPDATE interview_slot
+        SET date = date_trunc('day', date) + start_time::time
+        WHERE date::time <> start_time::time
+    """)
+
+    # Keep one row per (availability_id, date): booked first, then one an interview points at, then the oldest
+    op.execute("""
+        CREATE TEMPORARY TABLE interview_slot_dedupe ON COMMIT DROP AS
+        SELECT id, first_value(id) OVER (
+            PARTITION BY availability_id, date
+            ORDER BY coalesce(is_booked, false) DESC,
+                     EXISTS (SELECT 1 FROM interview i WHERE i.slot_id = s.id) DESC,
+                     id
+        ) AS keep_id
+        FROM interview_slot s
+    """)
+    op.execute("""
+        UPDATE interview SET slot_id = d.keep_id
+        FROM interview_slot_dedupe d
+        WHERE interview.slot_id = d.id AND d.id <> d.keep_id
+    """)
+    op.execute("""
+        DELETE FROM interview_slot s
+        USING interview_slot_dedupe d
+        WHERE s.id = d.id AND d.id <> d.keep_id
+    """)
+    op.execute("DROP TABLE interview_slot_dedupe")
+
+    op.create_unique_constraint('uq_interview_slot_availability_id_date', 'interview_slot', ['availability_id', 'date'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('uq_interview_slot_availability_id_date', 'interview_slot', type_='unique')
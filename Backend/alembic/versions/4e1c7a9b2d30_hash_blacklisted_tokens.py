@@ -0,0 +1,50 @@
+"""Hash blacklisted tokens and track their expiry
+
+Revision ID: 4e1c7a9b2d30
+Revises: d9a499dae9fa
+Create Date: 2026-10-19 09:12:41.518203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4e1c7a9b2d30'
+down_revision: Union[str, Sequence[str], None] = 'd9a499dae9fa'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('blacklisted_tokens', sa.Column('token_hash', sa.String(length=64), nullable=True))
+    op.add_column('blacklisted_tokens', sa.Column('expires_at', sa.DateTime(timezone=True), nullable=True))
+
+    # Existing rows only have the raw JWT; their real expiry is unknown so keep
+    # them for one refresh-token lifetime (7 days) from the moment they were revoked.
+    op.execute(
+        "UPDATE blacklisted_tokens "
+        "SET token_hash = encode(sha256(convert_to(token, 'UTF8')), 'hex'), "
+        "expires_at = blacklisted_at + interval '7 days'"
+    )
+
+    op.alter_column('blacklisted_tokens', 'token_hash', nullable=False)
+    op.alter_column('blacklisted_tokens', 'expires_at', nullable=False)
+    op.drop_column('blacklisted_tokens', 'token')
+    op.create_unique_constraint('uq_blacklisted_tokens_token_hash', 'blacklisted_tokens', ['token_hash'])
+    op.create_index(op.f('ix_blacklisted_tokens_expires_at'), 'blacklisted_tokens', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Raw tokens cannot be recovered from their hashes, so revoked entries are dropped.
+    op.execute("DELETE FROM blacklisted_tokens")
+    op.drop_index(op.f('ix_blacklisted_tokens_expires_at'), table_name='blacklisted_tokens')
+    op.drop_constraint('uq_blacklisted_tokens_token_hash', 'blacklisted_tokens', type_='unique')
+    op.drop_column('blacklisted_tokens', 'expires_at')
+    op.drop_column('blacklisted_tokens', 'token_hash')
+    op.add_column('blacklisted_tokens', sa.Column('token', sa.Text(), nullable=False))
+    op.create_unique_constraint('blacklisted_tokens_token_key', 'blacklisted_tokens', ['token'])
@@ -0,0 +1,46 @@
+"""Full-text search vector over candidates
+
+Revision ID: 5a7d3c9e2f14
+Revises: 3f8e1b6a9c27
+Create Date: 2026-10-19 18:05:12.447190
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5a7d3c9e2f14'
+down_revision: Union[str, Sequence[str], None] = '3f8e1b6a9c27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SEARCH_VECTOR = (
+    "setweight(to_tsvector('english'::regconfig, coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('english'::regconfig, coalesce(skills, '')), 'A') || "
+    "setweight(to_tsvector('english'::regconfig, coalesce(experience, '')), 'B') || "
+    "setweight(to_tsvector('english'::regconfig, coalesce(education, '')), 'C') || "
+    "setweight(to_tsvector('english'::regconfig, coalesce(resume_text, '')), 'D')"
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('candidate', sa.Column('resume_text', sa.Text(), nullable=True))
+    # a stored generated column is filled for existing rows here and kept in step by Postgres afterwards
+    op.add_column('candidate', sa.Column('search_vector', postgresql.TSVECTOR(), sa.Computed(SEARCH_VECTOR, persisted=True)))
+    with op.get_context().autocommit_block():
+        op.create_index('ix_candidate_search_vector', 'candidate', ['search_vector'], unique=False,
+                        postgresql_using='gin', postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_candidate_search_vector', table_name='candidate', postgresql_concurrently=True, if_exists=True)
+    op.drop_column('candidate', 'search_vector')
+    op.drop_column('candidate', 'resume_text')
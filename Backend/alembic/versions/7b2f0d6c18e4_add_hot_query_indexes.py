@@ -0,0 +1,56 @@
+"""Add indexes for the hot candidate, interview and job queries
+
+Revision ID: 7b2f0d6c18e4
+Revises: 4e1c7a9b2d30
+Create Date: 2026-10-19 11:40:07.902114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7b2f0d6c18e4'
+down_revision: Union[str, Sequence[str], None] = '4e1c7a9b2d30'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (name, table, columns)
+INDEXES = [
+    ('ix_candidate_job_id_ai_score', 'candidate', ['job_id', sa.text('ai_score DESC NULLS LAST'), 'candidate_id']),
+    ('ix_candidate_company_id_ai_score', 'candidate', ['company_id', sa.text('ai_score DESC NULLS LAST'), 'candidate_id']),
+    ('ix_candidate_job_id_selected_for_interview', 'candidate', ['job_id', 'selected_for_interview']),
+    ('ix_candidate_job_id_interviewed', 'candidate', ['job_id', 'interviewed']),
+    ('ix_candidate_job_id_selected', 'candidate', ['job_id', 'selected']),
+    ('ix_candidate_email', 'candidate', ['email']),
+    ('ix_interview_candidate_id_status_scheduled_time', 'interview', ['candidate_id', 'status', 'scheduled_time']),
+    ('ix_interview_status_scheduled_time', 'interview', ['status', 'scheduled_time']),
+    ('ix_interview_job_id', 'interview', ['job_id']),
+    ('ix_resume_parsing_candidate_id', 'resume_parsing', ['candidate_id']),
+    ('ix_answer_candidate_id', 'answer', ['candidate_id']),
+    ('ix_job_company_id', 'job', ['company_id']),
+    ('ix_job_hr_id', 'job', ['hr_id']),
+    ('ix_questions_form_job_id', 'questions_form', ['job_id']),
+    ('ix_question_form_id', 'question', ['form_id']),
+    ('ix_google_token_hr_id', 'google_token', ['hr_id']),
+    ('ix_hr_availability_hr_id_is_selected', 'hr_availability', ['hr_id', 'is_selected']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY keeps the candidate/interview tables writable while the
+    # indexes build, but cannot run inside the migration transaction.
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, unique=False, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,57 @@
+"""Skill taxonomy and candidate_skill join table
+
+Revision ID: 8c1f4e7a2b59
+Revises: 5a7d3c9e2f14
+Create Date: 2026-10-19 19:12:40.118305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c1f4e7a2b59'
+down_revision: Union[str, Sequence[str], None] = '5a7d3c9e2f14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'skill',
+        sa.Column('skill_id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('skill_id'),
+        sa.UniqueConstraint('name'),
+    )
+    op.create_table(
+        'skill_alias',
+        sa.Column('alias', sa.String(length=100), nullable=False),
+        sa.Column('skill_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['skill_id'], ['skill.skill_id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('alias'),
+    )
+    op.create_index('ix_skill_alias_skill_id', 'skill_alias', ['skill_id'], unique=False)
+    op.create_table(
+        'candidate_skill',
+        sa.Column('candidate_id', sa.Integer(), nullable=False),
+        sa.Column('skill_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['candidate_id'], ['candidate.candidate_id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['skill_id'], ['skill.skill_id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('candidate_id', 'skill_id'),
+    )
+    op.create_index('ix_candidate_skill_skill_id_candidate_id', 'candidate_skill', ['skill_id', 'candidate_id'], unique=False)
+    # existing candidates: python scripts/backfill_candidate_skills.py
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_candidate_skill_skill_id_candidate_id', table_name='candidate_skill')
+    op.drop_table('candidate_skill')
+    op.drop_index('ix_skill_alias_skill_id', table_name='skill_alias')
+    op.drop_table('skill_alias')
+    op.drop_table('skill')
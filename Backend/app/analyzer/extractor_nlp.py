@@ -4,6 +4,8 @@ from typing import Tuple, Optional, List
 import logging
 from collections import Counter
 
+from app.analyzer.skill_normalizer import skill_normalizer
+
 logger = logging.getLogger(__name__)
 
 try:
@@ -14,21 +16,6 @@ except:
     except:
         nlp = None
 
-# ==========================================
-# TRUTH LISTS (The "Gazetteer")
-# ==========================================
-# 100% Accuracy for known terms. Add more terms here to improve specific domains.
-COMMON_SKILL_DB = {
-    # Languages
-    "python", "java", "c++", "c#", "javascript", "typescript", "ruby", "php", "swift", "kotlin", "go", "rust", "sql", "html", "css",
-    # Frameworks/Libs
-    "react", "angular", "vue", "node.js", "django", "flask", "fastapi", "spring", "spring boot", "net core", "laravel", "pandas", "numpy", "scikit-learn", "tensorflow", "pytorch", "keras",
-    # Tools/Infra
-    "docker", "kubernetes", "aws", "azure", "gcp", "git", "jenkins", "jira", "linux", "unix", "redis", "mongodb", "postgresql", "mysql", "oracle",
-    # Concepts
-    "machine learning", "deep learning", "nlp", "computer vision", "data science", "agile", "scrum", "devops", "ci/cd", "rest api", "graphql", "microservices"
-}
-
 # ==========================================
 # PATTERNS
 # ==========================================
@@ -125,7 +112,7 @@ def extract_education(text: str) -> Optional[str]:
 def extract_skills(text: str) -> Optional[str]:
     """
     Hybrid Skill Extraction: 
-    1. Gazetteers (Common DB) - 100% Precision
+    1. Skill taxonomy (skill_normalizer) - high precision
     2. Section-Specific NLP - High Recall
     """
     if not text: return None
@@ -134,16 +121,9 @@ def extract_skills(text: str) -> Optional[str]:
     # Focus heavily on the "Skills" section if it exists
     skill_text = sections["skills"] + "\n" + sections["experience"]
     
-    found_skills = set()
-    text_lower = text.lower()
-    
-    # 1. Direct DB Lookup (The "Gazetteer" - Accuracy King)
-    # Checks if known skills exist anywhere in the text
-    for skill in COMMON_SKILL_DB:
-        # Use boundary check to avoid partial matches (e.g. "Go" in "Good")
-        pattern = r"\b" + re.escape(skill) + r"\b"
-        if re.search(pattern, text_lower):
-            found_skills.add(skill.title())
+    # 1. Taxonomy lookup (the "Gazetteer"): one token pass over the text,
+    # every spelling of a known skill resolved to its canonical name
+    found_skills = skill_normalizer.find(text)
             
     # 2. NLP Extraction (for niche/unknown skills)
     if nlp:
@@ -153,7 +133,7 @@ def extract_skills(text: str) -> Optional[str]:
         for ent in doc.ents:
             if ent.label_ in ["ORG", "PRODUCT", "LANGUAGE"]:
                 if len(ent.text) > 2:
-                    found_skills.add(ent.text.strip().title())
+                    found_skills.append(ent.text.strip().title())
 
         # Extract Capitalized Technical Terms (Heuristic)
         # Look for capitalized words in the 'Skills' section specifically
@@ -161,10 +141,13 @@ def extract_skills(text: str) -> Optional[str]:
             skills_doc = nlp(sections["skills"])
             for token in skills_doc:
                 if token.is_alpha and token.is_title and not token.is_stop:
-                     found_skills.add(token.text)
+                     found_skills.append(token.text)
     
-    # Filter noise
-    filtered = {s for s in found_skills if len(s) > 1 and s.lower() not in ["the", "and", "team", "work"]}
+    # Filter noise; NLP finds are canonicalised too, so "Nodejs" and "Node.js" are one skill
+    filtered = {
+        s for s in skill_normalizer.normalize_list(found_skills)
+        if len(s) > 1 and s.lower() not in ["the", "and", "team", "work"]
+    }
     return ", ".join(sorted(filtered))
 
 
@@ -174,20 +157,11 @@ def extract_skills_from_text(text: str) -> Optional[str]:
 
 def match_skills_with_requirements(resume_skills: Optional[str], job_requirements: str) -> Optional[str]:
     """
-    Refined matching using Set Intersection.
+    The resume skills the requirements ask for, canonicalised. Token-level:
+    "k8s" matches "Kubernetes", "Go" does not match "Good".
     """
     if not resume_skills or not job_requirements: return resume_skills
-    
-    req_lower = job_requirements.lower()
-    res_list = [s.strip() for s in resume_skills.split(",")]
-    matched = []
-    
-    for skill in res_list:
-        # Exact substring match (high confidence)
-        if skill.lower() in req_lower:
-            matched.append(skill)
-    
-    return ", ".join(matched)
+    return ", ".join(skill_normalizer.match(resume_skills, job_requirements))
 
 
 def extract_resume_fields(text: str) -> Tuple[Optional[str], Optional[str], Optional[str]]:
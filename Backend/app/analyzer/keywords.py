@@ -0,0 +1,46 @@
+from typing import Iterable, Set
+
+from app.analyzer.skill_normalizer import skill_normalizer
+
+STOP_WORDS = {'and', 'or', 'the', 'with', 'in', 'of', 'to', 'for', 'a', 'an', 'is', 'are', 'be', 'will', 'must', 'have', 'ability', 'knowledge', 'experience', 'working', 'proficient', 'good', 'strong'}
+
+
+def _is_keyword(term: str) -> bool:
+    return len(term) >= 2 and term not in STOP_WORDS and any(ch.isalpha() for ch in term)
+
+
+def extract_keywords(required_text: str) -> Set[str]:
+    """
+    Requirement keywords, minus filler words: the canonical key of every
+    skill however it is spelled ('k8s' -> 'kubernetes'), plus the other
+    lower-cased tokens (such as 'c++', 'node.js').
+    """
+    if not required_text: return set()
+    return {term for term in skill_normalizer.terms(required_text) if _is_keyword(term)}
+
+
+def normalize_keywords(keywords: Iterable[str]) -> Set[str]:
+    """Caller-supplied keywords in the form extract_keywords() produces."""
+    normalized = set()
+    for keyword in keywords:
+        canonical = skill_normalizer.canonical(keyword)
+        normalized.add(skill_normalizer.key(canonical) if canonical else " ".join(keyword.casefold().split()))
+    return {kw for kw in normalized if kw}
+
+
+def keyword_coverage(keywords: Iterable[str], candidate_text: str) -> float:
+    """
+    Fraction (0.0 to 1.0) of the keywords found in the candidate text,
+    compared as normalized terms: one tokenization of the text, then a set
+    lookup per keyword.
+    """
+    keywords = set(keywords)
+    if not keywords or not candidate_text: return 0.0
+    terms = skill_normalizer.terms(candidate_text)
+    found = keywords & terms
+    # multi-word keywords that are not known skills match as a token sequence
+    phrases = [kw for kw in keywords - found if " " in kw]
+    if phrases:
+        text = " " + " ".join(token.casefold() for token in skill_normalizer.tokens(candidate_text)) + " "
+        found.update(kw for kw in phrases if f" {kw} " in text)
+    return len(found) / len(keywords)
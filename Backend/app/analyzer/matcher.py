@@ -1,15 +1,18 @@
 import os
 import logging
-from typing import Dict, Any, Set
+from typing import Dict, Any, Sequence
 
+import numpy as np
 from sentence_transformers import SentenceTransformer
 from sklearn.metrics.pairwise import cosine_similarity
 from sqlalchemy.orm import Session
-import re
 
 from app.db import models
 from app.analyzer.extractor import extract_text
+from app.analyzer.keywords import extract_keywords, keyword_coverage
+from app.analyzer.scoring import ScoreComponents, combine, experience_years, normalize_weights
 from app.analyzer.extractor_nlp import extract_resume_fields, extract_resume_fields_matched, match_skills_with_requirements
+from app.services.skills import set_candidate_skills, split_skills
 
 logger = logging.getLogger(__name__)
 
@@ -35,24 +38,7 @@ def calculate_keyword_coverage(required_text: str, candidate_text: str) -> float
     Returns 0.0 to 1.0
     """
     if not required_text or not candidate_text: return 0.0
-    
-  
-    stop_words = {'and', 'or', 'the', 'with', 'in', 'of', 'to', 'for', 'a', 'an', 'is', 'are', 'be', 'will', 'must', 'have', 'ability', 'knowledge', 'experience', 'working', 'proficient', 'good', 'strong'}
-    
-    req_tokens = set(re.findall(r"\b[a-zA-Z#+\.]{2,}\b", required_text.lower()))
-    keywords = {w for w in req_tokens if w not in stop_words}
-    
-    if not keywords: return 0.0
-    
-    # 2. Check overlap
-    cand_lower = candidate_text.lower()
-    matches = 0
-    for kw in keywords:
-        # Boundary match to prevent substring errors (e.g. "R" in "Rest")
-        if re.search(r"\b" + re.escape(kw) + r"\b", cand_lower):
-            matches += 1
-            
-    return matches / len(keywords)
+    return keyword_coverage(extract_keywords(required_text), candidate_text)
 
 def calculate_semantic_similarity(text1: str, text2: str) -> float:
     if not text1 or not text2: return 0.0
@@ -63,47 +49,51 @@ def calculate_semantic_similarity(text1: str, text2: str) -> float:
     except:
         return 0.0
 
-def normalize_weights(job) -> Dict[str, float]:
-    return {"skills": 0.5, "experience": 0.3, "general": 0.2} # Hardcoded optimal weights
+def semantic_similarities(reference: str, texts: Sequence[str]) -> np.ndarray:
+    """
+    Cosine similarity (clipped to 0..1) of each text to the reference, with
+    every text embedded in one batched encode call. Empty texts score 0.
+    """
+    scores = np.zeros(len(texts))
+    present = [i for i, text in enumerate(texts) if text]
+    if not reference or not present:
+        return scores
+    try:
+        embeddings = model.encode([reference] + [texts[i] for i in present], normalize_embeddings=True)
+    except Exception as e:
+        logger.error(f"Embedding failed: {e}")
+        return scores
+    scores[present] = np.clip(embeddings[1:] @ embeddings[0], 0.0, 1.0)
+    return scores
 
-def calculate_ai_score(
-    job_text: str,
-    resume_text: str,
-    skills_extracted: str,
-    experience_extracted: str,
+def score_components(
     job_requirements: str,
     job_description: str,
-    weights: Dict[str, float]
-) -> float:
-    
-    # 1. KEYWORD COVERAGE (The specific "Must Haves") - Weight: 50%
-    # This is the most accurate metric. Do they have the words the job asks for?
-    req_coverage = calculate_keyword_coverage(job_requirements, resume_text)
-    
-    # 2. SKILL SIMILARITY (The "Nice to Haves") - Weight: 20%
-    # Semantic match of extracted skills block vs requirements
-    if skills_extracted and job_requirements:
-        skill_sem = calculate_semantic_similarity(job_requirements, skills_extracted)
+    resume_texts: Sequence[str],
+    skills_extracted: Sequence[str],
+    experience_extracted: Sequence[str],
+) -> ScoreComponents:
+    """
+    The score components of a batch of resumes against one job. The job's
+    keywords are extracted once and each similarity is one encode call for
+    the whole batch.
+    """
+    keywords = extract_keywords(job_requirements) if job_requirements else set()
+    coverage = np.array([keyword_coverage(keywords, text) if text else 0.0 for text in resume_texts], dtype=float)
+
+    # semantic match of the extracted skills block vs requirements; coverage where there is nothing to compare
+    if job_requirements:
+        skill_sem = semantic_similarities(job_requirements, skills_extracted)
+        has_skills = np.array([bool(skills) for skills in skills_extracted], dtype=bool)
+        skill_sem = np.where(has_skills, skill_sem, coverage)
     else:
-        skill_sem = req_coverage # Fallback
-        
-    # 3. DESCRIPTION MATCH (The "Context") - Weight: 30%
-    # Compares full Job Description vs Full Resume (Contextual fit)
-    desc_sem = calculate_semantic_similarity(job_description, resume_text)
-    
-    # 4. WEIGHTED FORMULA
-    # We prioritize Coverage because it represents "Missing Requirements"
-    final_score = (
-        (req_coverage * 0.50) + 
-        (skill_sem * 0.20) + 
-        (desc_sem * 0.30)
-    ) * 100
-    
-    # Boost for high coverage (Reward "Perfect Candidates")
-    if req_coverage > 0.8:
-        final_score += 5
-        
-    return round(min(100, final_score), 2)
+        skill_sem = coverage.copy()
+
+    # full job description vs full resume (contextual fit)
+    desc_sem = semantic_similarities(job_description, resume_texts)
+
+    years = np.array([experience_years(text) for text in experience_extracted], dtype=float)
+    return ScoreComponents(coverage, skill_sem, desc_sem, years)
 
 def generate_ai_scores_for_job(db: Session, job_id: int) -> Dict[str, Any]:
     # Standard boilerplate execution
@@ -117,10 +107,9 @@ def generate_ai_scores_for_job(db: Session, job_id: int) -> Dict[str, Any]:
     failed = 0
     
     # Pre-fetch job data
-    job_text = f"{job.title} {job.requirements}"
     job_reqs = job.requirements or ""
     job_desc = job.description or ""
-    weights = normalize_weights(job)
+    extracted = []  # (candidate, parsing, resume_text)
     
     for candidate in candidates:
         try:
@@ -141,7 +130,9 @@ def generate_ai_scores_for_job(db: Session, job_id: int) -> Dict[str, Any]:
                 failed += 1
                 continue
                 
+            candidate.resume_text = resume_text.replace("\x00", "")
             skills, exp, edu = extract_resume_fields(resume_text)
+            set_candidate_skills(db, candidate.candidate_id, split_skills(skills) + split_skills(candidate.skills))
             
             # Match
             matched_skills = match_skills_with_requirements(skills, job_reqs)
@@ -152,25 +143,34 @@ def generate_ai_scores_for_job(db: Session, job_id: int) -> Dict[str, Any]:
             parsing.experience_extracted = exp or ""
             parsing.education_extracted = edu or ""
             
-            # Score
-            score = calculate_ai_score(
-                job_text, resume_text, matched_skills, exp, 
-                job_reqs, job_desc, weights
-            )
-            
-            parsing.ai_score = score
-            candidate.ai_score = int(score)
-            
             candidate.skills = matched_skills or candidate.skills
             candidate.experience = exp or candidate.experience
             candidate.education = edu or candidate.education
             
             db.commit()
-            processed += 1
+            extracted.append((candidate, parsing, resume_text))
             
         except Exception as e:
+            db.rollback()
             logger.error(f"Failed candidate {candidate.candidate_id}: {e}")
             failed += 1
             continue
+    
+    if extracted:
+        # Score the whole batch at once: one encode call per similarity, then a vectorized combine
+        components = score_components(
+            job_reqs, job_desc,
+            [resume_text for _, _, resume_text in extracted],
+            [parsing.skills_extracted for _, parsing, _ in extracted],
+            [parsing.experience_extracted for _, parsing, _ in extracted],
+        )
+        scores = combine(components, normalize_weights(job), job.experience).tolist()
+        for i, (candidate, parsing, _) in enumerate(extracted):
+            for column, value in components.row(i).items():
+                setattr(parsing, column, value)
+            parsing.ai_score = scores[i]
+            candidate.ai_score = int(scores[i])
+        db.commit()
+        processed = len(extracted)
             
-    return {"status": "success", "processed": processed, "failed": failed}
\ No newline at end of file
+    return {"status": "success", "processed": processed, "failed": failed}
@@ -0,0 +1,141 @@
+import re
+from dataclasses import dataclass
+from typing import Dict, Mapping, Optional, Sequence
+
+import numpy as np
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app.db import models
+
+# Default shares when a job sets no weights: the split the scorer always used.
+DEFAULT_SKILLS_WEIGHT = 0.7
+DEFAULT_EXPERIENCE_WEIGHT = 0.0
+# skills_weight is shared between hard keyword coverage and the semantic skills match in this ratio
+COVERAGE_SHARE = 5 / 7
+# added to candidates covering more than HIGH_COVERAGE of the requirement keywords
+HIGH_COVERAGE = 0.8
+HIGH_COVERAGE_BONUS = 5.0
+# required years assumed when the job does not state any
+DEFAULT_REQUIRED_YEARS = 10.0
+
+_YEARS_RE = re.compile(r"(\d+(?:\.\d+)?)\s*\+?\s*(?:years?|yrs?)\b", re.IGNORECASE)
+
+
+def _share(value: Optional[float], default: float) -> float:
+    if value is None:
+        return default
+    value = max(float(value), 0.0)
+    return value / 100 if value > 1 else value  # accept percentages
+
+
+def normalize_weights(job) -> Dict[str, float]:
+    """
+    The job's score weights as shares summing to 1: skills_weight and
+    experience_weight (fractions or percentages, defaults when unset), the
+    remainder going to the general description match. Weights adding up to
+    more than 1 are scaled down and leave nothing for it.
+    """
+    skills = _share(getattr(job, "skills_weight", None), DEFAULT_SKILLS_WEIGHT)
+    experience = _share(getattr(job, "experience_weight", None), DEFAULT_EXPERIENCE_WEIGHT)
+    total = skills + experience
+    if total > 1:
+        skills, experience = skills / total, experience / total
+    return {"skills": skills, "experience": experience, "general": max(1.0 - skills - experience, 0.0)}
+
+
+@dataclass(frozen=True)
+class ScoreComponents:
+    """
+    Per-candidate signals of the AI score, one array entry per candidate.
+    Coverage and similarities are in [0, 1]; experience_years is NaN where
+    the resume states none. They only depend on the job's texts, so a
+    change of weights or required experience just recombines them.
+    """
+    keyword_coverage: np.ndarray
+    skill_similarity: np.ndarray
+    description_similarity: np.ndarray
+    experience_years: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.keyword_coverage)
+
+    @classmethod
+    def from_rows(cls, rows: Sequence) -> "ScoreComponents":
+        """From rows with the four attributes, e.g. resume_parsing rows; None reads as NaN."""
+        values = np.array(
+            [(r.keyword_coverage, r.skill_similarity, r.description_similarity, r.experience_years) for r in rows],
+            dtype=float,
+        ).reshape(-1, 4)
+        return cls(*values.T)
+
+    def row(self, i: int) -> Dict[str, Optional[float]]:
+        """Column values of candidate i, as stored on resume_parsing."""
+        years = float(self.experience_years[i])
+        return {
+            "keyword_coverage": float(self.keyword_coverage[i]),
+            "skill_similarity": float(self.skill_similarity[i]),
+            "description_similarity": float(self.description_similarity[i]),
+            "experience_years": None if np.isnan(years) else years,
+        }
+
+
+def experience_years(text: Optional[str]) -> Optional[float]:
+    """Largest 'N years' figure mentioned in an extracted experience block."""
+    years = [float(m) for m in _YEARS_RE.findall(text or "")]
+    return max(years) if years else None
+
+
+def experience_fit(years, required_years: Optional[float]):
+    """
+    Stated years over required years, capped at 1; 0 where no years are
+    stated (None or NaN). Takes one value or an array and returns the same.
+    """
+    required = required_years if required_years and required_years > 0 else DEFAULT_REQUIRED_YEARS
+    fit = np.nan_to_num(np.minimum(np.asarray(years, dtype=float) / required, 1.0), nan=0.0)
+    return fit if fit.ndim else float(fit)
+
+
+def combine(components: ScoreComponents, weights: Mapping[str, float],
+            required_years: Optional[float] = None) -> np.ndarray:
+    """AI scores (0-100, two decimals) of every candidate, from their components and the job's weights."""
+    skills, experience, general = weights["skills"], weights["experience"], weights["general"]
+    coverage = np.nan_to_num(components.keyword_coverage)
+    score = (
+        coverage * skills * COVERAGE_SHARE
+        + np.nan_to_num(components.skill_similarity) * skills * (1 - COVERAGE_SHARE)
+        + np.nan_to_num(components.description_similarity) * general
+        + experience_fit(components.experience_years, required_years) * experience
+    ) * 100
+    score += np.where(coverage > HIGH_COVERAGE, HIGH_COVERAGE_BONUS, 0.0)
+    return np.round(np.minimum(score, 100.0), 2)
+
+
+def rescore_job(db: Session, job: models.Job) -> int:
+    """
+    Recompute the AI score of the job's candidates from the components
+    stored on their latest resume parsing, with the job's current weights
+    and required experience. No resume is re-read or re-embedded; parsings
+    from before the components were stored are left as they are. Does not
+    commit. Returns the number of candidates rescored.
+    """
+    Parsing = models.ResumeParsing
+    rows = db.execute(
+        select(Parsing.parsing_id, Parsing.candidate_id, Parsing.keyword_coverage, Parsing.skill_similarity,
+               Parsing.description_similarity, Parsing.experience_years)
+        .join(models.Candidate, models.Candidate.candidate_id == Parsing.candidate_id)
+        .where(models.Candidate.job_id == job.job_id, Parsing.keyword_coverage.is_not(None))
+        .order_by(Parsing.parsing_id)
+    ).all()
+    latest = list({row.candidate_id: row for row in rows}.values())
+    if not latest:
+        return 0
+
+    scores = combine(ScoreComponents.from_rows(latest), normalize_weights(job), job.experience).tolist()
+    db.execute(update(Parsing), [
+        {"parsing_id": row.parsing_id, "ai_score": score} for row, score in zip(latest, scores)
+    ])
+    db.execute(update(models.Candidate), [
+        {"candidate_id": row.candidate_id, "ai_score": int(score)} for row, score in zip(latest, scores)
+    ])
+    return len(latest)
@@ -0,0 +1,172 @@
+import re
+from typing import Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+from app.analyzer.skill_taxonomy import AMBIGUOUS_SPELLINGS, SKILL_TAXONOMY, normalize_skill_name
+
+# A token keeps the punctuation skills are spelled with (c++, c#, node.js,
+# .net, ci/cd, scikit-learn); trailing sentence punctuation is dropped.
+_TOKEN = re.compile(r"\.?[^\W_][\w+#.\-/]*")
+_TRAILING = ".-/"
+# separators between items of a skills list or requirements line
+_LIST_ITEM = re.compile(r"[,;\n•·|]+")
+_EDGE = " *-:"
+
+
+class SkillNormalizer:
+    """
+    Resolves skill spellings to canonical names with a table built once from
+    the taxonomy: folded token sequence -> canonical name. Looking up a name
+    is one dict probe; scanning text probes at most `max_phrase` sequences
+    per token, so matching is linear in the text and independent of the
+    taxonomy size.
+
+    Matching is token based: "Go" in "Good" or "R" in "React" cannot match,
+    and "node js", "Node.js" and "nodejs" are the same skill.
+    """
+
+    def __init__(self, taxonomy: Mapping[str, Iterable[str]] = SKILL_TAXONOMY,
+                 ambiguous: Mapping[str, Optional[str]] = AMBIGUOUS_SPELLINGS):
+        self._phrases: Dict[Tuple[str, ...], str] = {}
+        self._names: Dict[str, str] = {}  # exact folded spellings, probed before tokenizing
+        for canonical, aliases in taxonomy.items():
+            for spelling in (canonical, *aliases):
+                self._phrases[self._fold(self._split(spelling))] = canonical
+                self._names[normalize_skill_name(spelling)] = canonical
+        self._ambiguous = {self._fold(self._split(spelling)): exact for spelling, exact in ambiguous.items()}
+        self._keys = {canonical: normalize_skill_name(canonical) for canonical in taxonomy}
+        self.max_phrase = max(map(len, self._phrases), default=1)
+
+    @staticmethod
+    def _split(text: str) -> List[str]:
+        return [t for t in (m.group(0).rstrip(_TRAILING) for m in _TOKEN.finditer(text or "")) if t]
+
+    @staticmethod
+    def _fold(tokens: Iterable[str]) -> Tuple[str, ...]:
+        return tuple(t.casefold() for t in tokens)
+
+    def tokens(self, text: str) -> List[str]:
+        """Tokens of `text`, with slash-joined lists (Python/Django) split unless the whole is a skill (CI/CD)."""
+        tokens = []
+        for token in self._split(text):
+            if "/" in token and (token.casefold(),) not in self._phrases:
+                tokens.extend(part for part in token.split("/") if part)
+            else:
+                tokens.append(token)
+        return tokens
+
+    def key(self, canonical: str) -> str:
+        """Lookup key of a canonical name, as stored in skill_alias."""
+        return self._keys.get(canonical) or normalize_skill_name(canonical)
+
+    def canonical(self, name: str) -> Optional[str]:
+        """Canonical name for a whole skill name ("k8s" -> "Kubernetes"), or None if unknown."""
+        canonical = self._names.get(normalize_skill_name(name))
+        return canonical if canonical is not None else self._phrases.get(self._fold(self.tokens(name)))
+
+    def _scan(self, tokens: List[str], strict: bool):
+        """Yield (start, end, canonical or None) covering the tokens, longest known phrase first."""
+        folded = self._fold(tokens)
+        i, n = 0, len(tokens)
+        while i < n:
+            for length in range(min(self.max_phrase, n - i), 0, -1):
+                phrase = folded[i:i + length]
+                canonical = self._phrases.get(phrase)
+                if canonical is None:
+                    continue
+                if strict and phrase in self._ambiguous and " ".join(tokens[i:i + length]) != self._ambiguous[phrase]:
+                    continue
+                yield i, i + length, canonical
+                i += length
+                break
+            else:
+                yield i, i + 1, None
+                i += 1
+
+    def find(self, text: str) -> List[str]:
+        """Canonical skills mentioned in running text, in order of first mention."""
+        tokens = self.tokens(text)
+        return list(dict.fromkeys(canonical for _, _, canonical in self._scan(tokens, strict=True) if canonical))
+
+    def normalize_list(self, skills) -> List[str]:
+        """
+        A skills list (comma-joined string or iterable) with every item
+        canonicalised and duplicates dropped. Unknown items are kept as
+        written; items made up only of known skills are split into them.
+        """
+        items = _LIST_ITEM.split(skills) if isinstance(skills, str) else skills
+        result: Dict[str, str] = {}
+        for item in items:
+            item = " ".join((item or "").split()).strip(_EDGE)
+            if not item:
+                continue
+            canonical = self.canonical(item)
+            if canonical is not None:
+                result.setdefault(self.key(canonical), canonical)
+                continue
+            found = [canonical for _, _, canonical in self._scan(self.tokens(item), strict=False)]
+            if len(found) > 1 and all(found):  # "Python/Django", "React Redux"
+                for name in found:
+                    result.setdefault(self.key(name), name)
+            else:
+                result.setdefault(normalize_skill_name(item), item)
+        return list(result.values())
+
+    def terms(self, text: str, strict: bool = True) -> Set[str]:
+        """
+        Folded terms of a text for overlap scoring: the key of each known
+        skill, however it is spelled, plus every other token.
+        """
+        tokens = self.tokens(text)
+        terms = set()
+        for start, end, canonical in self._scan(tokens, strict):
+            terms.add(self.key(canonical) if canonical else tokens[start].casefold())
+        return terms
+
+    def requirement_skills(self, requirements: str) -> Set[str]:
+        """Keys of the skills a requirements text asks for, from its list items and its prose."""
+        keys = {self.key(name) for name in self.find(requirements)}
+        for item in _LIST_ITEM.split(requirements or ""):
+            canonical = self.canonical(item)
+            if canonical is not None:
+                keys.add(self.key(canonical))
+        return keys
+
+    def match(self, skills, requirements: str) -> List[str]:
+        """
+        The skills (canonicalised) that the requirements ask for. Known skills
+        match by key whatever the spelling on either side; unknown ones
+        match as a whole token sequence of the requirements.
+        """
+        wanted = self.requirement_skills(requirements)
+        req_tokens = self._fold(self.tokens(requirements))
+        grams: Dict[int, Set[Tuple[str, ...]]] = {}
+        matched = []
+        for name in self.normalize_list(skills):
+            canonical = self.canonical(name)
+            if canonical is not None:
+                if self.key(canonical) in wanted:
+                    matched.append(canonical)
+                continue
+            phrase = self._fold(self.tokens(name))
+            if not phrase:
+                continue
+            if len(phrase) not in grams:
+                grams[len(phrase)] = {req_tokens[i:i + len(phrase)] for i in range(len(req_tokens) - len(phrase) + 1)}
+            if phrase in grams[len(phrase)]:
+                matched.append(name)
+        return matched
+
+
+skill_normalizer = SkillNormalizer()
+
+
+def canonical_skill(name: str) -> Tuple[str, str]:
+    """
+    (display name, lookup key) for a skill as written anywhere. Known
+    spellings map to their canonical entry; anything else keeps its own
+    spelling and is keyed by its case-folded form. Empty input gives ("", "").
+    """
+    canonical = skill_normalizer.canonical(name)
+    if canonical is not None:
+        return canonical, skill_normalizer.key(canonical)
+    return " ".join((name or "").split()).strip(_EDGE), normalize_skill_name(name)
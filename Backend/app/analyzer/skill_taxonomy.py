@@ -0,0 +1,96 @@
+import re
+from typing import Dict, Optional, Tuple
+
+# Canonical skill name -> other spellings it is known by. Everything is
+# compared case-folded, so only genuinely different spellings are listed.
+SKILL_TAXONOMY: Dict[str, Tuple[str, ...]] = {
+    # Languages
+    "Python": ("python3", "python 3"),
+    "Java": (),
+    "C++": ("cpp", "c plus plus"),
+    "C#": ("csharp", "c sharp"),
+    "JavaScript": ("js", "ecmascript", "es6", "java script"),
+    "TypeScript": ("ts", "type script"),
+    "Ruby": (),
+    "PHP": (),
+    "Swift": (),
+    "Kotlin": (),
+    "Go": ("golang", "go lang"),
+    "Rust": (),
+    "SQL": (),
+    "HTML": ("html5",),
+    "CSS": ("css3",),
+    # Frameworks / libraries
+    "React": ("react.js", "reactjs", "react js"),
+    "Angular": ("angularjs", "angular.js", "angular js"),
+    "Vue": ("vue.js", "vuejs", "vue js"),
+    "Node.js": ("node", "nodejs", "node js"),
+    "Django": (),
+    "Flask": (),
+    "FastAPI": ("fast api",),
+    "Spring": ("spring framework",),
+    "Spring Boot": ("springboot",),
+    ".NET Core": ("net core", "dotnet core", "asp.net core"),
+    "Laravel": (),
+    "Pandas": (),
+    "NumPy": (),
+    "scikit-learn": ("sklearn", "scikit learn", "scikitlearn"),
+    "TensorFlow": ("tensor flow",),
+    "PyTorch": ("torch",),
+    "Keras": (),
+    # Tools / infrastructure
+    "Docker": (),
+    "Kubernetes": ("k8s", "kube"),
+    "AWS": ("amazon web services",),
+    "Azure": ("microsoft azure",),
+    "GCP": ("google cloud", "google cloud platform"),
+    "Git": (),
+    "Jenkins": (),
+    "Jira": (),
+    "Linux": (),
+    "Unix": (),
+    "Redis": (),
+    "MongoDB": ("mongo",),
+    "PostgreSQL": ("postgres", "psql", "postgre sql"),
+    "MySQL": (),
+    "Oracle": ("oracle db", "oracle database"),
+    # Concepts
+    "Machine Learning": ("ml",),
+    "Deep Learning": ("dl",),
+    "NLP": ("natural language processing",),
+    "Computer Vision": ("cv",),
+    "Data Science": (),
+    "Agile": (),
+    "Scrum": (),
+    "DevOps": (),
+    "CI/CD": ("ci cd", "cicd", "continuous integration"),
+    "REST API": ("rest", "restful", "rest apis", "restful api", "restful apis"),
+    "GraphQL": (),
+    "Microservices": ("microservice", "micro services"),
+}
+
+# Spellings that are also ordinary words or abbreviations. In running text
+# they only count when written exactly as given here (None: never); as an
+# item of a skills list they always count.
+AMBIGUOUS_SPELLINGS: Dict[str, Optional[str]] = {
+    "go": "Go",
+    "rest": "REST",
+    "swift": "Swift",
+    "spring": "Spring",
+    "oracle": "Oracle",
+    "node": "Node",
+    "ml": "ML",
+    "dl": None,
+    "cv": None,
+    "ts": None,
+    "kube": None,
+    "torch": None,
+}
+
+_EDGE_PUNCTUATION = " \t\r\n,;:|*-•·"
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_skill_name(name: str) -> str:
+    """Case-folded, single-spaced, without list punctuation at either end."""
+    return _WHITESPACE.sub(" ", (name or "").casefold()).strip(_EDGE_PUNCTUATION)
@@ -1,10 +1,16 @@
+import asyncio
+import logging
 from datetime import datetime, timedelta, timezone
 from typing import Optional, Dict, Any
+from fastapi.concurrency import run_in_threadpool
 from jose import JWSError, JWTError, jwt
 from passlib.context import CryptContext
+from sqlalchemy.orm import Session
 from app.core.config import settings
-from app.services.auth import is_blacklisted_token
-from app.services.hr_manager import get_hr_by_email, get_hr_manager
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.services.auth import is_blacklisted_token, is_blacklisted_token_async, create_blacklisted_token, purge_expired_blacklisted_tokens
+from app.schemas.auth_token import BlacklistedTokenCreate
+from app.services.hr_manager import get_hr_by_email, get_hr_by_email_async, get_hr_manager
 from app.db.session import SessionLocal
 
 SECRET_KEY = settings.JWT_SECRET
@@ -12,30 +18,24 @@ ALGORITHM = settings.JWT_ALG
 ACCESS_TOKEN_EXPIRE_MINUTES = settings.ACCESS_TTL_MIN
 REFRESH_TOKEN_EXPIRE_DAYS = settings.REFRESH_TTL_DAYS
 
-def is_blacklisted(token):
-    db = SessionLocal()
-    try:
-        blacklisted = is_blacklisted_token(db, token)
-    finally:
-        db.close()
-    return blacklisted
+logger = logging.getLogger(__name__)
 
+def is_blacklisted(db: Session, token: str):
+    return is_blacklisted_token(db, token)
 
-def hr_by_id(hr_id: int):
-    db = SessionLocal()
-    try:
-        hr = get_hr_manager(db, hr_id)
-    finally:
-        db.close()
-    return hr
 
-def hr_by_email(email: str):
-    db = SessionLocal()
-    try:
-        hr = get_hr_by_email(db, email)
-    finally:
-        db.close()
-    return hr
+def hr_by_id(db: Session, hr_id: int):
+    return get_hr_manager(db, hr_id)
+
+def hr_by_email(db: Session, email: str):
+    return get_hr_by_email(db, email)
+
+
+async def is_blacklisted_async(db: AsyncSession, token: str):
+    return await is_blacklisted_token_async(db, token)
+
+async def hr_by_email_async(db: AsyncSession, email: str):
+    return await get_hr_by_email_async(db, email)
 
 
 def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
@@ -60,12 +60,49 @@ def decode_token(token: str) -> Optional[Dict[str, Any]]:
         return None
 
 
-def refresh_access_token(refresh_token: str) -> Optional[str]:
-    if is_blacklisted(refresh_token):
+def refresh_access_token(db: Session, refresh_token: str) -> Optional[str]:
+    if is_blacklisted(db, refresh_token):
         return None
     payload = decode_token(refresh_token)
     if not payload or payload.get("type") != "refresh":
         return None
     user_data = {"sub": payload.get("sub")}
     new_access_token = create_access_token(user_data)
-    return new_access_token
\ No newline at end of file
+    return new_access_token
+
+
+def token_expiry(payload: Dict[str, Any]) -> datetime:
+    # access tokens carry "exp", refresh tokens carry "expire"
+    expire = payload.get("exp") or payload.get("expire")
+    if expire:
+        return datetime.fromtimestamp(int(expire), tz=timezone.utc)
+    return datetime.now(timezone.utc) + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
+
+
+def revoke_token(db: Session, token: str) -> bool:
+    payload = decode_token(token)
+    if not payload:
+        # undecodable tokens can never authenticate, nothing to store
+        return False
+    create_blacklisted_token(db, BlacklistedTokenCreate(token=token, expires_at=token_expiry(payload)))
+    return True
+
+
+def purge_blacklisted_tokens() -> int:
+    # runs outside any request, so it owns its session
+    db = SessionLocal()
+    try:
+        return purge_expired_blacklisted_tokens(db)
+    finally:
+        db.close()
+
+
+async def purge_blacklisted_tokens_periodically(interval_minutes: int = settings.BLACKLIST_PURGE_INTERVAL_MIN):
+    while True:
+        try:
+            deleted = await run_in_threadpool(purge_blacklisted_tokens)
+            if deleted:
+                logger.info(f"Purged {deleted} expired blacklisted tokens")
+        except Exception as e:
+            logger.error(f"Blacklist purge failed: {str(e)}")
+        await asyncio.sleep(interval_minutes * 60)
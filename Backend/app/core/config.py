@@ -11,6 +11,41 @@ class Settings(BaseSettings):
     JWT_ALG: str = os.getenv("JWT_ALG")
     ACCESS_TTL_MIN: int = os.getenv("ACCESS_TTL_MIN")
     REFRESH_TTL_DAYS: int = os.getenv("REFRESH_TTL_DAYS")
+    BLACKLIST_CACHE_SIZE: int = os.getenv("BLACKLIST_CACHE_SIZE", 10000)
+    BLACKLIST_PURGE_INTERVAL_MIN: int = os.getenv("BLACKLIST_PURGE_INTERVAL_MIN", 60)
+    DB_POOL_SIZE: int = os.getenv("DB_POOL_SIZE", 10)
+    DB_MAX_OVERFLOW: int = os.getenv("DB_MAX_OVERFLOW", 20)
+    DB_POOL_TIMEOUT: int = os.getenv("DB_POOL_TIMEOUT", 30)
+    DB_POOL_RECYCLE: int = os.getenv("DB_POOL_RECYCLE", 1800)
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", False)
+    DB_PGBOUNCER_TRANSACTION_MODE: bool = os.getenv("DB_PGBOUNCER_TRANSACTION_MODE", False)
+    GOOGLE_TOKEN_CACHE_SIZE: int = os.getenv("GOOGLE_TOKEN_CACHE_SIZE", 1000)
+    GOOGLE_TOKEN_REFRESH_MARGIN_SEC: int = os.getenv("GOOGLE_TOKEN_REFRESH_MARGIN_SEC", 300)
+    GOOGLE_CLIENT_CACHE_SIZE: int = os.getenv("GOOGLE_CLIENT_CACHE_SIZE", 200)
+    TASK_QUEUE_BACKEND: str = os.getenv("TASK_QUEUE_BACKEND", "postgres")
+    TASK_WORKER_IN_PROCESS: bool = os.getenv("TASK_WORKER_IN_PROCESS", True)
+    TASK_WORKER_CONCURRENCY: int = os.getenv("TASK_WORKER_CONCURRENCY", 4)
+    TASK_POLL_INTERVAL_SEC: float = os.getenv("TASK_POLL_INTERVAL_SEC", 1.0)
+    TASK_MAX_ATTEMPTS: int = os.getenv("TASK_MAX_ATTEMPTS", 5)
+    TASK_RETRY_BASE_SEC: int = os.getenv("TASK_RETRY_BASE_SEC", 10)
+    TASK_RETRY_MAX_SEC: int = os.getenv("TASK_RETRY_MAX_SEC", 900)
+    TASK_LEASE_SEC: int = os.getenv("TASK_LEASE_SEC", 300)
+    TASK_HR_CONCURRENCY: int = os.getenv("TASK_HR_CONCURRENCY", 2)
+    TASK_RETENTION_DAYS: float = os.getenv("TASK_RETENTION_DAYS", 7)
+    MAIL_CONCURRENCY: int = os.getenv("MAIL_CONCURRENCY", 8)
+    MAIL_RATE_PER_SEC: float = os.getenv("MAIL_RATE_PER_SEC", 2.5)
+    MAIL_MAX_ATTEMPTS: int = os.getenv("MAIL_MAX_ATTEMPTS", 4)
+    MAIL_BATCH_SIZE: int = os.getenv("MAIL_BATCH_SIZE", 50)
+    MAIL_RETRY_BASE_SEC: float = os.getenv("MAIL_RETRY_BASE_SEC", 1.0)
+    MAIL_RETRY_MAX_SEC: float = os.getenv("MAIL_RETRY_MAX_SEC", 30.0)
+    CALENDAR_CONCURRENCY: int = os.getenv("CALENDAR_CONCURRENCY", 5)
+    CALENDAR_RATE_PER_SEC: float = os.getenv("CALENDAR_RATE_PER_SEC", 5.0)
+    CALENDAR_MAX_ATTEMPTS: int = os.getenv("CALENDAR_MAX_ATTEMPTS", 4)
+    OPEN_SLOTS_CACHE_SIZE: int = os.getenv("OPEN_SLOTS_CACHE_SIZE", 2048)
+    OPEN_SLOTS_CACHE_TTL_SEC: float = os.getenv("OPEN_SLOTS_CACHE_TTL_SEC", 30)
+    PIPELINE_CACHE_SIZE: int = os.getenv("PIPELINE_CACHE_SIZE", 1024)
+    PIPELINE_CACHE_TTL_SEC: float = os.getenv("PIPELINE_CACHE_TTL_SEC", 30)
+    SEARCH_RANK_WINDOW: int = os.getenv("SEARCH_RANK_WINDOW", 1000)
 
 
 settings = Settings()
\ No newline at end of file
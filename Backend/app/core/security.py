@@ -1,9 +1,12 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from typing import Optional
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.session import get_db, get_async_db
 from app.authorization.auth import decode_token
 from app.db.models import HRManager, Company
-from app.authorization.auth import is_blacklisted, hr_by_email
+from app.authorization.auth import is_blacklisted, hr_by_email, is_blacklisted_async, hr_by_email_async
 from app.utilities.password import verify_password
 from email_validator import validate_email, EmailNotValidError
 
@@ -12,8 +15,9 @@ from email_validator import validate_email, EmailNotValidError
 oauth2_hr = OAuth2PasswordBearer(tokenUrl="/auth/hr/login")
 
 
-def get_current_hr(token: str = Depends(oauth2_hr))-> Company:
-    if is_blacklisted(token):
+def get_current_hr(token: str = Depends(oauth2_hr), db: Session = Depends(get_db))-> Company:
+    # get_db is cached per request, so handlers that also depend on it share this session
+    if is_blacklisted(db, token):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid or expired token", headers={"WWW-Authenticate":"Bearer"})
     
     payload = decode_token(token)
@@ -21,14 +25,29 @@ def get_current_hr(token: str = Depends(oauth2_hr))-> Company:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid or expired token", headers={"WWW-Authenticate": "Bearer"})
     
     hr_email = payload["sub"]
-    hr = hr_by_email(hr_email)
+    hr = hr_by_email(db, hr_email)
     if not hr:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid or expired token")
     return hr
 
 
-def authentication_hr(email: str, password: str) -> Optional[HRManager]:
-    hr = hr_by_email(email)
+async def get_current_hr_async(token: str = Depends(oauth2_hr), db: AsyncSession = Depends(get_async_db)) -> HRManager:
+    # async twin of get_current_hr for handlers running on the async engine
+    if await is_blacklisted_async(db, token):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid or expired token", headers={"WWW-Authenticate":"Bearer"})
+
+    payload = decode_token(token)
+    if not payload or "sub" not in payload:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid or expired token", headers={"WWW-Authenticate": "Bearer"})
+
+    hr = await hr_by_email_async(db, payload["sub"])
+    if not hr:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid or expired token")
+    return hr
+
+
+def authentication_hr(db: Session, email: str, password: str) -> Optional[HRManager]:
+    hr = hr_by_email(db, email)
     if not hr or not verify_password(password, hr.password):
         print("pass not verify")
         return None
@@ -1,17 +1,66 @@
+import uuid
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import NullPool
 from app.core.config import settings
+from app.db.pool import InstrumentedQueuePool, InstrumentedAsyncQueuePool
 
-# 1. Add connect_args for SSL (Supabase requires this for security)
-# 2. Add pool_pre_ping to keep the connection alive
+
+def _pool_options(poolclass=InstrumentedQueuePool) -> dict:
+    if settings.DB_PGBOUNCER_TRANSACTION_MODE:
+        # PgBouncer / Supabase pooler (port 6543) already pools server side and
+        # hands out a backend per transaction, so holding client connections
+        # open only ties up pooler slots.
+        return {"poolclass": NullPool}
+    return {
+        "poolclass": poolclass,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        # recycle before Supabase/PgBouncer drop idle server connections, so
+        # pre-ping (an extra round trip per checkout) can stay off by default
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_use_lifo": True,
+    }
+
+
+# Supabase requires SSL
 engine = create_engine(
     settings.DATABASE_URL, 
     connect_args={"sslmode": "require"},
-    pool_pre_ping=True
+    **_pool_options()
 )
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
-Base = declarative_base()
 
-# Dependency for your FastAPI rout
\ No newline at end of file
+def _async_database_url():
+    # asyncpg takes ssl through connect_args and rejects libpq's sslmode
+    url = make_url(settings.DATABASE_URL)
+    return url.set(drivername="postgresql+asyncpg").difference_update_query(["sslmode"])
+
+
+def _async_connect_args() -> dict:
+    connect_args = {"ssl": "require"}
+    if settings.DB_PGBOUNCER_TRANSACTION_MODE:
+        # a transaction-mode pooler can hand each statement a different
+        # backend, so asyncpg's named prepared statements must not be reused
+        connect_args["statement_cache_size"] = 0
+        connect_args["prepared_statement_name_func"] = lambda: f"__asyncpg_{uuid.uuid4()}__"
+    return connect_args
+
+
+# Async engine for I/O-bound read endpoints; these run on the event loop
+# instead of occupying a threadpool worker for the whole DB round trip.
+async_engine = create_async_engine(
+    _async_database_url(),
+    connect_args=_async_connect_args(),
+    **_pool_options(InstrumentedAsyncQueuePool)
+)
+
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+Base = declarative_base()
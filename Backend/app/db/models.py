@@ -1,8 +1,10 @@
 from datetime import datetime, timezone
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import String, Integer, Text, DateTime, Float, Boolean, ForeignKey
+from sqlalchemy import String, Integer, Text, DateTime, Float, Boolean, ForeignKey, Index, UniqueConstraint, Computed, column
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from typing import Optional, List
 from app.database import Base
+from app.db import sqlite_compat  # noqa: F401  (SQLite DDL for the Postgres-only column types)
 import uuid
 
 class Company(Base):
@@ -40,6 +42,9 @@ class HRManager(Base):
 
 class HRAvailability(Base):
     __tablename__ = "hr_availability"
+    __table_args__ = (
+        Index("ix_hr_availability_hr_id_is_selected", "hr_id", "is_selected"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     hr_id: Mapped[int] = mapped_column(ForeignKey("hr_manager.id"), nullable=False)
@@ -61,10 +66,16 @@ class HRAvailability(Base):
 
 class Interview(Base):
     __tablename__ = "interview"
+    __table_args__ = (
+        # latest scheduled interview per candidate / double-booking check
+        Index("ix_interview_candidate_id_status_scheduled_time", "candidate_id", "status", "scheduled_time"),
+        # dashboard "next interview"
+        Index("ix_interview_status_scheduled_time", "status", "scheduled_time"),
+    )
 
     interview_id: Mapped[int] = mapped_column(primary_key=True, index=True)
     candidate_id: Mapped[int] = mapped_column(ForeignKey("candidate.candidate_id"), nullable=False)
-    job_id: Mapped[int] = mapped_column(ForeignKey("job.job_id"), nullable=False)
+    job_id: Mapped[int] = mapped_column(ForeignKey("job.job_id"), nullable=False, index=True)
     scheduled_time: Mapped[datetime] = mapped_column(DateTime, nullable=True)
     meet_link: Mapped[str] = mapped_column(String, nullable=True)
     status: Mapped[str] = mapped_column(String, default="Scheduled")
@@ -84,6 +95,10 @@ class Interview(Base):
 
 class InterviewSlot(Base):
     __tablename__ = "interview_slot"
+    __table_args__ = (
+        # one slot per start time; also the ON CONFLICT target for slot generation
+        UniqueConstraint("availability_id", "date", name="uq_interview_slot_availability_id_date"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     availability_id: Mapped[int] = mapped_column(ForeignKey("hr_availability.id", ondelete="CASCADE"), nullable=False)
@@ -124,7 +139,7 @@ class GoogleToken(Base):
     __tablename__ = "google_token"
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
-    hr_id: Mapped[int] = mapped_column(ForeignKey("hr_manager.id"), nullable=False)
+    hr_id: Mapped[int] = mapped_column(ForeignKey("hr_manager.id"), nullable=False, index=True)
     user_id: Mapped[str] = mapped_column(String, index=True)   # Google "sub"
     email: Mapped[str] = mapped_column(String, nullable=True)
     access_token: Mapped[str] = mapped_column(String, nullable=False)
@@ -150,8 +165,8 @@ class Job(Base):
     __tablename__ = "job"
 
     job_id: Mapped[int] = mapped_column(primary_key=True, index=True)
-    hr_id: Mapped[int] = mapped_column(ForeignKey("hr_manager.id"))
-    company_id: Mapped[int] = mapped_column(ForeignKey("company.company_id"), nullable=True)
+    hr_id: Mapped[int] = mapped_column(ForeignKey("hr_manager.id"), index=True)
+    company_id: Mapped[int] = mapped_column(ForeignKey("company.company_id"), nullable=True, index=True)
     
     department_id: Mapped[int] = mapped_column(ForeignKey("department.department_id", ondelete="CASCADE"), nullable=True) 
     
@@ -195,7 +210,7 @@ class QuestionsForm(Base):
     __tablename__ = "questions_form"
 
     form_id: Mapped[int] = mapped_column(primary_key=True, index=True)
-    job_id: Mapped[int] = mapped_column(ForeignKey("job.job_id", ondelete="CASCADE"))
+    job_id: Mapped[int] = mapped_column(ForeignKey("job.job_id", ondelete="CASCADE"), index=True)
     
     job: Mapped["Job"] = relationship(back_populates="question_form")
     questions: Mapped[list["Question"]] = relationship(back_populates="form", cascade="all, delete-orphan")
@@ -205,7 +220,7 @@ class Question(Base):
     __tablename__ = "question"
 
     question_id: Mapped[int] = mapped_column(primary_key=True, index=True)
-    form_id: Mapped[int] = mapped_column(ForeignKey("questions_form.form_id", ondelete="CASCADE"))
+    form_id: Mapped[int] = mapped_column(ForeignKey("questions_form.form_id", ondelete="CASCADE"), index=True)
     question_text: Mapped[str] = mapped_column(Text, nullable=False)
 
     form: Mapped["QuestionsForm"] = relationship(back_populates="questions")
@@ -214,6 +229,15 @@ class Question(Base):
 
 class Candidate(Base):
     __tablename__ = "candidate"
+    __table_args__ = (
+        # listings ordered by score with candidate_id as keyset tie-breaker
+        Index("ix_candidate_job_id_ai_score", "job_id", column("ai_score").desc().nullslast(), "candidate_id"),
+        Index("ix_candidate_company_id_ai_score", "company_id", column("ai_score").desc().nullslast(), "candidate_id"),
+        Index("ix_candidate_job_id_selected_for_interview", "job_id", "selected_for_interview"),
+        Index("ix_candidate_job_id_interviewed", "job_id", "interviewed"),
+        Index("ix_candidate_job_id_selected", "job_id", "selected"),
+        Index("ix_candidate_search_vector", "search_vector", postgresql_using="gin"),
+    )
 
     candidate_id: Mapped[int] = mapped_column(primary_key=True, index=True)
     
@@ -222,7 +246,7 @@ class Candidate(Base):
     
     company_id: Mapped[int] = mapped_column(ForeignKey("company.company_id"), nullable=True)
     name: Mapped[str] = mapped_column(String, nullable=False)
-    email: Mapped[str] = mapped_column(String, unique=False, nullable=False)
+    email: Mapped[str] = mapped_column(String, unique=False, nullable=False, index=True)
     phone: Mapped[str] = mapped_column(String, nullable=True)
     location: Mapped[str] = mapped_column(String, nullable=True)
     skills: Mapped[str] = mapped_column(Text, nullable=True)
@@ -237,6 +261,21 @@ class Candidate(Base):
     meet_link: Mapped[str] = mapped_column(String, nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.now(timezone.utc), nullable=True)
     invited_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    # plain text of the uploaded resume, kept for search
+    resume_text: Mapped[Optional[str]] = mapped_column(Text, nullable=True, deferred=True)
+    # maintained by Postgres from the columns above; see app/services/candidate_search.py
+    search_vector = mapped_column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('english'::regconfig, coalesce(name, '')), 'A') || "
+            "setweight(to_tsvector('english'::regconfig, coalesce(skills, '')), 'A') || "
+            "setweight(to_tsvector('english'::regconfig, coalesce(experience, '')), 'B') || "
+            "setweight(to_tsvector('english'::regconfig, coalesce(education, '')), 'C') || "
+            "setweight(to_tsvector('english'::regconfig, coalesce(resume_text, '')), 'D')",
+            persisted=True,
+        ),
+        deferred=True,
+    )
     
     notifications: Mapped[list["Notification"]] = relationship(back_populates="candidate")
     answers: Mapped[list["Answer"]] = relationship(back_populates="candidate", cascade="all, delete-orphan")
@@ -250,7 +289,7 @@ class Answer(Base):
 
     answer_id: Mapped[int] = mapped_column(primary_key=True, index=True)
     question_id: Mapped[int] = mapped_column(ForeignKey("question.question_id", ondelete="CASCADE"))
-    candidate_id: Mapped[int] = mapped_column(ForeignKey("candidate.candidate_id", ondelete="CASCADE"))
+    candidate_id: Mapped[int] = mapped_column(ForeignKey("candidate.candidate_id", ondelete="CASCADE"), index=True)
     answer_text: Mapped[str] = mapped_column(Text, nullable=False)
 
     question: Mapped["Question"] = relationship(back_populates="answers")
@@ -261,17 +300,53 @@ class ResumeParsing(Base):
     __tablename__ = "resume_parsing"
 
     parsing_id: Mapped[int] = mapped_column(primary_key=True, index=True)
-    candidate_id: Mapped[int] = mapped_column(ForeignKey("candidate.candidate_id"), nullable=False)
+    candidate_id: Mapped[int] = mapped_column(ForeignKey("candidate.candidate_id"), nullable=False, index=True)
 
     skills_extracted: Mapped[str] = mapped_column(Text, nullable=True)
     experience_extracted: Mapped[str] = mapped_column(Text, nullable=True)
     education_extracted: Mapped[str] = mapped_column(Text, nullable=True)
     ai_score: Mapped[float] = mapped_column(Float, nullable=True)
+    # score components (app.analyzer.scoring), kept so a weight change can rescore without re-reading resumes
+    keyword_coverage: Mapped[float] = mapped_column(Float, nullable=True)
+    skill_similarity: Mapped[float] = mapped_column(Float, nullable=True)
+    description_similarity: Mapped[float] = mapped_column(Float, nullable=True)
+    experience_years: Mapped[float] = mapped_column(Float, nullable=True)
 
     # relationship to candidate
     candidate: Mapped["Candidate"] = relationship(back_populates="resume_parsing")
 
 
+class Skill(Base):
+    __tablename__ = "skill"
+
+    skill_id: Mapped[int] = mapped_column(primary_key=True)
+    name: Mapped[str] = mapped_column(String(100), nullable=False, unique=True)  # canonical display name
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+
+    aliases: Mapped[List["SkillAlias"]] = relationship(back_populates="skill", cascade="all, delete-orphan")
+
+
+class SkillAlias(Base):
+    """Case-folded spellings of a skill, including its canonical name; the lookup table for skill names."""
+    __tablename__ = "skill_alias"
+
+    alias: Mapped[str] = mapped_column(String(100), primary_key=True)
+    skill_id: Mapped[int] = mapped_column(ForeignKey("skill.skill_id", ondelete="CASCADE"), nullable=False, index=True)
+
+    skill: Mapped["Skill"] = relationship(back_populates="aliases")
+
+
+class CandidateSkill(Base):
+    __tablename__ = "candidate_skill"
+    __table_args__ = (
+        # "candidates with skill X"; the primary key serves "skills of candidate Y"
+        Index("ix_candidate_skill_skill_id_candidate_id", "skill_id", "candidate_id"),
+    )
+
+    candidate_id: Mapped[int] = mapped_column(ForeignKey("candidate.candidate_id", ondelete="CASCADE"), primary_key=True)
+    skill_id: Mapped[int] = mapped_column(ForeignKey("skill.skill_id", ondelete="CASCADE"), primary_key=True)
+
+
 class OfferLetter(Base):
     __tablename__ = "offer_letter"
 
@@ -340,7 +415,34 @@ class BlacklistedToken(Base):
     __tablename__ = "blacklisted_tokens"
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
-    token: Mapped[str] = mapped_column(Text, nullable=False, unique=True)
+    # sha256 hex digest of the raw JWT, so the unique index stays fixed-size
+    token_hash: Mapped[str] = mapped_column(String(64), nullable=False, unique=True)
+    # once the token itself has expired the row is useless and gets purged
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
     blacklisted_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.now(timezone.utc))
 
 
+class TaskQueue(Base):
+    __tablename__ = "task_queue"
+    __table_args__ = (
+        # worker claim scan: due tasks in run_at order
+        Index("ix_task_queue_status_run_at", "status", "run_at"),
+        # per-HR running count for the concurrency limit
+        Index("ix_task_queue_hr_id_status", "hr_id", "status"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    name: Mapped[str] = mapped_column(String(100), nullable=False)
+    payload: Mapped[str] = mapped_column(Text, nullable=False)  # JSON; ids only, never ORM state
+    idempotency_key: Mapped[Optional[str]] = mapped_column(String(255), nullable=True, unique=True)
+    # concurrency group; deliberately not a FK so queued work never blocks deleting an HR
+    hr_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    status: Mapped[str] = mapped_column(String(20), nullable=False, default="pending")  # pending | running | done | failed
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    max_attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=5)
+    run_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    locked_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    locked_by: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
+    last_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+    finished_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
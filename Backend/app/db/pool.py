@@ -0,0 +1,74 @@
+import threading
+import time
+from typing import Dict, Any
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long callers wait for a connection."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self._checkouts = 0
+        self._timeouts = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            with self._stats_lock:
+                self._timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - started
+            with self._stats_lock:
+                self._checkouts += 1
+                self._wait_total += waited
+                self._wait_max = max(self._wait_max, waited)
+
+    def recreate(self):
+        # keep counters across pool recreation (e.g. after engine.dispose())
+        new_pool = super().recreate()
+        new_pool._checkouts = self._checkouts
+        new_pool._timeouts = self._timeouts
+        new_pool._wait_total = self._wait_total
+        new_pool._wait_max = self._wait_max
+        return new_pool
+
+    def wait_stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            return {
+                "checkouts": self._checkouts,
+                "timeouts": self._timeouts,
+                "wait_avg_ms": round(self._wait_total / self._checkouts * 1000, 3) if self._checkouts else 0.0,
+                "wait_max_ms": round(self._wait_max * 1000, 3),
+            }
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool, InstrumentedQueuePool):
+    """Same instrumentation for the asyncio engine."""
+
+
+def pool_stats(engine: Engine) -> Dict[str, Any]:
+    pool = engine.pool
+    if not isinstance(pool, QueuePool):
+        # NullPool (PgBouncer transaction mode): pooling happens server side
+        return {"pool": type(pool).__name__}
+
+    stats = {
+        "pool": type(pool).__name__,
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": max(pool.overflow(), 0),
+        "max_overflow": pool._max_overflow,
+    }
+    if isinstance(pool, InstrumentedQueuePool):
+        stats.update(pool.wait_stats())
+    return stats
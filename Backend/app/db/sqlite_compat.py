@@ -0,0 +1,33 @@
+"""
+DDL shims so the Postgres-first schema can be created on SQLite (in-memory
+databases in tests). Postgres output is unaffected.
+
+- TSVECTOR columns become TEXT, and their generated expression (Postgres
+  full-text functions) is dropped; candidate_search falls back to substring
+  matching on the source columns there.
+- NULLS LAST in index definitions is dropped; SQLite already sorts NULLs
+  last in a DESC index.
+"""
+import re
+
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.schema import CreateColumn, CreateIndex
+
+
+@compiles(TSVECTOR, "sqlite")
+def _tsvector_sqlite(type_, compiler, **kw):
+    return "TEXT"
+
+
+@compiles(CreateColumn, "sqlite")
+def _create_column_sqlite(element, compiler, **kw):
+    column = element.element
+    if isinstance(column.type, TSVECTOR) and column.computed is not None:
+        return f"{compiler.preparer.format_column(column)} TEXT"
+    return compiler.visit_create_column(element, **kw)
+
+
+@compiles(CreateIndex, "sqlite")
+def _create_index_sqlite(element, compiler, **kw):
+    return re.sub(r"\s+NULLS LAST", "", compiler.visit_create_index(element, **kw))
@@ -1,14 +1,41 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from app.database import Base, engine
-from app.routers import analyzer_router, auth_router, candidate_router, company_router, dashboard_router, feedback_router, hr_manager_router, interview_router,  job_router, notification_router, offer_letter_router, payment_router, resume_parsing_router, linkedIn_router, generate_content_router, google_apis_router, availability_router, department_router, static_router, sourcing_router
+from app.authorization.auth import purge_blacklisted_tokens_periodically
+from app.core.config import settings
+from app.routers import analyzer_router, auth_router, candidate_router, company_router, dashboard_router, feedback_router, hr_manager_router, interview_router,  job_router, notification_router, offer_letter_router, payment_router, resume_parsing_router, linkedIn_router, generate_content_router, google_apis_router, availability_router, department_router, static_router, sourcing_router, metrics_router
 
 
+logger = logging.getLogger(__name__)
  
 Base.metadata.create_all(bind=engine)
 
-app = FastAPI(title="RecruitPro API")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    purge_task = asyncio.create_task(purge_blacklisted_tokens_periodically())
+    # The in-memory queue is only reachable from this process, so it always needs
+    # a local worker. With Postgres a local worker runs unless TASK_WORKER_IN_PROCESS
+    # is turned off for deployments running `python -m app.tasks.worker` separately.
+    worker = None
+    if settings.TASK_QUEUE_BACKEND == "memory" or settings.TASK_WORKER_IN_PROCESS:
+        from app.tasks.worker import Worker
+        worker = Worker()
+        worker.start()
+    else:
+        logger.warning("No in-process task worker: emails and calendar events wait in task_queue "
+                       "until `python -m app.tasks.worker` runs")
+    yield
+    purge_task.cancel()
+    if worker:
+        worker.stop(timeout=5)
+
+
+app = FastAPI(title="RecruitPro API", lifespan=lifespan)
 
 app.mount("/static", StaticFiles(directory="app/static"), name="static")
 
@@ -27,6 +54,8 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # open-slot listing: revalidation and date-window paging
+    expose_headers=["ETag", "X-Window-Start", "X-Window-End", "X-Next-From"],
 )
 
 app.include_router(auth_router)
@@ -49,6 +78,7 @@ app.include_router(resume_parsing_router)
 app.include_router(offer_letter_router)
 app.include_router(payment_router)
 app.include_router(sourcing_router)
+app.include_router(metrics_router)
 
 @app.get("/")
 def root():
@@ -9,11 +9,12 @@ from app.db.session import get_db
 from app.db import models
 from app.analyzer.extractor import extract_text
 from app.analyzer.extractor_nlp import extract_resume_fields, match_skills_with_requirements
+from app.services.skills import set_candidate_skills, split_skills
 from app.analyzer.matcher import (
-    calculate_ai_score,
-    normalize_weights,
+    score_components,
     calculate_semantic_similarity
 )
+from app.analyzer.scoring import combine, normalize_weights
 
 logger = logging.getLogger(__name__)
 
@@ -97,6 +98,8 @@ async def analyze_resume(
         
         # Extract resume fields
         skills_extracted, experience_extracted, education_extracted = extract_resume_fields(resume_text)
+        # every extracted skill goes into the taxonomy, not just the ones this job asks for
+        set_candidate_skills(db, candidate_id, split_skills(skills_extracted) + split_skills(candidate.skills))
         
         # Match skills against job requirements
         job_requirements = job_obj.requirements or ""
@@ -107,6 +110,8 @@ async def analyze_resume(
         candidate.skills = skills_extracted or candidate.skills
         candidate.experience = experience_extracted or candidate.experience
         candidate.education = education_extracted or candidate.education
+        # PDF extraction can leave NULs, which Postgres text rejects
+        candidate.resume_text = resume_text.replace("\x00", "")
         # Store a web-accessible URL (use forward slashes) rather than an OS path
         candidate.resume_url = file_url
         
@@ -128,21 +133,19 @@ async def analyze_resume(
             parsing.experience_extracted = experience_extracted or ""
             parsing.education_extracted = education_extracted or ""
         
-        # Calculate AI score
-        job_text = f"{job_obj.title} {job_obj.description or ''} {job_obj.requirements or ''}"
-        weights = normalize_weights(job_obj)
-        
-        ai_score = calculate_ai_score(
-            job_text=job_text,
-            resume_text=resume_text,
-            skills_extracted=skills_extracted or "",
-            experience_extracted=experience_extracted or "",
-            job_requirements=job_requirements,
-            job_description=job_obj.description or "",
-            weights=weights
+        # Calculate AI score, keeping its components so weight changes can rescore without re-reading the resume
+        components = score_components(
+            job_requirements,
+            job_obj.description or "",
+            [resume_text],
+            [skills_extracted or ""],
+            [experience_extracted or ""],
         )
+        ai_score = float(combine(components, normalize_weights(job_obj), job_obj.experience)[0])
         
         # Update candidate and parsing with score
+        for column, value in components.row(0).items():
+            setattr(parsing, column, value)
         candidate.ai_score = int(ai_score)
         parsing.ai_score = float(ai_score)
         
@@ -16,14 +16,15 @@ from app.authorization.auth import (
     create_access_token, 
     create_refresh_token, 
     ACCESS_TOKEN_EXPIRE_MINUTES, 
-    refresh_access_token
+    refresh_access_token,
+    revoke_token
 )
 from app.core.security import authentication_hr, require_role, get_current_hr
 from app.utilities.password import hash_password
 from app.services.company import create_company
 from app.services.hr_manager import create_hr_manager, update_hr_manager, get_hr_by_email
 from app.schemas.auth_token import AuthTokenCreate, GoogleAuthRequest, GoogleSignupRequest
-from app.services.auth import add_access_token, create_blacklisted_token, check_email_exists as email_valid
+from app.services.auth import add_access_token, check_email_exists as email_valid
 
 
 
@@ -80,7 +81,7 @@ def check_email_exists(email: str, db: Session = Depends(get_db)):
 
 @router.post("/hr/login")
 def login_hr(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
-    hr = authentication_hr(form_data.username, form_data.password)
+    hr = authentication_hr(db, form_data.username, form_data.password)
     if not hr:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
     
@@ -117,8 +118,8 @@ def update_hr(updates: HRManagerUpdate, db: Session = Depends(get_db), hr: HRMan
     return updated
 
 @router.post("/refresh")
-def refresh_token(refresh_token: str = Body(..., embed=True)):
-    new_access_token = refresh_access_token(refresh_token)
+def refresh_token(refresh_token: str = Body(..., embed=True), db: Session = Depends(get_db)):
+    new_access_token = refresh_access_token(db, refresh_token)
     if not new_access_token:
         raise HTTPException(status_code=401, detail="Invalid or expired token")
     return {
@@ -127,6 +128,6 @@ def refresh_token(refresh_token: str = Body(..., embed=True)):
     }
 
 @router.post("/hr/logout", status_code=200)
-def logout_hr(refresh_token: str = Body(..., embed=True)):
-    create_blacklisted_token(refresh_token)
+def logout_hr(refresh_token: str = Body(..., embed=True), db: Session = Depends(get_db)):
+    revoke_token(db, refresh_token)
     return {"message": "Successfully logout out"}
\ No newline at end of file
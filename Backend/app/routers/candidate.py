@@ -1,7 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
-from typing import List
-from app.db.session import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Tuple
+from app.db.session import get_db, get_async_db
 from sqlalchemy import desc
 from app.db.models import Candidate, Interview
 from app.schemas.candidate import (
@@ -9,9 +10,12 @@ from app.schemas.candidate import (
     CandidateUpdate,
     CandidateOut,
     CandidateCreateWithAnswersAndPayment, 
+    CandidatePage,
+    CandidateRanking,
+    CandidateSearchPage,
 )
 from app.services.candidate import (
-    create_candidate,
+    submit_application,
     get_candidate,
     get_candidates,
     update_candidate,
@@ -20,34 +24,35 @@ from app.services.candidate import (
     get_selected_for_interview,
     get_selected_candi,
     get_all_candidates_by_job,
+    get_all_candidates_by_job_async,
     deselect_candi,
     get_candidate_answers,
     get_candidates_without_interview as candidates_without_interview,
     update_interviewed_status,
     send_offer_letter,
     select_for_interview,
-    send_gmail_message
+    list_candidates_page,
+    CANDIDATE_LIST_FIELDS,
+    DEFAULT_CANDIDATE_LIST_FIELDS,
 )
-from app.services.google_calendar import get_google_token
-from app.services.job import increment_applicants
+from app.services.candidate_ranking import RankWeights, rank_candidates
+from app.services.candidate_search import search_candidates
+from app.services.skills import split_skills
 from app.services.payment import create_stripe_payment_intent, create_payment_record
 from app.db import models
-from app.core.security import get_current_hr
-from fastapi import BackgroundTasks
+from app.core.security import get_current_hr, get_current_hr_async
+from app.core.config import settings
 
 router = APIRouter(prefix="/candidates", tags=["Candidates"])
 
 
 @router.post("/", status_code=status.HTTP_201_CREATED)
 def create_candidate_endpoint(
-    candidate: CandidateCreateWithAnswersAndPayment, background_tasks: BackgroundTasks, db: Session = Depends(get_db)
+    candidate: CandidateCreateWithAnswersAndPayment, db: Session = Depends(get_db)
 ):
-    # Create candidate (prescreen + CV first)
-    db_candidate = create_candidate(db, candidate)
-    increment_applicants(db, candidate.job_id)
-    # Check if job has an application fee
-    job = db.query(models.Job).filter(models.Job.job_id == candidate.job_id).first()
-    if not job:
+    # Create candidate (prescreen + CV first); the confirmation email is queued with it
+    db_candidate = submit_application(db, candidate)
+    if db_candidate is None:
         raise HTTPException(status_code=404, detail="Job not found")
 
     # if job.application_fee and job.application_fee > 0:
@@ -70,25 +75,8 @@ def create_candidate_endpoint(
     #         "payment_record": db_payment,
     #     }
     # else:
-    token = get_google_token(db, job.hr_id) 
-    
-    if token:
-        email_content = f"Hi {db_candidate.name},\n\nThank you for applying! Your application for {job.title} has been submitted."
-        background_tasks.add_task(
-            send_gmail_message,
-            access_token=token.access_token,
-            recipient=db_candidate.email,
-            subject="Application Submitted",
-            content=email_content
-        )
-    
     return {
-        "candidate": {
-            "candidate_id": db_candidate.candidate_id,
-            "name": db_candidate.name,
-            "email": db_candidate.email,
-            "job_id": db_candidate.job_id,
-        },
+        "candidate": db_candidate,
         "payment": None
     }
 
@@ -98,9 +86,134 @@ def get_all_candidates(db: Session = Depends(get_db), hr: models.HRManager = Dep
     return get_candidates(db, hr.company_id)
 
 
+def parse_list_fields(fields: Optional[str]) -> Tuple[str, ...]:
+    if not fields:
+        return DEFAULT_CANDIDATE_LIST_FIELDS
+    requested = tuple(dict.fromkeys(f.strip() for f in fields.split(",") if f.strip()))
+    unknown = set(requested) - CANDIDATE_LIST_FIELDS
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+    return requested
+
+
+async def candidates_page_response(db: AsyncSession, fields: Optional[str], limit: int, **filters) -> CandidatePage:
+    try:
+        items, next_cursor = await list_candidates_page(db, parse_list_fields(fields), limit, **filters)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return CandidatePage(items=items, next_cursor=next_cursor, limit=limit)
+
+
+@router.get("/page", response_model=CandidatePage)
+async def get_candidates_page(
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return"),
+    selected: Optional[bool] = None,
+    selected_for_interview: Optional[bool] = None,
+    interviewed: Optional[bool] = None,
+    min_score: Optional[int] = Query(None, ge=0, le=100),
+    skills: Optional[str] = Query(None, description="Comma-separated; candidates having all of them"),
+    db: AsyncSession = Depends(get_async_db),
+    hr: models.HRManager = Depends(get_current_hr_async),
+):
+    return await candidates_page_response(
+        db, fields, limit,
+        company_id=hr.company_id,
+        selected=selected,
+        selected_for_interview=selected_for_interview,
+        interviewed=interviewed,
+        min_score=min_score,
+        skills=split_skills(skills),
+        cursor=cursor,
+    )
+
+
+@router.get("/by-job/{job_id}/page", response_model=CandidatePage)
+async def get_candidates_by_job_page(
+    job_id: int,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return"),
+    selected: Optional[bool] = None,
+    selected_for_interview: Optional[bool] = None,
+    interviewed: Optional[bool] = None,
+    min_score: Optional[int] = Query(None, ge=0, le=100),
+    skills: Optional[str] = Query(None, description="Comma-separated; candidates having all of them"),
+    db: AsyncSession = Depends(get_async_db),
+    hr: models.HRManager = Depends(get_current_hr_async),
+):
+    job = await db.get(models.Job, job_id)
+    if not job or job.company_id != hr.company_id:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    return await candidates_page_response(
+        db, fields, limit,
+        job_id=job_id,
+        selected=selected,
+        selected_for_interview=selected_for_interview,
+        interviewed=interviewed,
+        min_score=min_score,
+        skills=split_skills(skills),
+        cursor=cursor,
+    )
+
+
+@router.get("/by-job/{job_id}/ranking", response_model=CandidateRanking)
+async def get_candidate_ranking(
+    job_id: int,
+    k: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0, le=1000),
+    keywords: Optional[str] = Query(None, description="Comma-separated; defaults to the job's requirements"),
+    w_score: float = Query(1.0, ge=0),
+    w_keywords: float = Query(0.0, ge=0),
+    w_experience: float = Query(0.0, ge=0),
+    selected: Optional[bool] = None,
+    selected_for_interview: Optional[bool] = None,
+    interviewed: Optional[bool] = None,
+    min_score: Optional[int] = Query(None, ge=0, le=100),
+    db: AsyncSession = Depends(get_async_db),
+    hr: models.HRManager = Depends(get_current_hr_async),
+):
+    job = await db.get(models.Job, job_id)
+    if not job or job.company_id != hr.company_id:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    weights = RankWeights(score=w_score, keywords=w_keywords, experience=w_experience)
+    items, scanned = await rank_candidates(
+        db, job, k, offset,
+        weights=weights,
+        keywords=[kw.strip() for kw in keywords.split(",") if kw.strip()] if keywords else None,
+        selected=selected,
+        selected_for_interview=selected_for_interview,
+        interviewed=interviewed,
+        min_score=min_score,
+    )
+    return {"items": items, "k": k, "offset": offset, "scanned": scanned, "weights": vars(weights)}
+
+
+@router.get("/search", response_model=CandidateSearchPage)
+def search_candidates_endpoint(
+    q: str = Query(..., min_length=1, max_length=200, description='Web search syntax: "exact phrase", or, -exclude'),
+    job_id: Optional[int] = None,
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0, le=1000),
+    db: Session = Depends(get_db),
+    hr: models.HRManager = Depends(get_current_hr),
+):
+    items, total = search_candidates(db, hr.company_id, q, job_id=job_id, limit=limit, offset=offset)
+    return {
+        "items": items,
+        "total": total,
+        "truncated": total >= settings.SEARCH_RANK_WINDOW,
+        "limit": limit,
+        "offset": offset,
+    }
+
+
 @router.get("/by-job/{job_id}")
-def get_candidates_by_job(job_id: int, db: Session = Depends(get_db)):
-    candidates = get_all_candidates_by_job(db, job_id)
+async def get_candidates_by_job(job_id: int, db: AsyncSession = Depends(get_async_db)):
+    candidates = await get_all_candidates_by_job_async(db, job_id)
     if not candidates:
         raise HTTPException(status_code=404, detail="Job id not present.")
     for cand in candidates:
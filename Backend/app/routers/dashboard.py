@@ -5,6 +5,7 @@ from sqlalchemy import asc
 from app.db.session import get_db
 from app.db.models import HRManager, Interview, Job
 from app.core.security import get_current_hr
+from app.services.pipeline_stats import get_pipeline_stats
 
 router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
 
@@ -45,4 +46,13 @@ def get_earliest_upcoming_interview(
             "meet_link": next_interview.meet_link,
             "status": next_interview.status,
         },
-    }
\ No newline at end of file
+    }
+
+
+@router.get("/pipeline")
+def get_pipeline(
+    db: Session = Depends(get_db),
+    hr: HRManager = Depends(get_current_hr),
+):
+    """Per-job candidate counts by stage and average AI score for the HR's company."""
+    return get_pipeline_stats(db, hr.company_id).as_dict()
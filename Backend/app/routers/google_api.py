@@ -3,47 +3,46 @@ import json
 import io
 import uuid
 import requests
-from datetime import datetime, timedelta, timezone
+from datetime import date, datetime, timedelta, timezone
 from email.mime.text import MIMEText
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Request, UploadFile, File, BackgroundTasks
-from fastapi.responses import RedirectResponse
+from fastapi import APIRouter, Depends, HTTPException, Request, UploadFile, File, Query
+from fastapi.responses import RedirectResponse, Response
 from sqlalchemy.orm import Session
 import urllib.parse
 
-from googleapiclient.discovery import build
 from googleapiclient.http import MediaIoBaseUpload
 from googleapiclient.errors import HttpError
-from google.oauth2.credentials import Credentials
 
 from app.db.session import get_db
-from app.db.models import HRManager, HRAvailability, GoogleToken
-from app.services.google_calendar import create_or_update_google_token, get_google_token, delete_google_token
+from app.db.models import HRManager, HRAvailability
+from app.services.google_calendar import create_or_update_google_token, get_google_token, delete_google_token, get_valid_token
+from app.services.google_clients import google_services
+from app.services.interview_scheduler import schedule_interviews, summarize_schedule
+from app.services.slot_calendar import SlotCalendar
 from app.schemas.google import EventCreate, EmailPayload, SchedulingDetails, OfferLetterPayload
 from app.core.security import get_current_hr
 from app.services.candidate import schedule_interview, update_meet_link, get_candidates_without_interview
 from app.services.hr_availability import get_selected_availability
-from app.services.interview import create_interview
 from app.services.document_template import create_document_template, get_hr_template, delete_all_hr_templates
 from app.services.company import get_company
-from app.schemas.interview import InterviewCreate
 from email.mime.multipart import MIMEMultipart
 from email.mime.application import MIMEApplication
 from dotenv import load_dotenv
 import os
 
-from app.services.interview_slot import create_google_calendar_event
+from app.services.interview_slot import claim_slot, materialize_slots, list_open_slots, invalidate_open_slots
+from app.tasks import enqueue
+from app.tasks.notifications import enqueue_interview_invites
 from app.schemas.interview_slot import GenerateSlotsRequest, AvailableSlotResponse, BookSlotRequest, BulkInvitePayload
-from app.db.models import InterviewSlot, Interview, Candidate, Job
+from app.db.models import Interview, Candidate
 from typing import List
 
 
 from email.mime.text import MIMEText
 import requests
 import smtplib
-from email.mime.multipart import MIMEMultipart
-from fastapi import BackgroundTasks
 
 WEEKDAY_MAP = {
     "Monday": 0, "Tuesday": 1, "Wednesday": 2, "Thursday": 3,
@@ -61,52 +60,6 @@ REDIRECT_URI = os.getenv("REDIRECT_URI")
 SCOPES = "openid email profile https://www.googleapis.com/auth/calendar https://www.googleapis.com/auth/gmail.send https://www.googleapis.com/auth/drive.file https://www.googleapis.com/auth/documents"
 
 
-def refresh_google_token(db: Session, hr_id: int, token: GoogleToken):
-    #print("Refreshing access token", token.refresh_token)
-    token_url = "https://oauth2.googleapis.com/token"
-    old_refresh_token = token.refresh_token
-    old_user_id = token.user_id
-
-    delete_google_token(db, hr_id)
-
-    data = {
-        "client_id": CLIENT_ID,
-        "client_secret": CLIENT_SECRET,
-        "refresh_token": old_refresh_token,
-        "grant_type": "refresh_token"
-    }
-
-    resp = requests.post(token_url, data=data)
-    if resp.status_code != 200:
-        raise HTTPException(status_code=resp.status_code, detail=resp.json())
-
-    token_data = resp.json()
-
-    new_access_token = token_data["access_token"]
-    expires_in = token_data["expires_in"]
-
-    updated_token = create_or_update_google_token(
-        db=db,
-        hr_id=hr_id,
-        user_id=old_user_id,
-        access_token=new_access_token,
-        refresh_token=old_refresh_token,
-        expires_in=expires_in
-    )
-
-    return updated_token
-
-
-
-def get_valid_token(db: Session, hr_id: int):
-    token: GoogleToken = get_google_token(db, hr_id)
-    if not token:
-        raise HTTPException(status_code=401, detail="Not authenticated with google")
-    if token.expires_at <= datetime.now(timezone.utc):
-        token = refresh_google_token(db, hr_id, token)
-    return token
-
-
 @router.get("/auth/login")
 def login_google(db: Session = Depends(get_db), hr: HRManager = Depends(get_current_hr)):
     #hr = get_hr_manager(db, hr_id)
@@ -241,98 +194,21 @@ def schedule_all_interviews(data: SchedulingDetails,db: Session = Depends(get_db
     if not availability:
         raise HTTPException(status_code=400, detail="HR availability not configured")
 
-    days = json.loads(availability.days)
-    duration = timedelta(minutes=availability.duration_minutes)
-    break_time = timedelta(minutes=availability.break_minutes)
-    start_time = datetime.strptime(availability.start_time, "%H:%M").time()
-    end_time = datetime.strptime(availability.end_time, "%H:%M").time()
-
     candidates = get_candidates_without_interview(db, hr.id, data.job_id)
 
     if not candidates:
         raise HTTPException(status_code=404, detail="No pending candidates found for interview scheduling")
 
-    # Generate all interview slots
-    current_date = availability.start_date.date()
-    end_date = availability.end_date.date()
-    all_slots = []
-
-    while current_date <= end_date:
-        weekday = current_date.weekday()
-        weekday_name = list(WEEKDAY_MAP.keys())[weekday]
-
-        if weekday_name in days:
-            current_start = datetime.combine(current_date, start_time)
-            current_end = datetime.combine(current_date, end_time)
-
-            while current_start + duration <= current_end:
-                all_slots.append(current_start)
-                current_start += duration + break_time
-
-        current_date += timedelta(days=1)
-
-    if not all_slots:
+    if SlotCalendar(availability).is_empty():
         raise HTTPException(status_code=400, detail="No valid interview slots found")
 
     token = get_valid_token(db, hr.id)
-    access_token = token.access_token
-    headers = {"Authorization": f"Bearer {access_token}", "Content-Type": "application/json"}
-
-    # Schedule for each candidate
-    created_interviews = []
-    for i, candidate in enumerate(candidates):
-        if i >= len(all_slots):
-            break
-
-        slot_start = all_slots[i]
-        slot_end = slot_start + duration
-
-        # Create Google Calendar event with Meet
-        event = {
-            "summary": data.summary,
-            "description": data.description,
-            "start": {"dateTime": slot_start.isoformat(), "timeZone": "UTC"},
-            "end": {"dateTime": slot_end.isoformat(), "timeZone": "UTC"},
-            "attendees": [{"email": candidate.email}],
-            "conferenceData": {
-                "createRequest": {
-                    "requestId": str(uuid.uuid4()),
-                    "conferenceSolutionKey": {"type": "hangoutsMeet"}
-                }
-            }
-        }
-
-        create_resp = requests.post(
-            "https://www.googleapis.com/calendar/v3/calendars/primary/events?conferenceDataVersion=1&sendUpdates=all",
-            headers=headers,
-            json=event
-        )
-
-        if create_resp.status_code not in [200, 201]:
-            raise HTTPException(status_code=create_resp.status_code, detail=create_resp.json())
-
-        created_event = create_resp.json()
-        meet_link = created_event.get("hangoutLink")
-
-        create_interview(db, InterviewCreate(
-            candidate_id=candidate.candidate_id,
-            job_id=candidate.job_id,
-            scheduled_time=slot_start,
-            meet_link=meet_link
-        ))
-
-        created_interviews.append({
-            "candidate": candidate.name,
-            "email": candidate.email,
-            "time": slot_start.isoformat(),
-            "meetLink": meet_link,
-            "calendarLink": created_event.get("htmlLink")
-        })
-
-    return {
-        "total_interviews_scheduled": len(created_interviews),
-        "scheduled": created_interviews
-    }
+    outcomes = schedule_interviews(
+        db, hr.id, availability, candidates, data.summary, data.description, token.access_token
+    )
+    invalidate_open_slots(hr.id)
+    # failed / unscheduled candidates keep no interview; calling again retries just those
+    return summarize_schedule(outcomes)
 
 @router.post("/send_email")
 def send_email(payload: EmailPayload, db: Session = Depends(get_db), hr: HRManager = Depends(get_current_hr)):
@@ -398,19 +274,6 @@ async def upload_and_convert_template(
         raise HTTPException(status_code=400, detail="Invalid file type. Please upload .docx or .pdf")
 
     try:
-        # Ensure HR has a valid Google token and build Credentials
-        token_obj = get_valid_token(db, hr.id)
-        creds = Credentials(
-            token=token_obj.access_token,
-            refresh_token=token_obj.refresh_token,
-            token_uri="https://oauth2.googleapis.com/token",
-            client_id=CLIENT_ID,
-            client_secret=CLIENT_SECRET,
-            scopes=["https://www.googleapis.com/auth/drive.file"]
-        )
-
-        service = build('drive', 'v3', credentials=creds)
-
         # 2. Prepare Metadata
         # We tell Google: "Store this as a Google Doc"
         file_metadata = {
@@ -426,12 +289,13 @@ async def upload_and_convert_template(
             resumable=True
         )
 
-        # 4. Execute Upload & Conversion
-        uploaded_file = service.files().create(
-            body=file_metadata,
-            media_body=media,
-            fields='id'
-        ).execute()
+        # 4. Execute Upload & Conversion with the HR's cached Drive client
+        with google_services(db, hr.id, ("drive", "v3")) as (drive_service,):
+            uploaded_file = drive_service.files().create(
+                body=file_metadata,
+                media_body=media,
+                fields='id'
+            ).execute()
 
         # Save this ID to your DB to use as a template later
         template_id = uploaded_file.get('id')
@@ -463,81 +327,69 @@ async def send_customized_offer(
     db: Session = Depends(get_db), 
     hr: HRManager = Depends(get_current_hr)
 ):
-    # 1. Validate Token & Get Template
-    token_obj = get_valid_token(db, hr.id)
+    # 1. Get Template
     template = get_hr_template(db, hr.id)
     if not template:
         raise HTTPException(status_code=404, detail="No offer template found.")
-
-    creds = Credentials(
-        token=token_obj.access_token,
-        refresh_token=token_obj.refresh_token,
-        token_uri="https://oauth2.googleapis.com/token",
-        client_id=CLIENT_ID,
-        client_secret=CLIENT_SECRET
-    )
+    company = get_company(db, hr.company_id)
 
     try:
-        drive_service = build('drive', 'v3', credentials=creds)
-        docs_service = build('docs', 'v1', credentials=creds)
-        gmail_service = build('gmail', 'v1', credentials=creds)
-
-        # 2. Copy the Template to a temporary file
-        copy_title = f"Offer_Letter_{payload.candidate_id}_{uuid.uuid4().hex[:6]}"
-        cloned_file = drive_service.files().copy(
-            fileId=template.google_doc_id,
-            body={'name': copy_title}
-        ).execute()
-        new_doc_id = cloned_file.get('id')
-
-        # 3. Create 'Batch Update' requests for placeholders
-        # payload.replacements should look like {"{{salary}}": "5000", "{{role}}": "Dev"}
-        requests = [
-            {
-                'replaceAllText': {
-                    'containsText': {'text': key, 'matchCase': True},
-                    'replaceText': value,
-                }
-            } for key, value in payload.replacements.items()
-        ]
-
-        docs_service.documents().batchUpdate(
-            documentId=new_doc_id, 
-            body={'requests': requests}
-        ).execute()
-
-        # 4. Export the customized Doc as a PDF
-        pdf_content = drive_service.files().export(
-            fileId=new_doc_id,
-            mimeType='application/pdf'
-        ).execute()
-
-        # 5. Prepare Email with Attachment
-        company = get_company(db, hr.company_id)
-        message = MIMEMultipart()
-        message['to'] = payload.candidate_email
-        message['subject'] = f"Offer letter from {company.name}"
+        with google_services(db, hr.id, ("drive", "v3"), ("docs", "v1"), ("gmail", "v1")) as (drive_service, docs_service, gmail_service):
+            # 2. Copy the Template to a temporary file
+            copy_title = f"Offer_Letter_{payload.candidate_id}_{uuid.uuid4().hex[:6]}"
+            cloned_file = drive_service.files().copy(
+                fileId=template.google_doc_id,
+                body={'name': copy_title}
+            ).execute()
+            new_doc_id = cloned_file.get('id')
+
+            # 3. Create 'Batch Update' requests for placeholders
+            # payload.replacements should look like {"{{salary}}": "5000", "{{role}}": "Dev"}
+            requests = [
+                {
+                    'replaceAllText': {
+                        'containsText': {'text': key, 'matchCase': True},
+                        'replaceText': value,
+                    }
+                } for key, value in payload.replacements.items()
+            ]
+
+            docs_service.documents().batchUpdate(
+                documentId=new_doc_id, 
+                body={'requests': requests}
+            ).execute()
+
+            # 4. Export the customized Doc as a PDF
+            pdf_content = drive_service.files().export(
+                fileId=new_doc_id,
+                mimeType='application/pdf'
+            ).execute()
+
+            # 5. Prepare Email with Attachment
+            message = MIMEMultipart()
+            message['to'] = payload.candidate_email
+            message['subject'] = f"Offer letter from {company.name}"
         
-        # Body text
-        msg_body = MIMEText(f"Hello,\n\nPlease find your customized offer letter attached.\n\nBest regards,\n{hr.name}")
-        message.attach(msg_body)
+            # Body text
+            msg_body = MIMEText(f"Hello,\n\nPlease find your customized offer letter attached.\n\nBest regards,\n{hr.name}")
+            message.attach(msg_body)
 
-        # PDF Attachment
-        part = MIMEApplication(pdf_content, Name=f"Offer_Letter.pdf")
-        part['Content-Disposition'] = f'attachment; filename="Offer_Letter.pdf"'
-        message.attach(part)
+            # PDF Attachment
+            part = MIMEApplication(pdf_content, Name=f"Offer_Letter.pdf")
+            part['Content-Disposition'] = f'attachment; filename="Offer_Letter.pdf"'
+            message.attach(part)
 
-        # Encode and Send
-        raw_message = base64.urlsafe_b64encode(message.as_bytes()).decode("utf-8")
-        gmail_service.users().messages().send(
-            userId="me", 
-            body={'raw': raw_message}
-        ).execute()
+            # Encode and Send
+            raw_message = base64.urlsafe_b64encode(message.as_bytes()).decode("utf-8")
+            gmail_service.users().messages().send(
+                userId="me", 
+                body={'raw': raw_message}
+            ).execute()
 
-        # 6. Cleanup: Delete the temporary cloned doc
-        #drive_service.files().delete(fileId=new_doc_id).execute()
+            # 6. Cleanup: Delete the temporary cloned doc
+            #drive_service.files().delete(fileId=new_doc_id).execute()
 
-        return {"status": "success", "message": f"Customized offer sent to {payload.candidate_email}"}
+            return {"status": "success", "message": f"Customized offer sent to {payload.candidate_email}"}
 
     except Exception as e:
         print(f"Error in Offer Flow: {str(e)}")
@@ -551,40 +403,21 @@ def seed_interview_slots(req: GenerateSlotsRequest, db: Session = Depends(get_db
     if not availability:
         raise HTTPException(status_code=404, detail="Availability settings not found")
 
-    days = json.loads(availability.days)
-    current_date = availability.start_date
-    duration = timedelta(minutes=availability.duration_minutes)
-    break_time = timedelta(minutes=availability.break_minutes)
-
-    created_slots = 0
-    while current_date <= availability.end_date:
-        if current_date.strftime("%A") in days:
-            # Generate slots within the start/end time window for that day
-            # This is a simplified version of your original loop
-            current_time = datetime.strptime(availability.start_time, "%H:%M")
-            end_window = datetime.strptime(availability.end_time, "%H:%M")
-
-            while current_time + duration <= end_window:
-                new_slot = InterviewSlot(
-                    availability_id=availability.id,
-                    date=current_date,
-                    start_time=current_time.strftime("%H:%M"),
-                    end_time=(current_time + duration).strftime("%H:%M"),
-                    is_booked=False
-                )
-                db.add(new_slot)
-                current_time += duration + break_time
-                created_slots += 1
-
-        current_date += timedelta(days=1)
-    
-    db.commit()
+    created_slots = materialize_slots(db, availability)
     return {"message": f"Successfully generated {created_slots} available slots."}
 
 
 # --- 1. GET AVAILABLE SLOTS ---
 @router.get("/candidates/slots/{job_id}/{candidate_id}", response_model=List[AvailableSlotResponse])
-def get_open_slots(job_id: int, candidate_id: int, db: Session = Depends(get_db)):
+def get_open_slots(
+    job_id: int,
+    candidate_id: int,
+    request: Request,
+    response: Response,
+    from_date: Optional[date] = None,
+    days: int = Query(7, ge=1, le=31),
+    db: Session = Depends(get_db)
+):
     # 1. Verify Candidate exists and link is not expired
     candidate = db.query(Candidate).filter(Candidate.candidate_id == candidate_id).first()
     if not candidate or not candidate.invited_at:
@@ -596,16 +429,26 @@ def get_open_slots(job_id: int, candidate_id: int, db: Session = Depends(get_db)
     if datetime.now(timezone.utc) > invited_time + timedelta(hours=48):
         raise HTTPException(status_code=403, detail="Invitation link has expired.")
 
-    # 3. Get all available slots for the active HR availability
-    now_utc = datetime.now(timezone.utc).replace(tzinfo=None)
-    slots = db.query(InterviewSlot).join(HRAvailability).join(HRManager).join(Job).filter(
-        Job.job_id == job_id,
-        InterviewSlot.is_booked == False,
-        InterviewSlot.date >= now_utc,
-        HRAvailability.is_selected == True
-    ).all()
-    
-    return slots
+    # 3. Free slots of the HR's active availability for one date window (cached per job),
+    #    only the ones shown get a row (and so an id to book)
+    page = list_open_slots(db, job_id, from_date, days)
+    if page is None:
+        return []
+
+    headers = {
+        "ETag": page.etag,
+        "Cache-Control": "private, no-cache",
+        "X-Window-Start": page.window_start.isoformat(),
+        "X-Window-End": page.window_end.isoformat(),
+    }
+    if page.next_from:
+        headers["X-Next-From"] = page.next_from.isoformat()
+    # repeated polls: nothing changed since the client's copy
+    if page.etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers=headers)
+
+    response.headers.update(headers)
+    return list(page.slots)
 
 # --- 2. BOOK A SLOT --
 
@@ -613,11 +456,11 @@ def get_open_slots(job_id: int, candidate_id: int, db: Session = Depends(get_db)
 def book_slot(
     slot_id: int, 
     req: BookSlotRequest, 
-    background_tasks: BackgroundTasks, 
     db: Session = Depends(get_db)
 ):
-    # 1. Fetch Candidate and check Expiry (48-hour window)
-    candidate = db.query(Candidate).filter(Candidate.candidate_id == req.candidate_id).first()
+    # 1. Fetch Candidate and check Expiry (48-hour window). The row lock serialises
+    #    one candidate's concurrent bookings; other candidates are unaffected.
+    candidate = db.query(Candidate).filter(Candidate.candidate_id == req.candidate_id).with_for_update().first()
     if not candidate or not candidate.invited_at:
         raise HTTPException(status_code=404, detail="Candidate not found")
     
@@ -633,78 +476,55 @@ def book_slot(
     if existing_booking:
         raise HTTPException(status_code=400, detail="You already have an interview scheduled.")
 
-    # 3. Lock the specific slot to prevent race conditions (Concurrent bookings)
-    slot = db.query(InterviewSlot).filter(InterviewSlot.id == slot_id).with_for_update().first()
-    if not slot or slot.is_booked:
+    # 3. Claim the slot: one conditional UPDATE, so only one concurrent booking wins
+    slot = claim_slot(db, slot_id)
+    if not slot:
         raise HTTPException(status_code=400, detail="This slot is no longer available.")
 
-    try:
-        # 4. Google Calendar Integration
-        hr_id = slot.availability.hr_id
-        google_event = create_google_calendar_event(db, slot, req.email, hr_id)
-        meet_link = google_event.get("hangoutLink")
-
-        # 5. Prepare Time Data for DB and Email
-        # Combine the slot date and the start_time string
-        booking_datetime = datetime.combine(
-            slot.date.date(), 
-            datetime.strptime(slot.start_time, "%H:%M").time()
-        )
-        
-        # Format a friendly string for the email (e.g., Monday, Mar 16 at 02:20 PM)
-        friendly_time = booking_datetime.strftime("%A, %b %d at %I:%M %p")
-
-        # 6. Atomic Database Updates
-        slot.is_booked = True
-        
-        new_interview = Interview(
-            candidate_id=candidate.candidate_id,
-            job_id=candidate.job_id,
-            scheduled_time=booking_datetime,
-            meet_link=meet_link,
-            slot_id=slot.id,
-            status="Scheduled"
-        )
-        
-        candidate.interview_scheduled = True
-        candidate.meet_link = meet_link
-
-        db.add(new_interview)
-        db.commit()
-
-        # 7. Trigger Background Confirmation Email
-        hr_id = slot.availability.hr_id
-
-        token_record = get_valid_token(db, hr_id) # Using your existing helper function
-        if not token_record:
-            raise HTTPException(status_code=401, detail="HR Google account not linked; cannot send confirmation.")
-        
-        background_tasks.add_task(
-            send_confirmation_email, 
-            email=candidate.email, 
-            name=candidate.name, 
-            time=friendly_time, 
-            link=meet_link,
-            access_token=token_record.access_token
-        )
+    # Combine the slot date and the start_time string
+    booking_datetime = datetime.combine(
+        slot.date.date(),
+        datetime.strptime(slot.start_time, "%H:%M").time()
+    )
+    # Format a friendly string for the response (e.g., Monday, Mar 16 at 02:20 PM)
+    friendly_time = booking_datetime.strftime("%A, %b %d at %I:%M %p")
+
+    # 4. Record the interview; the Calendar event, Meet link and confirmation email
+    #    follow from the task queue once this commits (the slot is released if that fails)
+    hr_id = db.query(HRAvailability.hr_id).filter(HRAvailability.id == slot.availability_id).scalar()
+    new_interview = Interview(
+        candidate_id=candidate.candidate_id,
+        job_id=candidate.job_id,
+        scheduled_time=booking_datetime,
+        slot_id=slot.id,
+        status="Scheduled"
+    )
+    candidate.interview_scheduled = True
+    db.add(new_interview)
+    db.flush()
+
+    enqueue(
+        "calendar.booking_event",
+        {"interview_id": new_interview.interview_id},
+        idempotency_key=f"booking-event:{new_interview.interview_id}",
+        hr_id=hr_id,
+        db=db,
+    )
+    db.commit()
+    invalidate_open_slots(hr_id)
 
-        return {
-            "status": "success",
-            "message": "Interview booked successfully", 
-            "meet_link": meet_link,
-            "scheduled_at": friendly_time
-        }
-        
-    except Exception as e:
-        db.rollback() 
-        print(f"Booking Error: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Booking failed: {str(e)}")
+    return {
+        "status": "success",
+        "message": "Interview booked successfully. Your Google Meet link will be emailed to you shortly.",
+        "interview_id": new_interview.interview_id,
+        "meet_link": None,
+        "scheduled_at": friendly_time
+    }
 
 # --- 3. SEND BULK INVITES ---
 @router.post("/send-bulk-invites")
 def send_bulk_invites(
     payload: BulkInvitePayload, 
-    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db), 
     hr: HRManager = Depends(get_current_hr)
 ):
@@ -716,147 +536,21 @@ def send_bulk_invites(
     if not token:
         raise HTTPException(status_code=401, detail="HR not authenticated with Google")
 
-    # A. Generate Slots (Only if they don't already exist for these dates)
-    days = json.loads(availability.days)
-    duration = timedelta(minutes=availability.duration_minutes)
-    break_time = timedelta(minutes=availability.break_minutes)
-    start_time_obj = datetime.strptime(availability.start_time, "%H:%M").time()
-    end_time_obj = datetime.strptime(availability.end_time, "%H:%M").time()
-
-    current_date = availability.start_date.date()
-    while current_date <= availability.end_date.date():
-        if current_date.strftime("%A") in days:
-            current_start = datetime.combine(current_date, start_time_obj)
-            current_end = datetime.combine(current_date, end_time_obj)
-
-            while current_start + duration <= current_end:
-                exists = db.query(InterviewSlot).filter(
-                    InterviewSlot.availability_id == availability.id,
-                    InterviewSlot.date == current_start
-                ).first()
-                if not exists:
-                    db.add(InterviewSlot(
-                        availability_id=availability.id,
-                        date=current_start,
-                        start_time=current_start.strftime("%H:%M"),
-                        end_time=(current_start + duration).strftime("%H:%M"),
-                        is_booked=False
-                    ))
-                current_start += duration + break_time
-        current_date += timedelta(days=1)
-
-    # B. Update Candidate 'invited_at' to start 48h timer
-    candidates = db.query(Candidate).filter(Candidate.candidate_id.in_(payload.candidate_ids)).all()
-    for candidate in candidates:
-        candidate.invited_at = datetime.now(timezone.utc)
-    
-    db.commit()
-
-    # C. Background Emailing
-    background_tasks.add_task(
-        process_email_invites, 
-        candidates, 
-        payload.job_id, 
-        payload.subject, 
-        token.access_token, 
-        hr.name
+    # A. Update Candidate 'invited_at' to start 48h timer; slot rows are created
+    # on demand when candidates list or book them
+    candidates = get_candidates_without_interview(
+        db, hr.id, payload.job_id, candidate_ids=payload.candidate_ids, selected_only=False
     )
-
-    return {"message": f"Invites sent to {len(candidates)} candidates."}
-
-# --- 4. GMAIL HELPER ---
-def process_email_invites(candidates: List[Candidate], job_id: int, subject: str, access_token: str, hr_name: str):
-    headers = {"Authorization": f"Bearer {access_token}", "Content-Type": "application/json"}
-
+    invited_at = datetime.now(timezone.utc)
     for candidate in candidates:
-        # Construct link with BOTH job_id and candidate_id for the dynamic route
-        scheduling_link = f"http://localhost:8081/select-slot/{job_id}/{candidate.candidate_id}"
-        
-        email_content = f"""
-        <html>
-            <body style="font-family: sans-serif; color: #333;">
-                <div style="max-width: 600px; margin: auto; border: 1px solid #eee; padding: 20px; border-radius: 10px;">
-                    <h2 style="color: #4F46E5;">Interview Invitation</h2>
-                    <p>Hi {candidate.name},</p>
-                    <p>Please select an interview time slot using the button below. <b>Note: This link expires in 48 hours.</b></p>
-                    <div style="text-align: center; margin: 30px 0;">
-                        <a href="{scheduling_link}" style="background-color: #4F46E5; color: white; padding: 12px 25px; text-decoration: none; border-radius: 6px; font-weight: bold;">Select Time Slot</a>
-                    </div>
-                    <p>Best regards,<br><strong>{hr_name}</strong></p>
-                </div>
-            </body>
-        </html>
-        """
-        message = MIMEText(email_content, "html")
-        message["to"] = candidate.email
-        message["subject"] = subject
-        raw_message = base64.urlsafe_b64encode(message.as_bytes()).decode("utf-8")
-
-        requests.post(
-            "https://gmail.googleapis.com/gmail/v1/users/me/messages/send",
-            headers=headers,
-            json={"raw": raw_message}
-        )
-
+        candidate.invited_at = invited_at
 
-def send_confirmation_email(email: str, name: str, time: str, link: str, access_token: str):
-    """
-    Sends a professional confirmation email using the Gmail API.
-    """
-    headers = {
-        "Authorization": f"Bearer {access_token}", 
-        "Content-Type": "application/json"
-    }
-
-    email_content = f"""
-    <html>
-      <body style="font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; color: #333; line-height: 1.6;">
-        <div style="max-width: 600px; margin: auto; border: 1px solid #e2e8f0; padding: 30px; border-radius: 12px;">
-          <h2 style="color: #1D4ED8; margin-top: 0;">Interview Confirmed!</h2>
-          <p>Hi <strong>{name}</strong>,</p>
-          <p>Your interview has been successfully scheduled. We look forward to speaking with you.</p>
-          
-          <div style="background-color: #f8fafc; border: 1px solid #cbd5e1; padding: 20px; border-radius: 8px; margin: 20px 0;">
-            <p style="margin: 0 0 10px 0;"><strong>Date & Time:</strong> {time} (PKT)</p>
-            <p style="margin: 0;"><strong>Meeting Link:</strong> <a href="{link}" style="color: #2563EB; font-weight: 600;">Join Google Meet</a></p>
-          </div>
-          
-          <p style="font-size: 14px; color: #64748b;">
-            <b>Tip:</b> Please ensure your camera and microphone are working correctly before the session starts.
-          </p>
-          
-          <hr style="border: none; border-top: 1px solid #e2e8f0; margin: 25px 0;" />
-          <p style="font-size: 12px; color: #94a3b8; text-align: center;">
-            Sent via <strong>RecruitPro AI</strong>
-          </p>
-        </div>
-      </body>
-    </html>
-    """
-
-    # Create the MIME message
-    message = MIMEText(email_content, "html")
-    message["to"] = email
-    message["from"] = "RecruitPro AI" # Note: Gmail API usually overrides this with the authenticated user's email
-    message["subject"] = "Interview Confirmed"
-
-    # Encode to base64url format required by Gmail API
-    raw_message = base64.urlsafe_b64encode(message.as_bytes()).decode("utf-8")
+    # B. Queue the invite emails in batches in the same transaction
+    queued = enqueue_interview_invites(
+        [candidate.candidate_id for candidate in candidates],
+        payload.job_id, payload.subject, hr.name, invited_at.isoformat(), hr_id=hr.id, db=db,
+    )
 
-    try:
-        response = requests.post(
-            "https://gmail.googleapis.com/gmail/v1/users/me/messages/send",
-            headers=headers,
-            json={"raw": raw_message}
-        )
-        
-        if response.status_code not in [200, 201]:
-            print(f"Gmail API Error: {response.json()}")
-            return False
-            
-        print(f"Confirmation email successfully sent to {email}")
-        return True
+    db.commit()
 
-    except Exception as e:
-        print(f"Failed to send confirmation email: {e}")
-        return False
\ No newline at end of file
+    return {"message": f"Invites queued for {queued} candidates.", "queued": queued}
@@ -1,8 +1,9 @@
 from datetime import datetime, timezone
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
-from app.db.session import get_db
+from app.db.session import get_db, get_async_db
 from app.db.models import HRManager, Job
 from app.schemas.job import JobCreate, JobUpdate, JobOut, JobCreateWithFormCreate, JobUpdateWithFormUpdate
 from fastapi import Request
@@ -14,10 +15,10 @@ from app.services.job import (
     delete_job,
     get_job_questions,
     get_job_by_slug, 
-    get_jobs_by_company,
+    get_jobs_by_company_async,
     get_jobs_by_department
 )
-from app.core.security import get_current_hr
+from app.core.security import get_current_hr, get_current_hr_async
 
 router = APIRouter(prefix="/jobs", tags=["Jobs"])
 
@@ -34,8 +35,8 @@ def create_job_endpoint(job: JobCreateWithFormCreate, db: Session = Depends(get_
 
 
 @router.get("/get-all")
-def get_jobs(db: Session = Depends(get_db), hr: HRManager = Depends(get_current_hr)):
-    jobs: List[Job] = get_jobs_by_company(db, hr.company_id)
+async def get_jobs(db: AsyncSession = Depends(get_async_db), hr: HRManager = Depends(get_current_hr_async)):
+    jobs: List[Job] = await get_jobs_by_company_async(db, hr.company_id)
     if jobs: 
         for job in jobs:
             if not job.created_at:
@@ -0,0 +1,15 @@
+from fastapi import APIRouter, Depends
+from app.database import engine, async_engine
+from app.db.pool import pool_stats
+from app.core.security import require_role
+
+# pool internals are operational data: admins only
+router = APIRouter(prefix="/metrics", tags=["Metrics"], dependencies=[Depends(require_role("admin"))])
+
+
+@router.get("/")
+def get_metrics():
+    return {
+        "db_pool": pool_stats(engine),
+        "db_pool_async": pool_stats(async_engine.sync_engine),
+    }
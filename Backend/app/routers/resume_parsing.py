@@ -1,7 +1,9 @@
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from app.db.session import get_db
 from app.schemas.resume_parsing import ResumeParsingCreate, ResumeParsingUpdate, ResumeParsingOut
 from app.services.resume_parsing import (
@@ -12,8 +14,8 @@ from app.services.resume_parsing import (
     delete_resume_parsing,
 )
 from app.core.security import get_current_hr
-import requests
-from app.db import models
+from app.services.google_calendar import get_valid_token
+from app.services.feedback_dispatch import feedback_recipients, stream_feedback
 
 
 router = APIRouter(
@@ -22,7 +24,6 @@ router = APIRouter(
     dependencies=[Depends(get_current_hr)]
 )
 
-from app.db.session import get_db
 from app.services.resume_parsing import generate_and_send_feedback
 from app.core.security import get_current_hr
 
@@ -34,43 +35,25 @@ def send_feedback(parsing_id: int, db: Session = Depends(get_db), hr=Depends(get
     result = generate_and_send_feedback(
         db=db,
         parsing_id=parsing_id,
-        hr_id=hr.id 
+        hr_id=hr.id,
+        company_id=hr.company_id
     )
     return result
 
 
 @router.post("/send_all")
-def send_feedback_all(db: Session = Depends(get_db), hr=Depends(get_current_hr)):
-    parsings = db.query(models.ResumeParsing).all()
-    if not parsings:
+async def send_feedback_all(
+    job_id: Optional[int] = Query(None, description="Only candidates of this job"),
+    db: Session = Depends(get_db),
+    hr=Depends(get_current_hr)
+):
+    """Send feedback to the company's (or one job's) candidates, streaming NDJSON progress per batch."""
+    recipients = await run_in_threadpool(feedback_recipients, db, hr.company_id, job_id)
+    if not recipients:
         return {"error": "No resume parsing records found"}
+    token = await run_in_threadpool(get_valid_token, db, hr.id)
 
-    results = []
-    for parsing in parsings:
-        candidate = db.query(models.Candidate).filter(models.Candidate.candidate_id == parsing.candidate_id).first()
-        if not candidate:
-            results.append({"parsing_id": parsing.parsing_id, "error": "Candidate not found"})
-            continue
-
-        # Hardcoded AI feedback
-        ai_feedback = "good job"
-
-        # Email payload
-        email_payload = {
-            "hr_id": hr.id,
-            "recipient": candidate.email,
-            "subject": "Your Resume Analysis Feedback",
-            "content": ai_feedback
-        }
-
-        response = requests.post("http://localhost:8000/googlesend_email", json=email_payload)
-
-        if response.status_code not in [200, 202]:
-            results.append({"parsing_id": parsing.parsing_id, "error": response.json()})
-        else:
-            results.append({"parsing_id": parsing.parsing_id, "success": f"Feedback sent to {candidate.email}"})
-
-    return {"results": results}
+    return StreamingResponse(stream_feedback(token.access_token, recipients), media_type="application/x-ndjson")
 
 
 
@@ -13,6 +13,7 @@ class AuthTokenBase(BaseModel):
 
 class BlacklistedTokenBase(BaseModel):
     token: str
+    expires_at: datetime
 
 
 class AuthTokenCreate(AuthTokenBase):
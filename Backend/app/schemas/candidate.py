@@ -1,5 +1,5 @@
 from pydantic import BaseModel, EmailStr
-from typing import Optional, List
+from typing import Optional, List, Dict, Any
 from .payment import PaymentInCandidate
 
 class AnswerBase(BaseModel):
@@ -46,6 +46,42 @@ class CandidateOut(CandidateBase):
 
 
 
+class CandidatePage(BaseModel):
+    items: List[Dict[str, Any]]
+    next_cursor: Optional[str] = None
+    limit: int
+
+
+class CandidateRanking(BaseModel):
+    items: List[Dict[str, Any]]
+    k: int
+    offset: int
+    scanned: int
+    weights: Dict[str, float]
+
+
+class CandidateSearchHit(BaseModel):
+    candidate_id: int
+    job_id: int
+    name: str
+    email: str
+    ai_score: Optional[int] = None
+    selected_for_interview: Optional[bool] = None
+    interviewed: Optional[bool] = None
+    selected: Optional[bool] = None
+    rank: float
+    headline: str
+
+
+class CandidateSearchPage(BaseModel):
+    items: List[CandidateSearchHit]
+    total: int
+    truncated: bool  # more matches than the ranking window; total is the window
+    limit: int
+    offset: int
+
+
+
 class SelectedCandidateBase(BaseModel):
     candidate_id: int
     hr_id: int
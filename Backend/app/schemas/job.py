@@ -13,6 +13,7 @@ class JobBase(BaseModel):
     salary_range: Optional[str] = None
     deadline: Optional[datetime] = None
     application_fee: Optional[float] = None
+    experience: Optional[float] = None  # required years
     skills_weight: Optional[float] = None
     experience_weight: Optional[float] = None
 
@@ -32,6 +33,9 @@ class JobUpdate(BaseModel):
     salary_range: Optional[str] = None
     deadline: Optional[datetime] = None
     application_fee: Optional[float] = None
+    experience: Optional[float] = None
+    skills_weight: Optional[float] = None
+    experience_weight: Optional[float] = None
 
 class JobUpdateWithFormUpdate(JobUpdate):
     questions_form: Optional[QuestionsFormUpdate] = None
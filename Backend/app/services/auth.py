@@ -1,7 +1,14 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import  Session
 from app.db.models import AuthToken, BlacklistedToken
 from app.schemas.auth_token import AuthTokenCreate, BlacklistedTokenCreate
 from datetime import datetime, timezone
+from cachetools import TLRUCache
+from app.core.config import settings
+import hashlib
+import threading
+import time
 import smtplib
 import dns.resolver
 
@@ -44,16 +51,79 @@ def add_access_token(db: Session, token: AuthTokenCreate):
     db.refresh(db_token)
     return db_token
 
+def hash_token(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def _cache_expiry(_key, expires_at: datetime, _now) -> float:
+    return expires_at.timestamp()
+
+
+# Hot set of revoked token hashes. Entries drop out on their own once the
+# token expires, which is also when the DB row becomes purgeable.
+_revoked_cache = TLRUCache(maxsize=settings.BLACKLIST_CACHE_SIZE, ttu=_cache_expiry, timer=time.time)
+_revoked_cache_lock = threading.Lock()
+
+
+def _remember_revoked(token_hash: str, expires_at: datetime):
+    with _revoked_cache_lock:
+        _revoked_cache[token_hash] = expires_at
+
+
 def create_blacklisted_token(db: Session, token: BlacklistedTokenCreate):
-    db_token = BlacklistedToken(**token.model_dump())
-    db.add(db_token)
-    db.commit()
-    db.refresh(db_token)
+    token_hash = hash_token(token.token)
+    db_token = db.query(BlacklistedToken).filter(BlacklistedToken.token_hash == token_hash).first()
+    if db_token is None:
+        db_token = BlacklistedToken(token_hash=token_hash, expires_at=token.expires_at)
+        db.add(db_token)
+        db.commit()
+        db.refresh(db_token)
+    _remember_revoked(token_hash, token.expires_at)
     return db_token
 
 
+def _is_cached_revoked(token_hash: str) -> bool:
+    with _revoked_cache_lock:
+        return token_hash in _revoked_cache
+
+
+def _active_blacklist_query(token_hash: str):
+    return (
+        select(BlacklistedToken.expires_at)
+        .where(BlacklistedToken.token_hash == token_hash)
+        .where(BlacklistedToken.expires_at > datetime.now(timezone.utc))
+    )
+
+
 def is_blacklisted_token(db: Session, token: str)-> bool:
-    token = db.query(BlacklistedToken).filter(BlacklistedToken.token == token).first()
-    if token is None:
+    token_hash = hash_token(token)
+    if _is_cached_revoked(token_hash):
+        return True
+
+    expires_at = db.execute(_active_blacklist_query(token_hash)).scalar()
+    if expires_at is None:
+        return False
+    _remember_revoked(token_hash, expires_at)
+    return True
+
+
+async def is_blacklisted_token_async(db: AsyncSession, token: str) -> bool:
+    token_hash = hash_token(token)
+    if _is_cached_revoked(token_hash):
+        return True
+
+    expires_at = (await db.execute(_active_blacklist_query(token_hash))).scalar()
+    if expires_at is None:
         return False
-    return True
\ No newline at end of file
+    _remember_revoked(token_hash, expires_at)
+    return True
+
+
+def purge_expired_blacklisted_tokens(db: Session) -> int:
+    deleted = (
+        db.query(BlacklistedToken)
+        .filter(BlacklistedToken.expires_at <= datetime.now(timezone.utc))
+        .delete(synchronize_session=False)
+    )
+    db.commit()
+    return deleted
@@ -1,8 +1,15 @@
+from sqlalchemy import select, insert, and_, or_, exists
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.db import models
+from app.services.job import increment_applicants
+from app.services.skills import has_all_skills, skill_ids_query, skill_keys
+from app.tasks import enqueue
 from app.schemas.candidate import CandidateCreate, CandidateUpdate, CandidateCreateWithAnswersAndPayment
 import base64
+import json
 import requests
+from typing import Optional, Sequence, Tuple, List, Dict, Any
 from email.mime.text import MIMEText
 
 
@@ -24,7 +31,7 @@ def send_gmail_message(access_token: str, recipient: str, subject: str, content:
 
 
 
-def create_candidate(db: Session, candidate_data: CandidateCreateWithAnswersAndPayment):
+def _add_candidate(db: Session, candidate_data: CandidateCreateWithAnswersAndPayment) -> models.Candidate:
     db_candidate = models.Candidate(
         job_id = candidate_data.job_id,
         company_id = candidate_data.company_id,
@@ -38,23 +45,59 @@ def create_candidate(db: Session, candidate_data: CandidateCreateWithAnswersAndP
         resume_url=candidate_data.resume_url 
     )
     db.add(db_candidate)
-    db.commit()
-    db.refresh(db_candidate)
+    db.flush()
 
     if candidate_data.answers:
-        for ans in candidate_data.answers:
-            db_answer = models.Answer(
-                candidate_id=db_candidate.candidate_id,
-                question_id=ans.question_id,
-                answer_text=ans.answer_text
-            )
-            db.add(db_answer)
-
-        db.commit() 
-        db.refresh(db_candidate)
+        # one multi-row INSERT for all answers
+        db.execute(insert(models.Answer), [
+            {"candidate_id": db_candidate.candidate_id, "question_id": ans.question_id, "answer_text": ans.answer_text}
+            for ans in candidate_data.answers
+        ])
+    return db_candidate
 
+def create_candidate(db: Session, candidate_data: CandidateCreateWithAnswersAndPayment):
+    db_candidate = _add_candidate(db, candidate_data)
+    db.commit()
+    db.refresh(db_candidate)
     return db_candidate
 
+def submit_application(db: Session, candidate_data: CandidateCreateWithAnswersAndPayment) -> Optional[Dict[str, Any]]:
+    """
+    Public application intake in one transaction: the job and whether its HR
+    has linked Google are read with a single outer join, then the candidate,
+    its answers, the applicant counter and the confirmation email task are
+    written and committed once.
+
+    Returns None if the job does not exist, otherwise the candidate summary
+    (captured before commit so nothing is reloaded).
+    """
+    job = db.execute(
+        select(models.Job.hr_id, models.GoogleToken.id.label("token_id"))
+        .outerjoin(models.GoogleToken, models.GoogleToken.hr_id == models.Job.hr_id)
+        .where(models.Job.job_id == candidate_data.job_id)
+        .limit(1)
+    ).first()
+    if job is None:
+        return None
+
+    db_candidate = _add_candidate(db, candidate_data)
+    increment_applicants(db, candidate_data.job_id, commit=False)
+    if job.token_id is not None:
+        enqueue(
+            "email.application_received",
+            {"candidate_id": db_candidate.candidate_id},
+            idempotency_key=f"application-received:{db_candidate.candidate_id}",
+            hr_id=job.hr_id,
+            db=db,
+        )
+    application = {
+        "candidate_id": db_candidate.candidate_id,
+        "name": db_candidate.name,
+        "email": db_candidate.email,
+        "job_id": db_candidate.job_id,
+    }
+    db.commit()
+    return application
 
 
 def get_candidate(db: Session, candidate_id: int):
@@ -68,23 +111,130 @@ def get_candidate_by_email(db: Session, email: str):
 def get_candidates(db: Session, company_id: int, skip: int = 0, limit: int = 100):
     return db.query(models.Candidate).filter(models.Candidate.company_id == company_id).offset(skip).limit(limit).all()
 
+# Columns a listing may project. The large text blobs are only sent when asked for.
+CANDIDATE_LIST_FIELDS = {
+    "candidate_id", "job_id", "name", "email", "phone", "location", "resume_url",
+    "ai_score", "selected_for_interview", "interview_scheduled", "interviewed", "selected",
+    "meet_link", "created_at", "invited_at", "skills", "experience", "education",
+}
+DEFAULT_CANDIDATE_LIST_FIELDS = (
+    "candidate_id", "name", "email", "ai_score", "selected_for_interview",
+    "interview_scheduled", "interviewed", "selected", "created_at",
+)
+
+
+def encode_candidate_cursor(ai_score: Optional[int], candidate_id: int) -> str:
+    raw = json.dumps([ai_score, candidate_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("utf-8")
+
+
+def decode_candidate_cursor(cursor: str) -> Tuple[Optional[int], int]:
+    try:
+        ai_score, candidate_id = json.loads(base64.urlsafe_b64decode(cursor.encode("utf-8")))
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if not isinstance(candidate_id, int) or not (ai_score is None or isinstance(ai_score, int)):
+        raise ValueError("Invalid cursor")
+    return ai_score, candidate_id
+
+
+def candidate_page_query(
+    fields: Sequence[str],
+    limit: int,
+    job_id: Optional[int] = None,
+    company_id: Optional[int] = None,
+    selected: Optional[bool] = None,
+    selected_for_interview: Optional[bool] = None,
+    interviewed: Optional[bool] = None,
+    min_score: Optional[int] = None,
+    skill_ids: Sequence[int] = (),
+    cursor: Optional[str] = None,
+):
+    """
+    Keyset page over candidates ordered by (ai_score DESC NULLS LAST, candidate_id).
+    Fetches one extra row so the caller can tell whether another page exists.
+    """
+    Candidate = models.Candidate
+    columns = {"candidate_id", "ai_score", *fields}
+    stmt = select(*[getattr(Candidate, f) for f in sorted(columns)])
+
+    if job_id is not None:
+        stmt = stmt.where(Candidate.job_id == job_id)
+    if company_id is not None:
+        stmt = stmt.where(Candidate.company_id == company_id)
+    if selected is not None:
+        stmt = stmt.where(Candidate.selected == selected)
+    if selected_for_interview is not None:
+        stmt = stmt.where(Candidate.selected_for_interview == selected_for_interview)
+    if interviewed is not None:
+        stmt = stmt.where(Candidate.interviewed == interviewed)
+    if min_score is not None:
+        stmt = stmt.where(Candidate.ai_score >= min_score)
+    if skill_ids:
+        stmt = stmt.where(has_all_skills(skill_ids))
+
+    if cursor:
+        last_score, last_id = decode_candidate_cursor(cursor)
+        if last_score is None:
+            stmt = stmt.where(and_(Candidate.ai_score.is_(None), Candidate.candidate_id > last_id))
+        else:
+            stmt = stmt.where(or_(
+                Candidate.ai_score < last_score,
+                and_(Candidate.ai_score == last_score, Candidate.candidate_id > last_id),
+                Candidate.ai_score.is_(None),
+            ))
+
+    return (
+        stmt.order_by(Candidate.ai_score.desc().nullslast(), Candidate.candidate_id.asc())
+        .limit(limit + 1)
+    )
+
+
+async def list_candidates_page(db: AsyncSession, fields: Sequence[str], limit: int, skills: Sequence[str] = (),
+                               **filters) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    if skills:
+        keys = skill_keys(skills)
+        found = dict((await db.execute(skill_ids_query(keys))).all())
+        if len(found) < len(keys):
+            return [], None  # a skill no candidate has
+        filters["skill_ids"] = list(found.values())
+    result = await db.execute(candidate_page_query(fields, limit, **filters))
+    rows = result.mappings().all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_candidate_cursor(last["ai_score"], last["candidate_id"])
+
+    items = [{f: row[f] for f in ("candidate_id", *fields) if f in row} for row in rows]
+    return items, next_cursor
+
 def get_candidate_answers(db: Session, candidate_id: int):
     return db.query(models.Answer).filter(models.Answer.candidate_id == candidate_id).all()
 
-def get_candidates_without_interview(db: Session, hr_id: int, job_id: int):
-    return (
-        db.query(models.Candidate)
+def candidates_without_interview_query(hr_id: int, job_id: int, candidate_ids: Optional[Sequence[int]] = None, selected_only: bool = True):
+    """
+    Candidates of one of the HR's jobs that have no interview yet.
+
+    The anti-join is correlated per candidate (NOT EXISTS), so Postgres probes
+    ix_interview_candidate_id_status_scheduled_time once per candidate of the
+    job instead of materialising every interview in the database.
+    """
+    has_interview = exists().where(models.Interview.candidate_id == models.Candidate.candidate_id)
+    stmt = (
+        select(models.Candidate)
         .join(models.Job, models.Candidate.job_id == models.Job.job_id)
-        .filter(models.Job.hr_id == hr_id)
-        .filter(models.Candidate.job_id == job_id)
-        .filter(models.Candidate.selected_for_interview == True)
-        .filter(
-            ~models.Candidate.candidate_id.in_(
-                db.query(models.Interview.candidate_id)
-            )
-        )
-        .all()
+        .where(models.Job.hr_id == hr_id, models.Candidate.job_id == job_id, ~has_interview)
     )
+    if selected_only:
+        stmt = stmt.where(models.Candidate.selected_for_interview == True)
+    if candidate_ids is not None:
+        stmt = stmt.where(models.Candidate.candidate_id.in_(candidate_ids))
+    return stmt
+
+def get_candidates_without_interview(db: Session, hr_id: int, job_id: int, candidate_ids: Optional[Sequence[int]] = None, selected_only: bool = True):
+    return db.execute(candidates_without_interview_query(hr_id, job_id, candidate_ids, selected_only)).scalars().all()
 
 def select_for_interview(db: Session, candidate_id: int):
     db_candidate = get_candidate(db, candidate_id)
@@ -125,6 +275,10 @@ def get_selected_candi(db: Session, job_id: int):
 def get_all_candidates_by_job(db: Session, job_id: int):
     return db.query(models.Candidate).filter(models.Candidate.job_id == job_id).all()
 
+async def get_all_candidates_by_job_async(db: AsyncSession, job_id: int):
+    result = await db.execute(select(models.Candidate).filter(models.Candidate.job_id == job_id))
+    return result.scalars().all()
+
 def select_candi(db: Session, candidate_id: int):
     db_candidate = get_candidate(db, candidate_id)
     if not db_candidate:
@@ -0,0 +1,153 @@
+import heapq
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import select, true
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.analyzer.keywords import extract_keywords, keyword_coverage, normalize_keywords
+from app.analyzer.scoring import experience_fit, experience_years
+from app.db import models
+
+# rows fetched from the cursor per round while looking for the top-K
+MIN_CHUNK = 100
+
+
+@dataclass
+class RankWeights:
+    """
+    rank_score = score * ai_score / 100 + keywords * coverage + experience * fit,
+    each signal in [0, 1].
+    """
+    score: float = 1.0
+    keywords: float = 0.0
+    experience: float = 0.0
+
+    @property
+    def uses_resume(self) -> bool:
+        return self.keywords > 0 or self.experience > 0
+
+
+def ranking_query(
+    job_id: int,
+    company_id: int,
+    with_resume: bool,
+    limit: Optional[int] = None,
+    selected: Optional[bool] = None,
+    selected_for_interview: Optional[bool] = None,
+    interviewed: Optional[bool] = None,
+    min_score: Optional[int] = None,
+):
+    """
+    The job's candidates in index order (ai_score DESC NULLS LAST, candidate_id),
+    i.e. a range scan of ix_candidate_job_id_ai_score, optionally with their
+    latest resume parsing joined per row.
+    """
+    Candidate = models.Candidate
+    stmt = (
+        select(Candidate.candidate_id, Candidate.name, Candidate.email, Candidate.ai_score,
+               Candidate.selected_for_interview, Candidate.interviewed, Candidate.selected,
+               Candidate.skills, Candidate.experience)
+        .join(models.Job, Candidate.job_id == models.Job.job_id)
+        .where(Candidate.job_id == job_id, models.Job.company_id == company_id)
+    )
+    if selected is not None:
+        stmt = stmt.where(Candidate.selected == selected)
+    if selected_for_interview is not None:
+        stmt = stmt.where(Candidate.selected_for_interview == selected_for_interview)
+    if interviewed is not None:
+        stmt = stmt.where(Candidate.interviewed == interviewed)
+    if min_score is not None:
+        stmt = stmt.where(Candidate.ai_score >= min_score)
+
+    if with_resume:
+        parsing = (
+            select(models.ResumeParsing.skills_extracted, models.ResumeParsing.experience_extracted)
+            .where(models.ResumeParsing.candidate_id == Candidate.candidate_id)
+            .order_by(models.ResumeParsing.parsing_id.desc())
+            .limit(1)
+            .lateral()
+        )
+        stmt = stmt.add_columns(parsing.c.skills_extracted, parsing.c.experience_extracted).outerjoin(parsing, true())
+    return stmt.order_by(Candidate.ai_score.desc().nullslast(), Candidate.candidate_id.asc()).limit(limit)
+
+
+def _ranked(row, weights: RankWeights, keywords: Set[str], required_years: Optional[float]) -> Dict[str, Any]:
+    ai_score = row.ai_score or 0
+    item = {
+        "candidate_id": row.candidate_id,
+        "name": row.name,
+        "email": row.email,
+        "ai_score": ai_score,
+        "selected_for_interview": row.selected_for_interview,
+        "interviewed": row.interviewed,
+        "selected": row.selected,
+    }
+    rank_score = weights.score * ai_score / 100
+    if weights.uses_resume:
+        coverage = keyword_coverage(keywords, " ".join(filter(None, (row.skills_extracted, row.skills))))
+        years = experience_years(row.experience_extracted or row.experience)
+        rank_score += weights.keywords * coverage + weights.experience * experience_fit(years, required_years)
+        item.update(keyword_coverage=round(coverage, 3), experience_years=years)
+    item["rank_score"] = round(rank_score, 4)
+    return item
+
+
+async def rank_candidates(
+    db: AsyncSession,
+    job: models.Job,
+    k: int,
+    offset: int = 0,
+    weights: Optional[RankWeights] = None,
+    keywords: Optional[Sequence[str]] = None,
+    **filters,
+) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Top candidates of a job, ranks offset+1 .. offset+k, ordered by rank_score
+    then ai_score then candidate_id. Returns (items, rows scanned).
+
+    With the score weight alone the order is the index order, so exactly the
+    requested page is read. With resume signals, rows are streamed in ai_score
+    order and reading stops once no unread row can beat the current k-th best:
+    an unread row has ai_score <= the last one read, and its other signals are
+    at most their weights (threshold algorithm).
+    """
+    weights = weights or RankWeights()
+    need = offset + k
+    with_resume = weights.uses_resume
+    keyword_set = normalize_keywords(keywords) if keywords else extract_keywords(job.requirements or "")
+
+    heap: List[tuple] = []  # min-heap of the best `need` so far
+    scanned = 0
+
+    def consider(rows) -> None:
+        for row in rows:
+            item = _ranked(row, weights, keyword_set, job.experience)
+            key = (item["rank_score"], item["ai_score"], -item["candidate_id"])
+            if len(heap) < need:
+                heapq.heappush(heap, (key, item))
+            elif key > heap[0][0]:
+                heapq.heapreplace(heap, (key, item))
+
+    if not with_resume:
+        rows = (await db.execute(ranking_query(job.job_id, job.company_id, False, limit=need, **filters))).all()
+        scanned = len(rows)
+        consider(rows)
+    else:
+        # one server-side cursor over the index order, read until the threshold is reached
+        result = await db.stream(ranking_query(job.job_id, job.company_id, True, **filters))
+        try:
+            async for rows in result.partitions(max(MIN_CHUNK, need * 2)):
+                scanned += len(rows)
+                consider(rows)
+                last = rows[-1]
+                ceiling = weights.score * (last.ai_score or 0) / 100 + weights.keywords + weights.experience
+                if len(heap) >= need and heap[0][0][0] >= ceiling:
+                    break
+        finally:
+            await result.close()
+
+    ranked = [item for _, item in sorted(heap, key=lambda entry: entry[0], reverse=True)]
+    for position, item in enumerate(ranked, start=1):
+        item["rank"] = position
+    return ranked[offset:need], scanned
@@ -0,0 +1,169 @@
+import re
+import shlex
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, func, not_, or_, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db import models
+
+SEARCH_CONFIG = "english"
+HEADLINE_OPTIONS = 'StartSel=<mark>, StopSel=</mark>, MaxWords=25, MinWords=8, MaxFragments=2'
+
+# ts_rank_cd's default weights for the A..D labels of candidate.search_vector
+FIELD_WEIGHTS = (("name", 1.0), ("skills", 1.0), ("experience", 0.4), ("education", 0.2), ("resume_text", 0.1))
+
+_HIT_COLUMNS = ("candidate_id", "job_id", "name", "email", "ai_score", "selected_for_interview", "interviewed", "selected")
+
+
+def _hit(row, rank: float, headline: str) -> Dict[str, Any]:
+    item = {column: getattr(row, column) for column in _HIT_COLUMNS}
+    item.update(rank=round(float(rank), 4), headline=headline)
+    return item
+
+
+def _document(candidate):
+    return func.concat_ws(" | ", candidate.skills, candidate.experience, candidate.education, candidate.resume_text)
+
+
+def matches_query(company_id: int, q: str, job_id: Optional[int] = None, window: Optional[int] = None):
+    """
+    The company's candidates whose search_vector matches the websearch query
+    (quoted phrases, OR, -exclusions), cut to the `window` best by ai_score.
+    Ranking has to read every matched tsvector, which for a term most
+    resumes contain is most of the table, so only the window is ranked.
+    A selective query matches fewer rows than that and is ranked in full.
+    """
+    Candidate = models.Candidate
+    stmt = select(Candidate.candidate_id, Candidate.search_vector).where(
+        Candidate.company_id == company_id,
+        Candidate.search_vector.bool_op("@@")(func.websearch_to_tsquery(SEARCH_CONFIG, q)),
+    )
+    if job_id is not None:
+        stmt = stmt.where(Candidate.job_id == job_id)
+    return (
+        stmt.order_by(Candidate.ai_score.desc().nullslast(), Candidate.candidate_id)
+        .limit(window or settings.SEARCH_RANK_WINDOW)
+        .subquery()
+    )
+
+
+def search_query(company_id: int, q: str, job_id: Optional[int] = None, limit: int = 20, offset: int = 0,
+                 window: Optional[int] = None):
+    """
+    One page of matches, best ts_rank_cd first, with the number of ranked
+    matches. ts_headline re-parses the full text, so it only runs for the
+    rows of the page.
+    """
+    Candidate = models.Candidate
+    tsquery = func.websearch_to_tsquery(SEARCH_CONFIG, q)
+    matches = matches_query(company_id, q, job_id, window)
+    rank = func.ts_rank_cd(matches.c.search_vector, tsquery, 32)  # rank / (rank + 1)
+    page = (
+        select(matches.c.candidate_id, rank.label("rank"), func.count().over().label("total"))
+        .order_by(rank.desc(), matches.c.candidate_id)
+        .limit(limit)
+        .offset(offset)
+        .subquery()
+    )
+    return (
+        select(*(getattr(Candidate, column) for column in _HIT_COLUMNS), page.c.rank, page.c.total,
+               func.ts_headline(SEARCH_CONFIG, _document(Candidate), tsquery, HEADLINE_OPTIONS).label("headline"))
+        .join(page, page.c.candidate_id == Candidate.candidate_id)
+        .order_by(page.c.rank.desc(), Candidate.candidate_id)
+    )
+
+
+def _search_postgres(db: Session, company_id: int, q: str, job_id: Optional[int], limit: int,
+                     offset: int) -> Tuple[List[Dict[str, Any]], int]:
+    rows = db.execute(search_query(company_id, q, job_id, limit, offset)).all()
+    if rows:
+        return [_hit(row, row.rank, row.headline) for row in rows], rows[0].total
+    if offset == 0:
+        return [], 0
+    # past the last page the window count never ran
+    matches = matches_query(company_id, q, job_id)
+    return [], db.execute(select(func.count()).select_from(matches)).scalar_one()
+
+
+def parse_terms(q: str) -> Tuple[List[str], List[str]]:
+    """Lower-cased (required, excluded) terms; quoted phrases stay one term."""
+    try:
+        tokens = shlex.split(q)
+    except ValueError:  # unbalanced quote
+        tokens = q.replace('"', " ").split()
+    required, excluded = [], []
+    for token in tokens:
+        if token.lower() == "or":
+            continue
+        negated = token.startswith("-") and len(token) > 1
+        term = " ".join(token.lstrip("-").lower().split())
+        if term:
+            (excluded if negated else required).append(term)
+    return required, excluded
+
+
+def highlight(text: str, terms: List[str], width: int = 160) -> str:
+    """A window of `text` around the first match with every term wrapped in <mark>."""
+    if not text or not terms:
+        return (text or "")[:width]
+    pattern = re.compile("|".join(re.escape(term) for term in sorted(terms, key=len, reverse=True)), re.IGNORECASE)
+    first = pattern.search(text)
+    start = max(0, first.start() - width // 4) if first else 0
+    window = text[start:start + width]
+    marked = pattern.sub(lambda m: f"<mark>{m.group(0)}</mark>", window)
+    return ("..." if start else "") + marked + ("..." if start + width < len(text) else "")
+
+
+def _search_fallback(db: Session, company_id: int, q: str, job_id: Optional[int], limit: int,
+                     offset: int) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Substring matching for databases without tsvector (SQLite in tests): the
+    terms filter in SQL, ranking and highlighting happen here. Same weights
+    and window as the Postgres path, no stemming.
+    """
+    required, excluded = parse_terms(q)
+    if not required:
+        return [], 0
+    Candidate = models.Candidate
+    fields = [getattr(Candidate, name) for name, _ in FIELD_WEIGHTS]
+
+    def anywhere(term):
+        # coalesce: a NULL field would make NOT(...) NULL and drop the row from exclusions
+        return or_(*(func.lower(func.coalesce(field, "")).contains(term, autoescape=True) for field in fields))
+
+    stmt = select(*(getattr(Candidate, column) for column in _HIT_COLUMNS), *fields).where(
+        Candidate.company_id == company_id,
+        and_(*(anywhere(term) for term in required)),
+        *(not_(anywhere(term)) for term in excluded),
+    )
+    if job_id is not None:
+        stmt = stmt.where(Candidate.job_id == job_id)
+    stmt = stmt.order_by(Candidate.ai_score.desc().nullslast(), Candidate.candidate_id).limit(settings.SEARCH_RANK_WINDOW)
+
+    scored = []
+    for row in db.execute(stmt):
+        score = sum(
+            weight * (getattr(row, name) or "").lower().count(term)
+            for term in required for name, weight in FIELD_WEIGHTS
+        )
+        scored.append((score / (score + 1), row))
+    scored.sort(key=lambda entry: (-entry[0], entry[1].candidate_id))
+
+    items = []
+    for rank, row in scored[offset:offset + limit]:
+        document = " | ".join(filter(None, (row.skills, row.experience, row.education, row.resume_text)))
+        items.append(_hit(row, rank, highlight(document, required)))
+    return items, len(scored)
+
+
+def search_candidates(db: Session, company_id: int, q: str, job_id: Optional[int] = None, limit: int = 20,
+                      offset: int = 0) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Ranked, highlighted candidates matching `q`. Returns (items, matches
+    ranked), the latter capped at SEARCH_RANK_WINDOW.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        return _search_postgres(db, company_id, q, job_id, limit, offset)
+    return _search_fallback(db, company_id, q, job_id, limit, offset)
@@ -0,0 +1,33 @@
+import os
+from functools import lru_cache
+
+from jinja2 import Environment, FileSystemLoader, StrictUndefined, select_autoescape
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "templates", "email")
+
+# Templates are compiled once per process and kept in the environment's cache;
+# auto_reload is off so rendering never stats the files again.
+_env = Environment(
+    loader=FileSystemLoader(TEMPLATE_DIR),
+    autoescape=select_autoescape(["html"]),
+    undefined=StrictUndefined,
+    auto_reload=False,
+    cache_size=-1,
+    trim_blocks=True,
+    lstrip_blocks=True,
+)
+
+
+@lru_cache(maxsize=None)
+def get_email_template(name: str):
+    return _env.get_template(f"{name}.html")
+
+
+def render_email(template_name: str, /, **context) -> str:
+    return get_email_template(template_name).render(**context)
+
+
+def precompile_email_templates():
+    """Compile every template up front, e.g. at worker start-up."""
+    for filename in _env.list_templates(extensions=["html"]):
+        get_email_template(filename[:-len(".html")])
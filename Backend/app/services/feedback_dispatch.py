@@ -0,0 +1,64 @@
+import json
+from typing import AsyncIterator, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.db import models
+from app.services.mailer import GmailBulkSender, OutgoingEmail
+
+FEEDBACK_SUBJECT = "Your Resume Analysis Feedback"
+
+
+def feedback_recipients(db: Session, company_id: int, job_id: Optional[int] = None, parsing_ids: Optional[List[int]] = None):
+    """Resume parsings of the company's candidates (optionally one job / given ids), joined to the candidate in one query."""
+    stmt = (
+        select(models.ResumeParsing.parsing_id, models.Candidate.candidate_id, models.Candidate.name, models.Candidate.email)
+        .join(models.Candidate, models.Candidate.candidate_id == models.ResumeParsing.candidate_id)
+        .join(models.Job, models.Job.job_id == models.Candidate.job_id)
+        .where(models.Job.company_id == company_id)
+        .order_by(models.ResumeParsing.parsing_id)
+    )
+    if job_id is not None:
+        stmt = stmt.where(models.Candidate.job_id == job_id)
+    if parsing_ids is not None:
+        stmt = stmt.where(models.ResumeParsing.parsing_id.in_(parsing_ids))
+    return db.execute(stmt).all()
+
+
+def feedback_email(recipient) -> OutgoingEmail:
+    # Hardcoded AI feedback until the Gemini prompt is switched back on
+    ai_feedback = "good job"
+    return OutgoingEmail(recipient=recipient.email, subject=FEEDBACK_SUBJECT, body=ai_feedback, subtype="plain", ref=recipient.parsing_id)
+
+
+def _line(event: dict) -> str:
+    return json.dumps(event) + "\n"
+
+
+async def stream_feedback(access_token: str, recipients) -> AsyncIterator[str]:
+    """
+    Send feedback to every recipient and yield NDJSON progress: a "start"
+    line, one "progress" line per finished batch with that batch's
+    per-recipient results, and a final "done" line with the totals.
+    """
+    emails = [feedback_email(r) for r in recipients]
+    total, done, sent = len(emails), 0, 0
+    yield _line({"event": "start", "total": total})
+
+    async for batch in GmailBulkSender(access_token).iter_results(emails):
+        done += len(batch)
+        sent += sum(r.ok for r in batch)
+        yield _line({
+            "event": "progress",
+            "done": done,
+            "total": total,
+            "sent": sent,
+            "failed": done - sent,
+            "results": [
+                {"parsing_id": r.ref, "recipient": r.recipient, "ok": r.ok, "status_code": r.status_code, "attempts": r.attempts, "error": r.error}
+                for r in batch
+            ],
+        })
+
+    yield _line({"event": "done", "total": total, "sent": sent, "failed": total - sent})
@@ -1,7 +1,21 @@
+import os
+import threading
+import time
+import requests
+from dataclasses import dataclass
+from typing import Optional
+from cachetools import LRUCache, TLRUCache
+from dotenv import load_dotenv
+from fastapi import HTTPException
 from sqlalchemy.orm import Session
 from datetime import datetime, timedelta, timezone
+from app.core.config import settings
 from app.db.models import GoogleToken
 
+load_dotenv()
+CLIENT_ID = os.getenv("CLIENT_ID")
+CLIENT_SECRET = os.getenv("CLIENT_SECRET")
+
 def create_or_update_google_token(db: Session, hr_id: int, user_id: str, access_token: str, refresh_token: str, expires_in: int, email: str = None):
     
     expires_at = datetime.now(timezone.utc) + timedelta(seconds=expires_in)
@@ -28,6 +42,7 @@ def create_or_update_google_token(db: Session, hr_id: int, user_id: str, access_
 
     db.commit()
     db.refresh(token)
+    forget_google_token(hr_id)
     return token
 
 
@@ -38,8 +53,121 @@ def get_google_token(db: Session, hr_id: int):
 def delete_google_token(db: Session, hr_id: int):
     deleted_count = db.query(GoogleToken).filter_by(hr_id=hr_id).delete(synchronize_session=False)
     db.commit()
+    forget_google_token(hr_id)
     return deleted_count > 0
 
 
+@dataclass(frozen=True)
+class GoogleAccessToken:
+    """Detached copy of a GoogleToken row, safe to cache and share across sessions and threads."""
+    hr_id: int
+    access_token: str
+    refresh_token: Optional[str]
+    expires_at: datetime
+
+
+def _refresh_margin() -> timedelta:
+    return timedelta(seconds=settings.GOOGLE_TOKEN_REFRESH_MARGIN_SEC)
+
+
+def _cache_expiry(_hr_id, token: GoogleAccessToken, _now) -> float:
+    # drop out of the cache once the token enters the refresh window
+    return (token.expires_at - _refresh_margin()).timestamp()
+
+
+_token_cache = TLRUCache(maxsize=settings.GOOGLE_TOKEN_CACHE_SIZE, ttu=_cache_expiry, timer=time.time)
+_token_cache_lock = threading.Lock()
+# bounded like the token cache; evicting an idle HR's lock is harmless, and even a lock
+# evicted while held only costs a duplicate load, since refreshes lock the token row
+_refresh_locks: LRUCache = LRUCache(maxsize=settings.GOOGLE_TOKEN_CACHE_SIZE)
+
+
+def _cached_token(hr_id: int) -> Optional[GoogleAccessToken]:
+    with _token_cache_lock:
+        return _token_cache.get(hr_id)
+
+
+def _remember_token(token: GoogleToken) -> GoogleAccessToken:
+    snapshot = GoogleAccessToken(token.hr_id, token.access_token, token.refresh_token, token.expires_at)
+    with _token_cache_lock:
+        _token_cache[token.hr_id] = snapshot
+    return snapshot
+
+
+def forget_google_token(hr_id: int):
+    with _token_cache_lock:
+        _token_cache.pop(hr_id, None)
+
+
+def _refresh_lock(hr_id: int) -> threading.Lock:
+    with _token_cache_lock:
+        lock = _refresh_locks.get(hr_id)
+        if lock is None:
+            lock = _refresh_locks[hr_id] = threading.Lock()
+        return lock
+
+
+def _needs_refresh(token: GoogleToken) -> bool:
+    return token.expires_at - _refresh_margin() <= datetime.now(timezone.utc)
+
+
+def refresh_google_token(db: Session, hr_id: int, token: GoogleToken):
+    """
+    Refresh the access token in place. The row is locked FOR UPDATE for the
+    duration, so across processes only one refresh per HR happens; whoever
+    waited finds a fresh token and skips the call to Google.
+    """
+    token = db.query(GoogleToken).filter(GoogleToken.id == token.id).with_for_update().populate_existing().first()
+    if token is None:
+        db.rollback()
+        raise HTTPException(status_code=401, detail="Not authenticated with google")
+    if not _needs_refresh(token):
+        db.commit()
+        return token
+
+    data = {
+        "client_id": CLIENT_ID,
+        "client_secret": CLIENT_SECRET,
+        "refresh_token": token.refresh_token,
+        "grant_type": "refresh_token"
+    }
+
+    try:
+        resp = requests.post("https://oauth2.googleapis.com/token", data=data, timeout=15)
+    except requests.RequestException as e:
+        db.rollback()
+        raise HTTPException(status_code=503, detail=f"Google token refresh failed: {e}")
+    if resp.status_code != 200:
+        db.rollback()
+        raise HTTPException(status_code=resp.status_code, detail=resp.json())
+
+    token_data = resp.json()
+    token.access_token = token_data["access_token"]
+    token.expires_at = datetime.now(timezone.utc) + timedelta(seconds=token_data["expires_in"])
+    if token_data.get("refresh_token"):
+        token.refresh_token = token_data["refresh_token"]
+    db.commit()
+    return token
+
+
+def get_valid_token(db: Session, hr_id: int) -> GoogleAccessToken:
+    """
+    Access token for the HR, served from an in-process cache until shortly
+    before expiry (GOOGLE_TOKEN_REFRESH_MARGIN_SEC). On a miss, one thread per
+    HR loads or refreshes it while the others wait for its result.
+    """
+    token = _cached_token(hr_id)
+    if token is not None:
+        return token
 
+    with _refresh_lock(hr_id):
+        token = _cached_token(hr_id)
+        if token is not None:
+            return token
 
+        row: GoogleToken = get_google_token(db, hr_id)
+        if not row:
+            raise HTTPException(status_code=401, detail="Not authenticated with google")
+        if _needs_refresh(row):
+            row = refresh_google_token(db, hr_id, row)
+        return _remember_token(row)
@@ -0,0 +1,114 @@
+import json
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Callable, Dict, Iterator, Optional, Tuple
+
+import httplib2
+from cachetools import LRUCache
+from google.oauth2.credentials import Credentials
+from google_auth_httplib2 import AuthorizedHttp
+from googleapiclient import discovery_cache
+from googleapiclient.discovery import Resource, build_from_document
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.services.google_calendar import GoogleAccessToken, get_valid_token
+
+
+@lru_cache(maxsize=None)
+def _discovery_document(name: str, version: str) -> str:
+    """Discovery document bundled with google-api-python-client; never fetched over the network."""
+    document = discovery_cache.get_static_doc(name, version)
+    if document is None:
+        raise ValueError(f"No static discovery document for {name} {version}")
+    return document
+
+
+class _HRClients:
+    """One HR's credentials, keep-alive transport and built services."""
+
+    def __init__(self, http: httplib2.Http):
+        self.credentials = Credentials(token=None)
+        self.http = AuthorizedHttp(self.credentials, http=http)
+        self.services: Dict[Tuple[str, str], Resource] = {}
+        self.lock = threading.Lock()
+
+
+class GoogleClientFactory:
+    """
+    Hands out googleapiclient services per HR. Each HR keeps one
+    AuthorizedHttp (so TLS connections are reused across requests) and the
+    services built on it, whose dynamically generated methods are the
+    expensive part of build(). The access token comes from the token manager
+    and is swapped into the shared credentials on every use.
+
+    httplib2 connections are not thread-safe, so an HR's clients are used
+    under that HR's lock; different HRs run in parallel.
+
+    Tests can pass `http_factory=lambda: HttpMockSequence([...])` to run
+    against canned responses.
+    """
+
+    def __init__(self, http_factory: Optional[Callable[[], httplib2.Http]] = None, max_hrs: Optional[int] = None):
+        self.http_factory = http_factory or (lambda: httplib2.Http(timeout=60))
+        self._clients = LRUCache(maxsize=max_hrs or settings.GOOGLE_CLIENT_CACHE_SIZE)
+        self._lock = threading.Lock()
+
+    def _for_hr(self, hr_id: int) -> _HRClients:
+        with self._lock:
+            clients = self._clients.get(hr_id)
+            if clients is None:
+                clients = self._clients[hr_id] = _HRClients(self.http_factory())
+            return clients
+
+    @contextmanager
+    def services(self, token: GoogleAccessToken, *apis: Tuple[str, str]) -> Iterator[Tuple[Resource, ...]]:
+        clients = self._for_hr(token.hr_id)
+        with clients.lock:
+            clients.credentials.token = token.access_token
+            clients.credentials.expiry = token.expires_at.replace(tzinfo=None)  # google-auth compares naive UTC
+            built = []
+            for name, version in apis:
+                service = clients.services.get((name, version))
+                if service is None:
+                    service = clients.services[(name, version)] = build_from_document(
+                        json.loads(_discovery_document(name, version)), http=clients.http
+                    )
+                built.append(service)
+            yield tuple(built)
+
+    def forget(self, hr_id: int):
+        with self._lock:
+            self._clients.pop(hr_id, None)
+
+
+_factory: Optional[GoogleClientFactory] = None
+_factory_lock = threading.Lock()
+
+
+def get_google_client_factory() -> GoogleClientFactory:
+    global _factory
+    if _factory is None:
+        with _factory_lock:
+            if _factory is None:
+                _factory = GoogleClientFactory()
+    return _factory
+
+
+def set_google_client_factory(factory: Optional[GoogleClientFactory]):
+    """Swap the process-wide factory, e.g. for one with a fake transport in tests."""
+    global _factory
+    _factory = factory
+
+
+@contextmanager
+def google_services(db: Session, hr_id: int, *apis: Tuple[str, str]) -> Iterator[Tuple[Resource, ...]]:
+    """
+    Usage:
+        with google_services(db, hr.id, ("drive", "v3"), ("gmail", "v1")) as (drive, gmail):
+            drive.files().copy(...).execute()
+    """
+    token = get_valid_token(db, hr_id)
+    with get_google_client_factory().services(token, *apis) as services:
+        yield services
@@ -1,3 +1,5 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.db.models import HRManager
 from app.schemas.hr_manager import HRManagerCreate, HRManagerUpdate
@@ -27,6 +29,10 @@ def get_hr_managers(db: Session):
 def get_hr_by_email(db: Session, email: str) -> HRManager | None:
     return db.query(HRManager).filter(HRManager.email == email).first()
 
+async def get_hr_by_email_async(db: AsyncSession, email: str) -> HRManager | None:
+    result = await db.execute(select(HRManager).filter(HRManager.email == email))
+    return result.scalars().first()
+
 
 def update_hr_manager(db: Session, hr_id: int, hr_in: HRManagerUpdate) -> HRManager | None:
     db_hr = get_hr_manager(db, hr_id)
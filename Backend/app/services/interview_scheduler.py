@@ -0,0 +1,192 @@
+import asyncio
+import base64
+import hashlib
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+import httpx
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db import models
+from app.services.mailer import TokenBucket, _backoff, _is_retryable
+from app.services.slot_calendar import iter_free_slots
+
+CALENDAR_EVENTS_URL = "https://www.googleapis.com/calendar/v3/calendars/primary/events"
+
+
+@dataclass
+class ScheduleOutcome:
+    candidate_id: int
+    candidate: str
+    email: str
+    status: str  # "scheduled" | "failed" | "no_slot"
+    time: Optional[str] = None
+    meetLink: Optional[str] = None
+    calendarLink: Optional[str] = None
+    interview_id: Optional[int] = None
+    status_code: Optional[int] = None
+    retryable: bool = False
+    error: Optional[str] = None
+
+
+def calendar_event_id(hr_id: int, candidate_id: int, start: datetime) -> str:
+    """
+    Deterministic Calendar event id (base32hex, as the API requires). Re-sending
+    an insert whose response was lost returns 409 instead of a second event.
+    """
+    digest = hashlib.sha256(f"interview:{hr_id}:{candidate_id}:{start.isoformat()}".encode()).digest()
+    return base64.b32hexencode(digest).decode().rstrip("=").lower()
+
+
+class CalendarScheduler:
+    """
+    Creates Calendar events (with Meet links) concurrently over one pooled
+    HTTP/2 client, bounded by a semaphore and a token bucket. 429, 5xx,
+    rate-limit 403s and transport errors are retried with backoff. Every
+    event gets a client-side id, so a retried insert that already succeeded
+    comes back as 409 and the existing event is fetched instead.
+    """
+
+    def __init__(self, access_token: str, concurrency: Optional[int] = None, rate_per_sec: Optional[float] = None,
+                 max_attempts: Optional[int] = None, transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.access_token = access_token
+        self.concurrency = concurrency or settings.CALENDAR_CONCURRENCY
+        self.rate = rate_per_sec or settings.CALENDAR_RATE_PER_SEC
+        self.max_attempts = max_attempts or settings.CALENDAR_MAX_ATTEMPTS
+        self.transport = transport
+
+    def _client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            http2=self.transport is None,
+            transport=self.transport,
+            headers={"Authorization": f"Bearer {self.access_token}"},
+            timeout=httpx.Timeout(30.0, connect=10.0),
+            limits=httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency),
+        )
+
+    async def _request(self, client: httpx.AsyncClient, bucket: TokenBucket, method: str, url: str, **kwargs):
+        """Returns (status_code, json body or error text, retryable, attempts)."""
+        attempt = 0
+        while True:
+            attempt += 1
+            await bucket.acquire()
+            retry_after = None
+            try:
+                response = await client.request(method, url, **kwargs)
+            except httpx.TransportError as e:
+                status_code, error, retryable = None, f"{type(e).__name__}: {e}", True
+            else:
+                if response.status_code in (200, 201):
+                    return response.status_code, response.json(), False, attempt
+                status_code, error = response.status_code, response.text[:500]
+                retryable = _is_retryable(response.status_code, response.text)
+                retry_after = response.headers.get("Retry-After")
+            if not retryable or attempt >= self.max_attempts:
+                return status_code, error, retryable, attempt
+            await asyncio.sleep(_backoff(attempt, retry_after))
+
+    async def _create_one(self, client: httpx.AsyncClient, semaphore: asyncio.Semaphore, bucket: TokenBucket,
+                          event: Dict[str, Any]):
+        params = {"conferenceDataVersion": 1, "sendUpdates": "all"}
+        async with semaphore:
+            status_code, body, retryable, _ = await self._request(
+                client, bucket, "POST", CALENDAR_EVENTS_URL, params=params, json=event
+            )
+            if status_code == 409:
+                # our id already exists: an earlier attempt went through
+                status_code, body, retryable, _ = await self._request(
+                    client, bucket, "GET", f"{CALENDAR_EVENTS_URL}/{event['id']}"
+                )
+                if status_code == 200 and body.get("status") == "cancelled":
+                    # deleted by the HR; ids stay reserved, so insert under a fresh id
+                    fresh = {k: v for k, v in event.items() if k != "id"}
+                    status_code, body, retryable, _ = await self._request(
+                        client, bucket, "POST", CALENDAR_EVENTS_URL, params=params, json=fresh
+                    )
+            return status_code, body, retryable
+
+    async def create_events(self, events: Sequence[Dict[str, Any]]) -> List[tuple]:
+        semaphore = asyncio.Semaphore(self.concurrency)
+        bucket = TokenBucket(self.rate, capacity=self.concurrency)
+        async with self._client() as client:
+            return await asyncio.gather(*(self._create_one(client, semaphore, bucket, e) for e in events))
+
+
+def schedule_interviews(db: Session, hr_id: int, availability: models.HRAvailability, candidates: Sequence[models.Candidate],
+                        summary: str, description: str, access_token: str, **options) -> List[ScheduleOutcome]:
+    """
+    Assign each candidate the next free start time, create all Calendar events
+    concurrently, then insert an Interview for every created event in a single
+    transaction. Failed or unassigned candidates have no Interview, so calling
+    this again with the same job picks up exactly those.
+    """
+    free = iter_free_slots(db, availability)
+
+    outcomes, planned, events = [], [], []
+    for candidate in sorted(candidates, key=lambda c: c.candidate_id):
+        outcome = ScheduleOutcome(candidate_id=candidate.candidate_id, candidate=candidate.name,
+                                  email=candidate.email, status="no_slot")
+        outcomes.append(outcome)
+        slot = next(free, None)
+        if slot is None:
+            outcome.error = "No free interview slot left in the HR's availability"
+            continue
+        start = slot.start
+        event_id = calendar_event_id(hr_id, candidate.candidate_id, start)
+        planned.append((outcome, candidate, start))
+        events.append({
+            "id": event_id,
+            "summary": summary,
+            "description": description,
+            "start": {"dateTime": start.isoformat(), "timeZone": "UTC"},
+            "end": {"dateTime": slot.end.isoformat(), "timeZone": "UTC"},
+            "attendees": [{"email": candidate.email}],
+            "conferenceData": {
+                "createRequest": {
+                    "requestId": event_id,
+                    "conferenceSolutionKey": {"type": "hangoutsMeet"}
+                }
+            }
+        })
+
+    results = asyncio.run(CalendarScheduler(access_token, **options).create_events(events)) if events else []
+
+    interviews = []
+    for (outcome, candidate, start), (status_code, body, retryable) in zip(planned, results):
+        outcome.time = start.isoformat()
+        outcome.status_code = status_code
+        if status_code not in (200, 201):
+            outcome.status, outcome.retryable, outcome.error = "failed", retryable, body
+            continue
+        outcome.status = "scheduled"
+        outcome.meetLink = body.get("hangoutLink")
+        outcome.calendarLink = body.get("htmlLink")
+        interviews.append((outcome, models.Interview(
+            candidate_id=candidate.candidate_id,
+            job_id=candidate.job_id,
+            scheduled_time=start,
+            meet_link=outcome.meetLink,
+        )))
+
+    if interviews:
+        db.add_all([interview for _, interview in interviews])
+        db.commit()
+        for outcome, interview in interviews:
+            outcome.interview_id = interview.interview_id
+    return outcomes
+
+
+def summarize_schedule(outcomes: Sequence[ScheduleOutcome]) -> Dict[str, Any]:
+    scheduled = [o for o in outcomes if o.status == "scheduled"]
+    return {
+        "total_interviews_scheduled": len(scheduled),
+        "scheduled": [
+            {"candidate": o.candidate, "email": o.email, "time": o.time, "meetLink": o.meetLink, "calendarLink": o.calendarLink}
+            for o in scheduled
+        ],
+        "failed": sum(o.status == "failed" for o in outcomes),
+        "unscheduled": sum(o.status == "no_slot" for o in outcomes),
+        "results": [asdict(o) for o in outcomes],
+    }
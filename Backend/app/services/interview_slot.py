@@ -1,7 +1,10 @@
 from sqlalchemy.orm import Session
-from datetime import datetime
-from typing import List, Optional
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone
+from typing import List, Optional, Sequence, Tuple
+import hashlib
 import json
+import threading
 
 from app.db import models
 from app.schemas.interview import (
@@ -9,10 +12,14 @@ from app.schemas.interview import (
 )
 
 import uuid
-import requests
+from cachetools import TTLCache
+from sqlalchemy import select, update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
-from fastapi import HTTPException
-from app.db.models import InterviewSlot, Interview, Candidate, GoogleToken, HRAvailability
+from app.db.models import InterviewSlot, Interview, Candidate, HRAvailability
+from app.core.config import settings
+from app.services.hr_availability import get_selected_availability
+from app.services.slot_calendar import Slot, SlotCalendar, free_slots
 
 def create_slot(db: Session, data: InterviewSlotCreate):
     db_slot = models.InterviewSlot(**data.model_dump())
@@ -24,6 +31,129 @@ def create_slot(db: Session, data: InterviewSlotCreate):
 def get_slots(db: Session, availability_id: int) -> List[models.InterviewSlot]:
     return db.query(models.InterviewSlot).filter(models.InterviewSlot.availability_id == availability_id).all()
 
+def _insert_slots(db: Session, availability_id: int, slots: Sequence[Slot]) -> int:
+    """Batched multi-row INSERT ... ON CONFLICT DO NOTHING; returns how many rows were new."""
+    if not slots:
+        return 0
+    rows = [
+        {
+            "availability_id": availability_id,
+            "date": slot.start,
+            "start_time": slot.start.strftime("%H:%M"),
+            "end_time": slot.end.strftime("%H:%M"),
+            "is_booked": False,
+        }
+        for slot in slots
+    ]
+    stmt = insert(InterviewSlot).on_conflict_do_nothing(
+        index_elements=["availability_id", "date"]
+    ).returning(InterviewSlot.id)
+    return len(db.execute(stmt, rows).all())
+
+def materialize_slots(db: Session, availability: HRAvailability, commit: bool = True) -> int:
+    """
+    Create all of the availability's missing slot rows. The existing start
+    times for the window come back in one query and only the difference is
+    inserted; the unique (availability_id, date) constraint keeps concurrent
+    callers from duplicating a slot. Returns how many were created.
+
+    Listing and booking do not need this: they go through SlotCalendar and
+    get_or_create_slots, which only store the slots actually shown.
+    """
+    slots = list(SlotCalendar(availability))
+    if not slots:
+        return 0
+    existing = set(db.execute(
+        select(InterviewSlot.date).where(
+            InterviewSlot.availability_id == availability.id,
+            InterviewSlot.date.between(slots[0].start, slots[-1].start),
+        )
+    ).scalars())
+    created = _insert_slots(db, availability.id, [slot for slot in slots if slot.start not in existing])
+    if commit:
+        db.commit()
+    return created
+
+def get_or_create_slots(db: Session, availability: HRAvailability, slots: Sequence[Slot]) -> List[InterviewSlot]:
+    """Slot rows for these generated slots, inserting the missing ones (no commit)."""
+    if not slots:
+        return []
+    _insert_slots(db, availability.id, slots)
+    return db.query(InterviewSlot).filter(
+        InterviewSlot.availability_id == availability.id,
+        InterviewSlot.date.in_([slot.start for slot in slots]),
+    ).order_by(InterviewSlot.date).all()
+
+@dataclass(frozen=True)
+class OpenSlotsPage:
+    hr_id: int
+    slots: Tuple[dict, ...]
+    window_start: date
+    window_end: date  # exclusive
+    next_from: Optional[date]
+    etag: str
+
+
+# (job_id, window start, days) -> OpenSlotsPage. Short TTL: a booking invalidates
+# its HR's entries here, but other worker processes only see it on expiry.
+_open_slots_cache = TTLCache(maxsize=settings.OPEN_SLOTS_CACHE_SIZE, ttl=settings.OPEN_SLOTS_CACHE_TTL_SEC)
+_open_slots_lock = threading.Lock()
+
+
+def _open_slots_page(db: Session, job_id: int, window_start: date, days: int) -> Optional[OpenSlotsPage]:
+    hr_id = db.query(models.Job.hr_id).filter(models.Job.job_id == job_id).scalar()
+    availability = get_selected_availability(db, hr_id) if hr_id else None
+    if not availability:
+        return None
+
+    window_end = window_start + timedelta(days=days)
+    now_utc = datetime.now(timezone.utc).replace(tzinfo=None)
+    start = max(now_utc, datetime.combine(window_start, time.min))
+    rows = get_or_create_slots(db, availability, free_slots(db, availability, start=start, end=datetime.combine(window_end, time.min)))
+    # read the rows before committing; afterwards each would be reloaded one by one
+    slots = tuple(
+        {"id": row.id, "date": row.date, "start_time": row.start_time, "end_time": row.end_time}
+        for row in rows if not row.is_booked
+    )
+    next_from = window_end if window_end <= availability.end_date.date() else None
+    db.commit()
+
+    fingerprint = json.dumps([window_start.isoformat(), days] + [[s["id"], s["date"].isoformat()] for s in slots])
+    return OpenSlotsPage(
+        hr_id=hr_id,
+        slots=slots,
+        window_start=window_start,
+        window_end=window_end,
+        next_from=next_from,
+        etag='"%s"' % hashlib.blake2b(fingerprint.encode(), digest_size=16).hexdigest(),
+    )
+
+
+def list_open_slots(db: Session, job_id: int, window_start: Optional[date] = None, days: int = 7) -> Optional[OpenSlotsPage]:
+    """
+    Free slots of the job's HR availability in [window_start, window_start + days),
+    cached per job and window for OPEN_SLOTS_CACHE_TTL_SEC. None if the HR has
+    no active availability.
+    """
+    window_start = max(window_start or date.min, datetime.now(timezone.utc).date())
+    key = (job_id, window_start, days)
+    with _open_slots_lock:
+        page = _open_slots_cache.get(key)
+    if page is None:
+        page = _open_slots_page(db, job_id, window_start, days)
+        if page is not None:
+            with _open_slots_lock:
+                _open_slots_cache[key] = page
+    return page
+
+
+def invalidate_open_slots(hr_id: int):
+    """Drop cached listings of every job of this HR (their jobs share one availability)."""
+    with _open_slots_lock:
+        for key in [k for k, page in _open_slots_cache.items() if page.hr_id == hr_id]:
+            _open_slots_cache.pop(key, None)
+
+
 def mark_slot_booked(db: Session, slot_id: int, interview_id: int):
     slot = db.query(models.InterviewSlot).filter(models.InterviewSlot.id == slot_id).first()
     if not slot:
@@ -35,35 +165,42 @@ def mark_slot_booked(db: Session, slot_id: int, interview_id: int):
     return slot
 
 
-def get_google_headers(db: Session, hr_id: int):
-    token = db.query(GoogleToken).filter(GoogleToken.hr_id == hr_id).first()
-    if not token:
-        raise HTTPException(status_code=400, detail="HR Google Calendar not linked")
-    return {"Authorization": f"Bearer {token.access_token}", "Content-Type": "application/json"}
+def claim_slot(db: Session, slot_id: int):
+    """
+    Mark the slot booked if it is still free, in a single conditional UPDATE:
+    concurrent claims queue on the row for the length of that statement only,
+    and exactly one of them gets the row back. Returns None if it was taken
+    (or does not exist). The caller commits.
+    """
+    return db.execute(
+        update(InterviewSlot)
+        .where(InterviewSlot.id == slot_id, InterviewSlot.is_booked == False)
+        .values(is_booked=True)
+        .returning(InterviewSlot.id, InterviewSlot.availability_id, InterviewSlot.date,
+                   InterviewSlot.start_time, InterviewSlot.end_time)
+    ).first()
 
-def create_google_calendar_event(db: Session, slot: InterviewSlot, candidate_email: str, hr_id: int):
-    headers = get_google_headers(db, hr_id)
-    
-    # 1. Format date
+def release_slot(db: Session, slot_id: int):
+    db.execute(update(InterviewSlot).where(InterviewSlot.id == slot_id).values(is_booked=False))
+
+def booking_event_body(slot, candidate_email: str, event_id: Optional[str] = None) -> dict:
+    """Calendar event (with a Meet link) for a candidate's self-booked slot."""
     date_str = slot.date.strftime("%Y-%m-%d")
-    
-    # 2. IMPORTANT: Remove the 'Z' from the end of the string.
-    # Google will use the 'timeZone' field below to interpret these values.
+
+    # No 'Z' suffix: Google interprets these in the 'timeZone' given below
     start_time = f"{date_str}T{slot.start_time}:00"
     end_time = f"{date_str}T{slot.end_time}:00"
-
-    # 3. Use your local TimeZone (Asia/Karachi for PKT)
     local_tz = "Asia/Karachi"
 
-    event_data = {
+    event = {
         "summary": "Job Interview Invitation - RecruitPro",
         "description": "You have been invited to an interview. Please click the link below to join the meeting at the scheduled time.",
         "start": {
-            "dateTime": start_time, 
+            "dateTime": start_time,
             "timeZone": local_tz
         },
         "end": {
-            "dateTime": end_time, 
+            "dateTime": end_time,
             "timeZone": local_tz
         },
         "attendees": [
@@ -71,25 +208,11 @@ def create_google_calendar_event(db: Session, slot: InterviewSlot, candidate_ema
         ],
         "conferenceData": {
             "createRequest": {
-                "requestId": str(uuid.uuid4()),
+                "requestId": event_id or str(uuid.uuid4()),
                 "conferenceSolutionKey": {"type": "hangoutsMeet"}
             }
         }
     }
-
-    # API URL with parameters to enable Meet links and send email notifications
-    api_url = "https://www.googleapis.com/calendar/v3/calendars/primary/events?conferenceDataVersion=1&sendUpdates=all"
-
-    response = requests.post(
-        api_url,
-        headers=headers,
-        json=event_data
-    )
-    
-    if response.status_code not in [200, 201]:
-        # Detailed logging for debugging
-        error_info = response.json()
-        print(f"Google API Error: {error_info}")
-        raise HTTPException(status_code=response.status_code, detail=error_info)
-    
-    return response.json()
\ No newline at end of file
+    if event_id:
+        event["id"] = event_id
+    return event
@@ -1,8 +1,14 @@
+from sqlalchemy import select, update, func
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from app.analyzer.scoring import rescore_job
 from app.db import models
 from app.schemas.job import JobCreate, JobUpdate, JobUpdateWithFormUpdate, JobCreateWithFormCreate
 from app.schemas.questions_form import QuestionsFormCreate
 from app.schemas.question import QuestionCreate
+from app.services.pipeline_stats import mark_pipeline_stats_stale
+
+SCORING_FIELDS = {"skills_weight", "experience_weight", "experience"}
 
 
 def create_job(db: Session, job_data: JobCreateWithFormCreate):
@@ -17,6 +23,7 @@ def create_job(db: Session, job_data: JobCreateWithFormCreate):
         salary_range = job_data.salary_range, 
         deadline = job_data.deadline,
         application_fee = job_data.application_fee,
+        experience = job_data.experience,
         skills_weight = job_data.skills_weight,
         experience_weight = job_data.experience_weight,
         job_type = job_data.job_type
@@ -42,27 +49,24 @@ def create_job(db: Session, job_data: JobCreateWithFormCreate):
 
     return db_job
 
-def increment_applicants(db: Session, job_id: int):
-    job = db.query(models.Job).filter(models.Job.job_id == job_id).first()
-    if not job: return None
-    if not job.applicants:
-        job.applicants = 1
-    else:
-        job.applicants = job.applicants + 1
-    db.commit()
-    db.refresh(job)
+def _increment_counter(db: Session, job_id: int, column, commit: bool = True):
+    # Single UPDATE ... RETURNING: no read-modify-write, so concurrent
+    # applications cannot overwrite each other's increments.
+    job = db.execute(
+        update(models.Job)
+        .where(models.Job.job_id == job_id)
+        .values({column: func.coalesce(column, 0) + 1})
+        .returning(models.Job)
+    ).scalar_one_or_none()
+    if commit:
+        db.commit()
     return job
 
+def increment_applicants(db: Session, job_id: int, commit: bool = True):
+    return _increment_counter(db, job_id, models.Job.applicants, commit)
+
 def increment_selected(db: Session, job_id: int):
-    job = db.query(models.Job).filter(models.Job.job_id == job_id).first()
-    if not job: return None
-    if not job.selected:
-        job.selected = 1
-    else:
-        job.selected = job.selected + 1
-    db.commit()
-    db.refresh(job)
-    return job
+    return _increment_counter(db, job_id, models.Job.selected)
 
 def get_job(db: Session, job_id: int):
     return db.query(models.Job).filter(models.Job.job_id == job_id).first()
@@ -70,6 +74,10 @@ def get_job(db: Session, job_id: int):
 def get_jobs_by_company(db: Session, company_id: int):
     return db.query(models.Job).filter(models.Job.company_id == company_id).all()
 
+async def get_jobs_by_company_async(db: AsyncSession, company_id: int):
+    result = await db.execute(select(models.Job).filter(models.Job.company_id == company_id))
+    return result.scalars().all()
+
 def get_job_questions(db: Session, job_id: int):
     return db.query(models.Question).join(models.QuestionsForm).filter(models.QuestionsForm.job_id == job_id).all()
 
@@ -87,9 +95,15 @@ def update_job(db: Session, job_id: int, job_data: JobUpdateWithFormUpdate):
     if not db_job:
         return None
 
-    for field, value in job_data.model_dump(exclude_unset=True, exclude={"questions_form"}).items():
+    changes = job_data.model_dump(exclude_unset=True, exclude={"questions_form"})
+    for field, value in changes.items():
         setattr(db_job, field, value)
 
+    # new weights or required experience only recombine the stored score components
+    if SCORING_FIELDS & changes.keys():
+        rescore_job(db, db_job)
+        mark_pipeline_stats_stale(db, job_ids=[job_id])
+
     if job_data.questions_form:
         if db_job.questions_form:
             db_form = db_job.questions_form
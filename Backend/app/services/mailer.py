@@ -0,0 +1,285 @@
+import asyncio
+import base64
+import json
+import random
+import time
+import uuid
+from dataclasses import dataclass, asdict
+from email import message_from_bytes
+from email.mime.text import MIMEText
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
+
+import httpx
+
+from app.core.config import settings
+
+GMAIL_SEND_URL = "https://gmail.googleapis.com/gmail/v1/users/me/messages/send"
+GMAIL_BATCH_URL = "https://www.googleapis.com/batch/gmail/v1"
+GMAIL_SEND_PATH = "/gmail/v1/users/me/messages/send"
+MAX_BATCH_SIZE = 100
+
+# Gmail answers per-user rate limiting with 403 + one of these reasons rather than 429
+_RATE_LIMIT_REASONS = {"rateLimitExceeded", "userRateLimitExceeded"}
+
+
+@dataclass
+class OutgoingEmail:
+    recipient: str
+    subject: str
+    body: str
+    subtype: str = "html"
+    ref: Any = None  # caller's id for the report, e.g. candidate_id
+
+
+@dataclass
+class SendResult:
+    recipient: str
+    ref: Any
+    ok: bool
+    status_code: Optional[int] = None
+    attempts: int = 0
+    retryable: bool = False
+    error: Optional[str] = None
+    message_id: Optional[str] = None
+
+
+class TokenBucket:
+    """Async token bucket: `rate` tokens per second, bursting up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, n: int = 1):
+        # a request bigger than the bucket waits for a full bucket and goes into debt
+        need = min(n, self.capacity)
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= need:
+                    self.tokens -= n
+                    return
+                await asyncio.sleep((need - self.tokens) / self.rate)
+
+
+def encode_message(email: OutgoingEmail) -> str:
+    message = MIMEText(email.body, email.subtype)
+    message["to"] = email.recipient
+    message["subject"] = email.subject
+    return base64.urlsafe_b64encode(message.as_bytes()).decode("utf-8")
+
+
+def _is_retryable(status_code: int, body: str) -> bool:
+    if status_code == 429 or status_code >= 500:
+        return True
+    if status_code == 403:
+        try:
+            errors = json.loads(body).get("error", {}).get("errors", [])
+        except (ValueError, AttributeError):
+            return False
+        return any(e.get("reason") in _RATE_LIMIT_REASONS for e in errors)
+    return False
+
+
+def build_batch_body(raws: Dict[int, str], boundary: str) -> bytes:
+    """multipart/mixed body for Google's batch endpoint, one messages.send call per part."""
+    parts = []
+    for i, raw in raws.items():
+        payload = json.dumps({"raw": raw})
+        parts.append(
+            f"--{boundary}\r\n"
+            "Content-Type: application/http\r\n"
+            f"Content-ID: <item-{i}>\r\n\r\n"
+            f"POST {GMAIL_SEND_PATH}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(payload)}\r\n\r\n"
+            f"{payload}\r\n"
+        )
+    parts.append(f"--{boundary}--\r\n")
+    return "".join(parts).encode("utf-8")
+
+
+def parse_batch_response(content_type: str, content: bytes) -> Dict[int, Tuple[int, str]]:
+    """Map item index -> (status code, body) from a multipart/mixed batch response."""
+    message = message_from_bytes(b"Content-Type: " + content_type.encode() + b"\r\n\r\n" + content)
+    results = {}
+    for part in message.get_payload():
+        content_id = (part.get("Content-ID") or "").strip("<>")
+        if not content_id.startswith("response-item-"):
+            continue
+        inner = part.get_payload()
+        if isinstance(inner, list):  # parsed as message/http on some Python versions
+            inner = inner[0].as_string()
+        status_line, _, rest = inner.lstrip().partition("\n")
+        body = rest.replace("\r\n", "\n").partition("\n\n")[2].strip()
+        results[int(content_id[len("response-item-"):])] = (int(status_line.split()[1]), body)
+    return results
+
+
+def _backoff(attempt: int, retry_after: Optional[str]) -> float:
+    if retry_after and retry_after.isdigit():
+        return float(retry_after)
+    return min(settings.MAIL_RETRY_MAX_SEC, settings.MAIL_RETRY_BASE_SEC * 2 ** (attempt - 1)) * random.uniform(0.5, 1.0)
+
+
+class GmailBulkSender:
+    """
+    Sends many messages from one Gmail account over a single pooled HTTP/2
+    client. Concurrency is bounded by a semaphore and the send rate by a token
+    bucket (Gmail's per-user quota is 250 units/s and a send costs 100, so the
+    default is 2.5 sends/s). 429, 5xx, rate-limit 403s and transport errors are
+    retried with backoff; every recipient gets a SendResult.
+
+    With batch_size > 1 messages go through Google's batch endpoint, up to 100
+    sends per HTTP request (Google advises 50 for Gmail). Each send still
+    counts against the quota individually.
+    """
+
+    def __init__(self, access_token: str, concurrency: Optional[int] = None, rate_per_sec: Optional[float] = None,
+                 max_attempts: Optional[int] = None, batch_size: Optional[int] = None,
+                 transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.access_token = access_token
+        self.concurrency = concurrency or settings.MAIL_CONCURRENCY
+        self.rate = rate_per_sec or settings.MAIL_RATE_PER_SEC
+        self.max_attempts = max_attempts or settings.MAIL_MAX_ATTEMPTS
+        self.batch_size = min(batch_size or settings.MAIL_BATCH_SIZE, MAX_BATCH_SIZE)
+        self.transport = transport
+
+    def _client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            http2=self.transport is None,
+            transport=self.transport,
+            headers={"Authorization": f"Bearer {self.access_token}"},
+            timeout=httpx.Timeout(30.0, connect=10.0),
+            limits=httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency),
+        )
+
+    async def _send_one(self, client: httpx.AsyncClient, semaphore: asyncio.Semaphore, bucket: TokenBucket,
+                        email: OutgoingEmail) -> SendResult:
+        result = SendResult(recipient=email.recipient, ref=email.ref, ok=False)
+        raw = encode_message(email)
+        async with semaphore:
+            while result.attempts < self.max_attempts:
+                result.attempts += 1
+                await bucket.acquire()
+                retry_after = None
+                try:
+                    response = await client.post(GMAIL_SEND_URL, json={"raw": raw})
+                except httpx.TransportError as e:
+                    result.status_code, result.error, result.retryable = None, f"{type(e).__name__}: {e}", True
+                else:
+                    result.status_code = response.status_code
+                    if response.status_code in (200, 201, 202):
+                        result.ok, result.error, result.retryable = True, None, False
+                        result.message_id = response.json().get("id")
+                        return result
+                    result.error = response.text[:500]
+                    result.retryable = _is_retryable(response.status_code, response.text)
+                    retry_after = response.headers.get("Retry-After")
+                if not result.retryable:
+                    return result
+                if result.attempts < self.max_attempts:
+                    await asyncio.sleep(_backoff(result.attempts, retry_after))
+        return result
+
+    async def _post_batch(self, client: httpx.AsyncClient, semaphore: asyncio.Semaphore, bucket: TokenBucket,
+                          raws: Dict[int, str]) -> Dict[int, Tuple[Optional[int], str]]:
+        boundary = f"batch_{uuid.uuid4().hex}"
+        async with semaphore:
+            await bucket.acquire(len(raws))
+            try:
+                response = await client.post(
+                    GMAIL_BATCH_URL,
+                    content=build_batch_body(raws, boundary),
+                    headers={"Content-Type": f"multipart/mixed; boundary={boundary}"},
+                )
+            except httpx.TransportError as e:
+                return {i: (None, f"{type(e).__name__}: {e}") for i in raws}
+        if response.status_code != 200:
+            return {i: (response.status_code, response.text[:500]) for i in raws}
+        parsed = parse_batch_response(response.headers.get("Content-Type", ""), response.content)
+        return {i: parsed.get(i, (None, "missing from batch response")) for i in raws}
+
+    async def _send_batched(self, client: httpx.AsyncClient, semaphore: asyncio.Semaphore, bucket: TokenBucket,
+                            emails: Sequence[OutgoingEmail]) -> List[SendResult]:
+        results = [SendResult(recipient=e.recipient, ref=e.ref, ok=False) for e in emails]
+        raws = {i: encode_message(e) for i, e in enumerate(emails)}
+        pending = list(raws)
+        attempt = 0
+        while pending and attempt < self.max_attempts:
+            attempt += 1
+            chunks = [pending[n:n + self.batch_size] for n in range(0, len(pending), self.batch_size)]
+            outcomes = await asyncio.gather(*(
+                self._post_batch(client, semaphore, bucket, {i: raws[i] for i in chunk}) for chunk in chunks
+            ))
+            pending = []
+            for outcome in outcomes:
+                for i, (status_code, body) in outcome.items():
+                    result = results[i]
+                    result.attempts, result.status_code = attempt, status_code
+                    if status_code in (200, 201, 202):
+                        result.ok, result.error, result.retryable = True, None, False
+                        try:
+                            result.message_id = json.loads(body).get("id")
+                        except ValueError:
+                            pass
+                        continue
+                    result.error = body[:500]
+                    result.retryable = status_code is None or _is_retryable(status_code, body)
+                    if result.retryable:
+                        pending.append(i)
+            if pending and attempt < self.max_attempts:
+                await asyncio.sleep(_backoff(attempt, None))
+        return results
+
+    async def send_all(self, emails: Sequence[OutgoingEmail]) -> List[SendResult]:
+        semaphore = asyncio.Semaphore(self.concurrency)
+        bucket = TokenBucket(self.rate, capacity=max(self.concurrency, self.batch_size))
+        async with self._client() as client:
+            if self.batch_size > 1 and len(emails) > 1:
+                return await self._send_batched(client, semaphore, bucket, emails)
+            return await asyncio.gather(*(self._send_one(client, semaphore, bucket, e) for e in emails))
+
+
+    async def iter_results(self, emails: Sequence[OutgoingEmail]) -> AsyncIterator[List[SendResult]]:
+        """
+        Like send_all, but yields each batch's results (retries included) as
+        soon as that batch finishes, for progress reporting. Batches still run
+        concurrently up to `concurrency`.
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+        bucket = TokenBucket(self.rate, capacity=max(self.concurrency, self.batch_size))
+        size = max(self.batch_size, 1)
+        async with self._client() as client:
+            async def run(chunk):
+                if len(chunk) > 1:
+                    return await self._send_batched(client, semaphore, bucket, chunk)
+                return [await self._send_one(client, semaphore, bucket, chunk[0])]
+
+            pending = [asyncio.ensure_future(run(emails[n:n + size])) for n in range(0, len(emails), size)]
+            try:
+                for next_done in asyncio.as_completed(pending):
+                    yield await next_done
+            finally:
+                for future in pending:
+                    future.cancel()
+
+
+def send_bulk(access_token: str, emails: Sequence[OutgoingEmail], **options) -> List[SendResult]:
+    """Blocking wrapper for sync routes and queue tasks (must not be called from a running event loop)."""
+    if not emails:
+        return []
+    return asyncio.run(GmailBulkSender(access_token, **options).send_all(emails))
+
+
+def summarize(results: Sequence[SendResult]) -> Dict[str, Any]:
+    return {
+        "sent": sum(r.ok for r in results),
+        "failed": sum(not r.ok for r in results),
+        "results": [asdict(r) for r in results],
+    }
@@ -0,0 +1,147 @@
+import threading
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, FrozenSet, Tuple
+
+from cachetools import TTLCache
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db import models
+
+
+@dataclass(frozen=True)
+class JobPipeline:
+    job_id: int
+    title: str
+    applicants: int
+    selected_for_interview: int
+    interview_scheduled: int
+    interviewed: int
+    selected: int
+    scored: int  # candidates with an ai_score, the ones avg_ai_score is over
+    avg_ai_score: float
+
+
+@dataclass(frozen=True)
+class PipelineStats:
+    company_id: int
+    jobs: Tuple[JobPipeline, ...]
+    job_ids: FrozenSet[int]
+
+    def as_dict(self) -> Dict[str, Any]:
+        jobs = [asdict(job) for job in self.jobs]
+        totals = {
+            key: sum(job[key] for job in jobs)
+            for key in ("applicants", "selected_for_interview", "interview_scheduled", "interviewed", "selected", "scored")
+        }
+        scored = totals["scored"]
+        totals["avg_ai_score"] = round(sum(job.avg_ai_score * job.scored for job in self.jobs) / scored, 2) if scored else 0.0
+        return {"company_id": self.company_id, "totals": totals, "jobs": jobs}
+
+
+def pipeline_query(company_id: int):
+    """
+    One row per job of the company with its candidate counts per stage, as a
+    single GROUP BY over the candidate table (FILTER aggregates, no per-job
+    round trips). Jobs without candidates are included with zeros.
+    """
+    c = models.Candidate
+    return (
+        select(
+            models.Job.job_id,
+            models.Job.title,
+            func.count(c.candidate_id).label("applicants"),
+            func.count(c.candidate_id).filter(c.selected_for_interview == True).label("selected_for_interview"),
+            func.count(c.candidate_id).filter(c.interview_scheduled == True).label("interview_scheduled"),
+            func.count(c.candidate_id).filter(c.interviewed == True).label("interviewed"),
+            func.count(c.candidate_id).filter(c.selected == True).label("selected"),
+            func.count(c.ai_score).label("scored"),
+            func.coalesce(func.avg(c.ai_score), 0).label("avg_ai_score"),
+        )
+        .outerjoin(c, c.job_id == models.Job.job_id)
+        .where(models.Job.company_id == company_id)
+        .group_by(models.Job.job_id, models.Job.title)
+        .order_by(models.Job.job_id)
+    )
+
+
+# company_id -> PipelineStats. Candidate and job changes committed in this process
+# invalidate the affected company; the TTL bounds staleness from other processes.
+_stats_cache = TTLCache(maxsize=settings.PIPELINE_CACHE_SIZE, ttl=settings.PIPELINE_CACHE_TTL_SEC)
+_stats_lock = threading.Lock()
+
+
+def get_pipeline_stats(db: Session, company_id: int) -> PipelineStats:
+    with _stats_lock:
+        stats = _stats_cache.get(company_id)
+    if stats is None:
+        jobs = tuple(
+            JobPipeline(
+                job_id=row.job_id,
+                title=row.title,
+                applicants=row.applicants,
+                selected_for_interview=row.selected_for_interview,
+                interview_scheduled=row.interview_scheduled,
+                interviewed=row.interviewed,
+                selected=row.selected,
+                scored=row.scored,
+                avg_ai_score=round(float(row.avg_ai_score), 2),
+            )
+            for row in db.execute(pipeline_query(company_id))
+        )
+        stats = PipelineStats(company_id, jobs, frozenset(job.job_id for job in jobs))
+        with _stats_lock:
+            _stats_cache[company_id] = stats
+    return stats
+
+
+def invalidate_pipeline_stats(job_ids=(), company_id=None):
+    job_ids = set(job_ids)
+    with _stats_lock:
+        stale = [
+            key for key, stats in _stats_cache.items()
+            if key == company_id or stats.job_ids & job_ids
+        ]
+        for key in stale:
+            _stats_cache.pop(key, None)
+
+
+# Candidates are changed from many routes and tasks; rather than invalidating at
+# each call site, note the jobs of candidates (and the companies of jobs) flushed
+# in a session and drop their stats once the transaction commits. Core UPDATEs
+# bypass the flush, so bulk paths call mark_pipeline_stats_stale themselves.
+_PENDING_JOBS = "pipeline_stats_job_ids"
+_PENDING_COMPANIES = "pipeline_stats_company_ids"
+
+
+def mark_pipeline_stats_stale(session: Session, job_ids=(), company_ids=()):
+    """Invalidate the stats of these jobs and companies when the session commits."""
+    session.info.setdefault(_PENDING_JOBS, set()).update(job_ids)
+    session.info.setdefault(_PENDING_COMPANIES, set()).update(company_ids)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_candidate_jobs(session, flush_context):
+    changed = (*session.new, *session.dirty, *session.deleted)
+    mark_pipeline_stats_stale(
+        session,
+        job_ids={obj.job_id for obj in changed if isinstance(obj, models.Candidate)},
+        company_ids={obj.company_id for obj in changed if isinstance(obj, models.Job) and obj.company_id is not None},
+    )
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_on_commit(session):
+    job_ids = session.info.pop(_PENDING_JOBS, None) or ()
+    company_ids = session.info.pop(_PENDING_COMPANIES, None) or ()
+    if job_ids:
+        invalidate_pipeline_stats(job_ids)
+    for company_id in company_ids:
+        invalidate_pipeline_stats(company_id=company_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_on_rollback(session):
+    session.info.pop(_PENDING_JOBS, None)
+    session.info.pop(_PENDING_COMPANIES, None)
@@ -7,11 +7,11 @@ from app.schemas.resume_parsing import (
     ResumeParsingOut
 )
 
-import smtplib
-from email.mime.text import MIMEText
 from sqlalchemy.orm import Session
-import requests
 from app.db import models
+from app.services.feedback_dispatch import FEEDBACK_SUBJECT
+from app.services.google_calendar import get_valid_token
+from app.services.mailer import OutgoingEmail, send_bulk
 
 import os
 from dotenv import load_dotenv
@@ -47,14 +47,16 @@ def generate_feedback_with_gemini(prompt: str) -> str:
         print(f"An error occurred with the Gemini API: {e}")
         raise Exception(f"Gemini API error: {str(e)}")
 
-def generate_and_send_feedback(db: Session, parsing_id: int, hr_id: int):
-    parsing = db.query(models.ResumeParsing).filter(models.ResumeParsing.parsing_id == parsing_id).first()
-    if not parsing:
+def generate_and_send_feedback(db: Session, parsing_id: int, hr_id: int, company_id: Optional[int] = None):
+    query = db.query(models.ResumeParsing, models.Candidate) \
+        .join(models.Candidate, models.Candidate.candidate_id == models.ResumeParsing.candidate_id) \
+        .filter(models.ResumeParsing.parsing_id == parsing_id)
+    if company_id is not None:
+        query = query.join(models.Job, models.Job.job_id == models.Candidate.job_id).filter(models.Job.company_id == company_id)
+    row = query.first()
+    if not row:
         return {"error": "Resume parsing not found"}
-
-    candidate = db.query(models.Candidate).filter(models.Candidate.candidate_id == parsing.candidate_id).first()
-    if not candidate:
-        return {"error": "Candidate not found"}
+    parsing, candidate = row
 
     # Build AI prompt
     feedback_prompt = f"""
@@ -71,26 +73,19 @@ def generate_and_send_feedback(db: Session, parsing_id: int, hr_id: int):
     #ai_feedback = generate_feedback_with_gemini(feedback_prompt)
     ai_feedback = "good job"
 
+    # Sent in-process with the HR's Gmail token
+    access_token = get_valid_token(db, hr_id).access_token
+    email = OutgoingEmail(recipient=candidate.email, subject=FEEDBACK_SUBJECT, body=ai_feedback, subtype="plain", ref=parsing_id)
+    result = send_bulk(access_token, [email], batch_size=1)[0]
 
-    # ✅ Directly call your FastAPI endpoint for sending email
-    email_payload = {
-        "hr_id": hr_id,
-        "recipient": candidate.email,
-        "subject": "Your Resume Analysis Feedback",
-        "content": ai_feedback
-    }
-
-    response = requests.post("http://localhost:8000/googlesend_email", json=email_payload)
-
-    if response.status_code not in [200, 202]:
-        return {"error": "Failed to send email", "details": response.json()}
+    if not result.ok:
+        return {"error": "Failed to send email", "details": result.error, "status_code": result.status_code}
 
     return {"success": True, "message": f"Feedback sent to {candidate.email}"}
 
 
 
 
-
 def create_resume_parsing(db: Session, parsing: ResumeParsingCreate) -> ResumeParsingOut:
     """Create a new resume parsing record."""
     db_parsing = models.ResumeParsing(**parsing.model_dump())
@@ -0,0 +1,145 @@
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import and_, delete, func, select, true
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.analyzer.skill_normalizer import canonical_skill, skill_normalizer
+from app.db import models
+
+# Unknown skills are stored as written; anything longer is a sentence that leaked
+# into a skills list, not a skill (skill.name and skill_alias.alias are String(100)).
+MAX_SKILL_NAME_LENGTH = 60
+
+
+def split_skills(skills: Optional[str]) -> List[str]:
+    """The comma-joined skill strings stored on candidates and parsings, as a list."""
+    return [s for s in (part.strip() for part in (skills or "").replace(";", ",").split(",")) if s]
+
+
+def skill_keys(names: Iterable[str]) -> Dict[str, str]:
+    """lookup key -> display name, first spelling wins."""
+    keys: Dict[str, str] = {}
+    for name in skill_normalizer.normalize_list(list(names)):
+        display, key = canonical_skill(name)
+        if key:
+            keys.setdefault(key, display)
+    return keys
+
+
+def resolve_skills(db: Session, names: Iterable[str], create: bool = True) -> Dict[str, int]:
+    """
+    Skill ids for the given names, keyed by case-folded canonical name.
+    Unknown skills are added to the taxonomy unless create is False; names
+    longer than MAX_SKILL_NAME_LENGTH are skipped. Safe against concurrent
+    extractors adding the same skill: inserts skip conflicts and the ids are
+    read back afterwards.
+    """
+    keys = {
+        key: display for key, display in skill_keys(names).items()
+        if max(len(key), len(display)) <= MAX_SKILL_NAME_LENGTH
+    }
+    if not keys:
+        return {}
+
+    def lookup(wanted):
+        return dict(db.execute(skill_ids_query(wanted)).all())
+
+    found = lookup(list(keys))
+    missing = [key for key in keys if key not in found]
+    if missing and create:
+        db.execute(
+            pg_insert(models.Skill)
+            .values([{"name": keys[key]} for key in missing])
+            .on_conflict_do_nothing(index_elements=["name"])
+        )
+        ids_by_name = dict(db.execute(
+            select(models.Skill.name, models.Skill.skill_id).where(models.Skill.name.in_([keys[key] for key in missing]))
+        ).all())
+        db.execute(
+            pg_insert(models.SkillAlias)
+            .values([{"alias": key, "skill_id": ids_by_name[keys[key]]} for key in missing])
+            .on_conflict_do_nothing(index_elements=["alias"])
+        )
+        found.update(lookup(missing))
+    return found
+
+
+def set_candidate_skills(db: Session, candidate_id: int, names: Iterable[str]) -> Dict[str, int]:
+    """
+    Make the candidate's candidate_skill rows exactly the given skills.
+    Flushes but does not commit; the caller's transaction owns it.
+    """
+    skill_ids = set(resolve_skills(db, names).values())
+    stale = delete(models.CandidateSkill).where(models.CandidateSkill.candidate_id == candidate_id)
+    if skill_ids:
+        stale = stale.where(models.CandidateSkill.skill_id.not_in(skill_ids))
+    db.execute(stale)
+    if skill_ids:
+        db.execute(
+            pg_insert(models.CandidateSkill)
+            .values([{"candidate_id": candidate_id, "skill_id": skill_id} for skill_id in sorted(skill_ids)])
+            .on_conflict_do_nothing()
+        )
+    return skill_ids
+
+
+def skill_ids_query(keys: Iterable[str]):
+    """(alias, skill_id) rows for lookup keys from skill_keys()."""
+    return select(models.SkillAlias.alias, models.SkillAlias.skill_id).where(models.SkillAlias.alias.in_(list(keys)))
+
+
+def has_all_skills(skill_ids: Iterable[int]):
+    """
+    WHERE clause on Candidate: has every one of the skills. Callers resolve
+    names to ids first (skill_ids_query) so the planner sees real ids and
+    can use their statistics: a common skill is checked by probing
+    candidate_skill's primary key per listed candidate, a rare one is read
+    off ix_candidate_skill_skill_id_candidate_id.
+    """
+    Candidate, CandidateSkill = models.Candidate, models.CandidateSkill
+    return and_(true(), *(
+        Candidate.candidate_id.in_(select(CandidateSkill.candidate_id).where(CandidateSkill.skill_id == skill_id))
+        for skill_id in sorted(set(skill_ids))
+    ))
+
+
+def backfill_candidate_skills(db: Session, batch_size: int = 1000, after_id: int = 0) -> int:
+    """
+    Fill candidate_skill from the comma-joined skills already stored on
+    candidates and their resume parsings, in candidate_id batches with one
+    commit each. Idempotent; returns the number of candidates processed.
+    """
+    done = 0
+    while True:
+        rows = db.execute(
+            select(models.Candidate.candidate_id, models.Candidate.skills,
+                   func.string_agg(models.ResumeParsing.skills_extracted, ", "))
+            .outerjoin(models.ResumeParsing, models.ResumeParsing.candidate_id == models.Candidate.candidate_id)
+            .where(models.Candidate.candidate_id > after_id)
+            .group_by(models.Candidate.candidate_id)
+            .order_by(models.Candidate.candidate_id)
+            .limit(batch_size)
+        ).all()
+        if not rows:
+            return done
+
+        names_by_candidate = {
+            candidate_id: split_skills(skills) + split_skills(extracted) for candidate_id, skills, extracted in rows
+        }
+        skill_ids = resolve_skills(db, (name for names in names_by_candidate.values() for name in names))
+        links = {
+            (candidate_id, skill_ids[key])
+            for candidate_id, names in names_by_candidate.items()
+            for key in skill_keys(names)
+            if key in skill_ids
+        }
+        if links:
+            db.execute(
+                pg_insert(models.CandidateSkill)
+                .values([{"candidate_id": c, "skill_id": s} for c, s in sorted(links)])
+                .on_conflict_do_nothing()
+            )
+        db.commit()
+        done += len(names_by_candidate)
+        after_id = rows[-1].candidate_id
@@ -0,0 +1,138 @@
+import json
+from datetime import date, datetime, time, timedelta
+from itertools import islice
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.db import models
+
+WEEKDAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+
+class Slot(NamedTuple):
+    start: datetime
+    end: datetime
+
+
+class SlotCalendar:
+    """
+    The interview slots an HRAvailability describes, generated lazily: every
+    selected weekday between start_date and end_date, from start_time in
+    steps of duration + break while the slot still ends by end_time.
+
+    Nothing is stored; asking for the next 20 free slots of a year-long
+    availability only walks the days up to the 20th.
+    """
+
+    def __init__(self, availability: models.HRAvailability):
+        self.availability_id = availability.id
+        self.hr_id = availability.hr_id
+        self.weekdays = {WEEKDAYS.index(d) for d in json.loads(availability.days) if d in WEEKDAYS}
+        self.duration = timedelta(minutes=availability.duration_minutes)
+        self.step = self.duration + timedelta(minutes=availability.break_minutes or 0)
+        self.day_start = datetime.strptime(availability.start_time, "%H:%M").time()
+        self.day_end = datetime.strptime(availability.end_time, "%H:%M").time()
+        self.first_day: date = availability.start_date.date()
+        self.last_day: date = availability.end_date.date()
+
+    def __iter__(self) -> Iterator[Slot]:
+        return self.slots()
+
+    def _day_slots(self, day: date, start: Optional[datetime]) -> Iterator[Slot]:
+        current = datetime.combine(day, self.day_start)
+        close = datetime.combine(day, self.day_end)
+        if start is not None and current < start:
+            # jump straight to the first slot at or after `start`
+            current += -((current - start) // self.step) * self.step
+        while current + self.duration <= close:
+            yield Slot(current, current + self.duration)
+            current += self.step
+
+    def slots(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> Iterator[Slot]:
+        """Slots starting in [start, end), in order."""
+        if not self.weekdays or self.duration <= timedelta(0):
+            return
+        day = max(self.first_day, start.date()) if start else self.first_day
+        last_day = min(self.last_day, end.date()) if end else self.last_day
+        while day <= last_day:
+            if day.weekday() in self.weekdays:
+                for slot in self._day_slots(day, start):
+                    if end is not None and slot.start >= end:
+                        return
+                    yield slot
+            day += timedelta(days=1)
+
+    def is_empty(self) -> bool:
+        return next(self.slots(), None) is None
+
+    def contains(self, start: datetime) -> bool:
+        """Whether `start` is the start of one of this calendar's slots."""
+        day = start.date()
+        if not (self.first_day <= day <= self.last_day) or day.weekday() not in self.weekdays:
+            return False
+        offset = start - datetime.combine(day, self.day_start)
+        return (
+            offset >= timedelta(0)
+            and offset % self.step == timedelta(0)
+            and start + self.duration <= datetime.combine(day, self.day_end)
+        )
+
+    def free_slots(self, busy: Iterable[Tuple[datetime, datetime]], start: Optional[datetime] = None,
+                   end: Optional[datetime] = None) -> Iterator[Slot]:
+        """Slots in [start, end) that overlap none of the `busy` intervals."""
+        busy = sorted(busy)
+        i = 0
+        for slot in self.slots(start, end):
+            while i < len(busy) and busy[i][1] <= slot.start:
+                i += 1
+            j = i
+            while j < len(busy) and busy[j][0] < slot.end:
+                if busy[j][1] > slot.start:
+                    break
+                j += 1
+            else:
+                yield slot
+
+
+def busy_intervals(db: Session, calendar: SlotCalendar, start: datetime, end: datetime) -> List[Tuple[datetime, datetime]]:
+    """
+    What is already taken between start and end: the availability's booked
+    slot rows plus the HR's scheduled interviews (which schedule_all_interviews
+    creates without a slot row). Interviews are assumed to last one slot.
+    """
+    since = start - calendar.duration
+    booked_slots = select(models.InterviewSlot.date).where(
+        models.InterviewSlot.availability_id == calendar.availability_id,
+        models.InterviewSlot.is_booked == True,
+        models.InterviewSlot.date >= since,
+        models.InterviewSlot.date < end,
+    )
+    interviews = (
+        select(models.Interview.scheduled_time)
+        .join(models.Job, models.Interview.job_id == models.Job.job_id)
+        .where(
+            models.Job.hr_id == calendar.hr_id,
+            models.Interview.status == "Scheduled",
+            models.Interview.scheduled_time >= since,
+            models.Interview.scheduled_time < end,
+        )
+    )
+    starts = db.execute(booked_slots.union(interviews)).scalars()
+    return [(s, s + calendar.duration) for s in starts]
+
+
+def iter_free_slots(db: Session, availability: models.HRAvailability, start: Optional[datetime] = None,
+                    end: Optional[datetime] = None) -> Iterator[Slot]:
+    """Lazily yield the availability's free slots in [start, end); one query for what is busy."""
+    calendar = SlotCalendar(availability)
+    window_start = max(start, datetime.combine(calendar.first_day, time.min)) if start else datetime.combine(calendar.first_day, time.min)
+    window_end = min(end, datetime.combine(calendar.last_day, time.max)) if end else datetime.combine(calendar.last_day, time.max)
+    busy = busy_intervals(db, calendar, window_start, window_end)
+    return calendar.free_slots(busy, start, end)
+
+
+def free_slots(db: Session, availability: models.HRAvailability, start: Optional[datetime] = None,
+               end: Optional[datetime] = None, limit: Optional[int] = None) -> List[Slot]:
+    return list(islice(iter_free_slots(db, availability, start, end), limit))
@@ -15,6 +15,7 @@ setup(
         "anyio==4.10.0",
         "argon2-cffi==25.1.0",
         "argon2-cffi-bindings==25.1.0",
+        "asyncpg==0.30.0",
         "bcrypt==5.0.0",
         "blis==1.3.3",
         "cachetools==5.5.2",
@@ -47,6 +48,7 @@ setup(
         "grpcio==1.76.0",
         "grpcio-status==1.71.2",
         "h11==0.16.0",
+        "h2==4.2.0",
         "httpcore==1.0.9",
         "httplib2==0.31.0",
         "httpx==0.28.1",
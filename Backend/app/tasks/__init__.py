@@ -0,0 +1,14 @@
+from app.tasks.queue import enqueue, get_task_queue, set_task_queue, PostgresTaskQueue, MemoryTaskQueue, Task
+from app.tasks.registry import task, PermanentTaskError, RetryableTaskError
+
+__all__ = [
+    "enqueue",
+    "get_task_queue",
+    "set_task_queue",
+    "PostgresTaskQueue",
+    "MemoryTaskQueue",
+    "Task",
+    "task",
+    "PermanentTaskError",
+    "RetryableTaskError",
+]
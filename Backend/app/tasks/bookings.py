@@ -0,0 +1,93 @@
+import asyncio
+import logging
+from datetime import datetime, timezone
+
+from app.database import SessionLocal
+from app.db import models
+from app.services.interview_scheduler import CalendarScheduler, calendar_event_id
+from app.services.interview_slot import booking_event_body, invalidate_open_slots, release_slot
+from app.tasks.notifications import _access_token
+from app.tasks.queue import enqueue
+from app.tasks.registry import task, PermanentTaskError, RetryableTaskError
+
+logger = logging.getLogger(__name__)
+
+
+def _booking(db, interview_id: int):
+    return db.query(models.Interview, models.InterviewSlot, models.Candidate, models.HRAvailability.hr_id) \
+        .join(models.InterviewSlot, models.Interview.slot_id == models.InterviewSlot.id) \
+        .join(models.HRAvailability, models.InterviewSlot.availability_id == models.HRAvailability.id) \
+        .join(models.Candidate, models.Interview.candidate_id == models.Candidate.candidate_id) \
+        .filter(models.Interview.interview_id == interview_id).first()
+
+
+def release_booking(error: str, interview_id: int):
+    """
+    Compensation once the calendar event cannot be created: cancel the
+    interview, free its slot, re-open the candidate's invitation and ask
+    them to pick another time.
+    """
+    with SessionLocal() as db:
+        row = _booking(db, interview_id)
+        if row is None or row.Interview.status != "Scheduled":
+            return
+        interview, slot, candidate, hr_id = row
+        interview.status = "Cancelled"
+        interview.slot_id = None
+        release_slot(db, slot.id)
+        candidate.interview_scheduled = False
+        candidate.invited_at = datetime.now(timezone.utc)
+        enqueue(
+            "email.booking_failed",
+            {"candidate_id": candidate.candidate_id, "slot_time": slot.date.strftime("%A, %b %d at %I:%M %p")},
+            idempotency_key=f"booking-failed:{interview_id}",
+            hr_id=hr_id,
+            db=db,
+        )
+        db.commit()
+    invalidate_open_slots(hr_id)
+    logger.warning("Booking %s released after calendar failure: %s", interview_id, error)
+
+
+@task("calendar.booking_event", on_failure=release_booking)
+def create_booking_event(interview_id: int):
+    """
+    Second phase of a candidate's booking: the slot is already claimed and the
+    interview row exists. Create the Calendar event, store its Meet link and
+    queue the confirmation email. The event id is derived from the booking,
+    so a retry after a lost response finds the event instead of duplicating it.
+    """
+    with SessionLocal() as db:
+        row = _booking(db, interview_id)
+        if row is None:
+            raise PermanentTaskError(f"Interview {interview_id} not found")
+        interview, slot, candidate, hr_id = row
+        if interview.status != "Scheduled" or interview.meet_link:
+            return
+        access_token = _access_token(db, hr_id)
+        event = booking_event_body(slot, candidate.email, calendar_event_id(hr_id, candidate.candidate_id, slot.date))
+
+    # retries are left to the queue, which backs off between attempts
+    status_code, body, retryable = asyncio.run(
+        CalendarScheduler(access_token, concurrency=1, max_attempts=1).create_events([event])
+    )[0]
+    if status_code not in (200, 201):
+        error = f"Calendar API {status_code}: {body}"
+        raise RetryableTaskError(error) if retryable else PermanentTaskError(error)
+
+    meet_link = body.get("hangoutLink")
+    with SessionLocal() as db:
+        interview = db.get(models.Interview, interview_id)
+        if interview is None or interview.status != "Scheduled":
+            return
+        interview.meet_link = meet_link
+        db.query(models.Candidate).filter(models.Candidate.candidate_id == interview.candidate_id) \
+            .update({models.Candidate.meet_link: meet_link})
+        enqueue(
+            "email.booking_confirmation",
+            {"interview_id": interview_id},
+            idempotency_key=f"booking-confirmation:{interview_id}",
+            hr_id=hr_id,
+            db=db,
+        )
+        db.commit()
@@ -0,0 +1,178 @@
+import base64
+import hashlib
+import logging
+from email.mime.text import MIMEText
+from typing import Optional
+
+import requests
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.database import SessionLocal
+from app.db import models
+from app.services.google_calendar import get_valid_token
+from app.services.email_templates import get_email_template, render_email
+from app.services.mailer import OutgoingEmail, send_bulk, summarize
+from app.tasks.queue import enqueue, retry_delay
+from app.tasks.registry import task, PermanentTaskError, RetryableTaskError
+
+GMAIL_SEND_URL = "https://gmail.googleapis.com/gmail/v1/users/me/messages/send"
+INVITE_RESEND_ROUNDS = 3
+
+logger = logging.getLogger(__name__)
+
+
+def _invite_batch_key(job_id: int, invitation: Optional[str], resend_round: int, candidate_ids) -> str:
+    batch = hashlib.sha256(",".join(map(str, candidate_ids)).encode()).hexdigest()[:32]
+    return f"interview-invites:{job_id}:{invitation}:{resend_round}:{batch}"
+
+
+def enqueue_interview_invites(candidate_ids, job_id: int, subject: str, hr_name: str, invitation: str,
+                              hr_id: Optional[int] = None, db: Optional[Session] = None) -> int:
+    """
+    Queue invites as one task per MAIL_BATCH_SIZE recipients, so each task
+    finishes well within the task lease at MAIL_RATE_PER_SEC. `invitation`
+    identifies this round of invites (the invited_at the caller wrote): a
+    batch is queued once per round, while a later re-invite of the same
+    candidates is a new round. Returns the number of invites queued.
+    """
+    candidate_ids = sorted(set(candidate_ids))
+    batch_size = max(int(settings.MAIL_BATCH_SIZE), 1)
+    queued = 0
+    for start in range(0, len(candidate_ids), batch_size):
+        chunk = candidate_ids[start:start + batch_size]
+        if enqueue(
+            "email.interview_invites",
+            {"candidate_ids": chunk, "job_id": job_id, "subject": subject, "hr_name": hr_name, "invitation": invitation},
+            idempotency_key=_invite_batch_key(job_id, invitation, 1, chunk),
+            hr_id=hr_id,
+            db=db,
+        ):
+            queued += len(chunk)
+    return queued
+
+
+def _access_token(db, hr_id: int) -> str:
+    try:
+        return get_valid_token(db, hr_id).access_token
+    except HTTPException as e:
+        # not linked / refresh token revoked: retrying will not help
+        raise PermanentTaskError(f"Google token unavailable for HR {hr_id}: {e.detail}")
+
+
+def send_gmail(access_token: str, recipient: str, subject: str, html: str):
+    message = MIMEText(html, "html")
+    message["to"] = recipient
+    message["subject"] = subject
+    raw_message = base64.urlsafe_b64encode(message.as_bytes()).decode("utf-8")
+
+    try:
+        response = requests.post(
+            GMAIL_SEND_URL,
+            headers={"Authorization": f"Bearer {access_token}", "Content-Type": "application/json"},
+            json={"raw": raw_message},
+            timeout=30,
+        )
+    except requests.RequestException as e:
+        raise RetryableTaskError(f"Gmail request failed: {e}")
+
+    if response.status_code == 429 or response.status_code >= 500:
+        raise RetryableTaskError(f"Gmail API {response.status_code}: {response.text[:500]}")
+    if response.status_code not in (200, 201):
+        raise PermanentTaskError(f"Gmail API {response.status_code}: {response.text[:500]}")
+    return response.json()
+
+
+@task("email.application_received")
+def send_application_received(candidate_id: int):
+    with SessionLocal() as db:
+        row = db.query(models.Candidate.name, models.Candidate.email, models.Job.title, models.Job.hr_id) \
+            .join(models.Job, models.Candidate.job_id == models.Job.job_id) \
+            .filter(models.Candidate.candidate_id == candidate_id).first()
+        if row is None:
+            raise PermanentTaskError(f"Candidate {candidate_id} not found")
+        access_token = _access_token(db, row.hr_id)
+
+    content = render_email("application_received", name=row.name, job_title=row.title)
+    send_gmail(access_token, row.email, "Application Submitted", content)
+
+
+@task("email.interview_invites")
+def send_interview_invites(candidate_ids: list, job_id: int, subject: str, hr_name: str, resend_round: int = 1,
+                           invitation: Optional[str] = None):
+    """
+    Send a batch of invites through Gmail's batch endpoint. Recipients that still
+    fail with a retryable error are queued again as a smaller batch (up to
+    INVITE_RESEND_ROUNDS), so delivered candidates are never emailed twice.
+    """
+    with SessionLocal() as db:
+        candidates = db.query(models.Candidate.candidate_id, models.Candidate.name, models.Candidate.email) \
+            .filter(models.Candidate.candidate_id.in_(candidate_ids)).all()
+        hr_id = db.query(models.Job.hr_id).filter(models.Job.job_id == job_id).scalar()
+        access_token = _access_token(db, hr_id)
+
+    template = get_email_template("interview_invite")
+    emails = [
+        OutgoingEmail(
+            recipient=c.email,
+            subject=subject,
+            body=template.render(
+                name=c.name,
+                scheduling_link=f"http://localhost:8081/select-slot/{job_id}/{c.candidate_id}",
+                hr_name=hr_name,
+            ),
+            ref=c.candidate_id,
+        )
+        for c in candidates
+    ]
+    report = summarize(send_bulk(access_token, emails))
+
+    failed = [r for r in report["results"] if not r["ok"]]
+    for r in failed:
+        logger.warning("Invite to candidate %s <%s> failed: %s %s", r["ref"], r["recipient"], r["status_code"], r["error"])
+    resend = sorted(r["ref"] for r in failed if r["retryable"])
+    if resend and resend_round < INVITE_RESEND_ROUNDS:
+        enqueue(
+            "email.interview_invites",
+            {"candidate_ids": resend, "job_id": job_id, "subject": subject, "hr_name": hr_name,
+             "resend_round": resend_round + 1, "invitation": invitation},
+            idempotency_key=_invite_batch_key(job_id, invitation, resend_round + 1, resend),
+            hr_id=hr_id,
+            delay=retry_delay(resend_round),
+        )
+    logger.info("Invites for job %s: %s sent, %s failed, %s requeued", job_id, report["sent"], report["failed"], len(resend))
+    return report
+
+
+@task("email.booking_confirmation")
+def send_booking_confirmation(interview_id: int):
+    with SessionLocal() as db:
+        row = db.query(models.Interview.scheduled_time, models.Interview.meet_link, models.Candidate.name,
+                       models.Candidate.email, models.Job.hr_id) \
+            .join(models.Candidate, models.Interview.candidate_id == models.Candidate.candidate_id) \
+            .join(models.Job, models.Interview.job_id == models.Job.job_id) \
+            .filter(models.Interview.interview_id == interview_id).first()
+        if row is None:
+            raise PermanentTaskError(f"Interview {interview_id} not found")
+        access_token = _access_token(db, row.hr_id)
+
+    # e.g. Monday, Mar 16 at 02:20 PM
+    friendly_time = row.scheduled_time.strftime("%A, %b %d at %I:%M %p")
+    content = render_email("interview_confirmed", name=row.name, time=friendly_time, link=row.meet_link)
+    send_gmail(access_token, row.email, "Interview Confirmed", content)
+
+
+@task("email.booking_failed")
+def send_booking_failed(candidate_id: int, slot_time: str):
+    with SessionLocal() as db:
+        row = db.query(models.Candidate.name, models.Candidate.email, models.Candidate.job_id, models.Job.hr_id) \
+            .join(models.Job, models.Candidate.job_id == models.Job.job_id) \
+            .filter(models.Candidate.candidate_id == candidate_id).first()
+        if row is None:
+            raise PermanentTaskError(f"Candidate {candidate_id} not found")
+        access_token = _access_token(db, row.hr_id)
+
+    scheduling_link = f"http://localhost:8081/select-slot/{row.job_id}/{candidate_id}"
+    content = render_email("booking_failed", name=row.name, time=slot_time, scheduling_link=scheduling_link)
+    send_gmail(access_token, row.email, "Please Pick Another Interview Time", content)
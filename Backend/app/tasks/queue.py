@@ -0,0 +1,252 @@
+import itertools
+import json
+import random
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+from sqlalchemy import select, update, func, or_, and_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.database import SessionLocal
+from app.db.models import TaskQueue
+
+PENDING, RUNNING, DONE, FAILED = "pending", "running", "done", "failed"
+
+# first key of pg_advisory_xact_lock(int, int); the second key is the hr_id
+_HR_LOCK_NAMESPACE = 7341
+
+
+@dataclass
+class Task:
+    id: int
+    name: str
+    payload: Dict[str, Any]
+    attempts: int
+    max_attempts: int
+    hr_id: Optional[int] = None
+    # reclaimed after its lease ran out with no attempts left: fail it instead of running it again
+    lease_expired: bool = False
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def retry_delay(attempts: int) -> timedelta:
+    """Exponential backoff with jitter: base * 2^(attempts-1), capped, scaled by 0.5-1."""
+    delay = min(settings.TASK_RETRY_MAX_SEC, settings.TASK_RETRY_BASE_SEC * 2 ** max(attempts - 1, 0))
+    return timedelta(seconds=delay * random.uniform(0.5, 1.0))
+
+
+class PostgresTaskQueue:
+    """
+    Durable queue on the task_queue table.
+
+    Workers claim one task at a time with FOR UPDATE SKIP LOCKED, so any number
+    of worker processes can share the table. A running task whose lease
+    (TASK_LEASE_SEC) runs out is treated as due again, which covers workers
+    that died mid-task; the lost run counts as an attempt, so a task that
+    keeps hanging is given up on after max_attempts. The per-HR limit is checked under an advisory lock on
+    the hr_id, so two workers cannot both take the last free slot.
+    """
+
+    def __init__(self, session_factory=SessionLocal, hr_concurrency: Optional[int] = None, lease_seconds: Optional[int] = None):
+        self.session_factory = session_factory
+        self.hr_concurrency = settings.TASK_HR_CONCURRENCY if hr_concurrency is None else hr_concurrency
+        self.lease = timedelta(seconds=settings.TASK_LEASE_SEC if lease_seconds is None else lease_seconds)
+
+    def enqueue(self, name: str, payload: Dict[str, Any], idempotency_key: Optional[str] = None, hr_id: Optional[int] = None,
+                delay: Optional[timedelta] = None, max_attempts: Optional[int] = None, db: Optional[Session] = None) -> bool:
+        """
+        Queue a task. Returns False if a task with the same idempotency key
+        already exists. When `db` is given the row joins the caller's
+        transaction and is only visible to workers once the caller commits.
+        """
+        stmt = insert(TaskQueue).values(
+            name=name,
+            payload=json.dumps(payload),
+            idempotency_key=idempotency_key,
+            hr_id=hr_id,
+            status=PENDING,
+            attempts=0,
+            max_attempts=max_attempts or settings.TASK_MAX_ATTEMPTS,
+            run_at=_now() + (delay or timedelta(0)),
+            created_at=_now(),
+        ).on_conflict_do_nothing(index_elements=["idempotency_key"])
+
+        if db is not None:
+            return db.execute(stmt).rowcount > 0
+        with self.session_factory() as own:
+            created = own.execute(stmt).rowcount > 0
+            own.commit()
+            return created
+
+    def _due(self, now: datetime):
+        return or_(
+            and_(TaskQueue.status == PENDING, TaskQueue.run_at <= now),
+            and_(TaskQueue.status == RUNNING, TaskQueue.locked_at < now - self.lease),
+        )
+
+    def _hr_is_full(self, db: Session, hr_id: int, now: datetime) -> bool:
+        db.execute(select(func.pg_advisory_xact_lock(_HR_LOCK_NAMESPACE, hr_id)))
+        running = db.execute(
+            select(func.count()).select_from(TaskQueue).where(
+                TaskQueue.hr_id == hr_id,
+                TaskQueue.status == RUNNING,
+                TaskQueue.locked_at >= now - self.lease,
+            )
+        ).scalar()
+        return running >= self.hr_concurrency
+
+    def claim(self, worker_id: str) -> Optional[Task]:
+        skipped_hrs = set()
+        with self.session_factory() as db:
+            while True:
+                now = _now()
+                stmt = select(TaskQueue).where(self._due(now))
+                if skipped_hrs:
+                    stmt = stmt.where(or_(TaskQueue.hr_id.is_(None), TaskQueue.hr_id.not_in(skipped_hrs)))
+                row = db.execute(
+                    stmt.order_by(TaskQueue.run_at, TaskQueue.id).limit(1).with_for_update(skip_locked=True)
+                ).scalar_one_or_none()
+                if row is None:
+                    return None
+
+                if row.hr_id is not None and self.hr_concurrency and self._hr_is_full(db, row.hr_id, now):
+                    skipped_hrs.add(row.hr_id)
+                    db.rollback()
+                    continue
+
+                # a reclaimed task hung or killed its worker; that counts as an attempt
+                expired = row.status == RUNNING and row.attempts >= row.max_attempts
+                row.status = RUNNING
+                if not expired:
+                    row.attempts += 1
+                row.locked_at = now
+                row.locked_by = worker_id
+                task = Task(row.id, row.name, json.loads(row.payload), row.attempts, row.max_attempts, row.hr_id,
+                            lease_expired=expired)
+                db.commit()
+                return task
+
+    def complete(self, task: Task):
+        with self.session_factory() as db:
+            db.execute(
+                update(TaskQueue).where(TaskQueue.id == task.id)
+                .values(status=DONE, finished_at=_now(), locked_at=None, locked_by=None, last_error=None)
+            )
+            db.commit()
+
+    def fail(self, task: Task, error: str, retry: bool = True):
+        values = {"locked_at": None, "locked_by": None, "last_error": error}
+        if retry and task.attempts < task.max_attempts:
+            values.update(status=PENDING, run_at=_now() + retry_delay(task.attempts))
+        else:
+            values.update(status=FAILED, finished_at=_now())
+        with self.session_factory() as db:
+            db.execute(update(TaskQueue).where(TaskQueue.id == task.id).values(**values))
+            db.commit()
+
+    def purge_finished(self, older_than: timedelta = timedelta(days=7)) -> int:
+        """Delete done and failed tasks finished before `older_than`, which also frees their idempotency keys."""
+        with self.session_factory() as db:
+            deleted = db.query(TaskQueue).filter(
+                TaskQueue.status.in_((DONE, FAILED)), TaskQueue.finished_at < _now() - older_than
+            ).delete(synchronize_session=False)
+            db.commit()
+            return deleted
+
+
+class MemoryTaskQueue:
+    """
+    In-process stand-in with the same interface, for tests and local runs
+    without the task_queue table. Nothing survives a restart, and enqueue
+    ignores `db`, so tasks are visible before the caller commits.
+    """
+
+    def __init__(self, hr_concurrency: Optional[int] = None):
+        self.hr_concurrency = settings.TASK_HR_CONCURRENCY if hr_concurrency is None else hr_concurrency
+        self.tasks: Dict[int, Dict[str, Any]] = {}
+        self._keys: Dict[str, int] = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def enqueue(self, name: str, payload: Dict[str, Any], idempotency_key: Optional[str] = None, hr_id: Optional[int] = None,
+                delay: Optional[timedelta] = None, max_attempts: Optional[int] = None, db: Optional[Session] = None) -> bool:
+        with self._lock:
+            if idempotency_key is not None and idempotency_key in self._keys:
+                return False
+            task_id = next(self._ids)
+            self.tasks[task_id] = {
+                "id": task_id, "name": name, "payload": json.loads(json.dumps(payload)),
+                "idempotency_key": idempotency_key, "hr_id": hr_id, "status": PENDING, "attempts": 0,
+                "max_attempts": max_attempts or settings.TASK_MAX_ATTEMPTS,
+                "run_at": _now() + (delay or timedelta(0)), "last_error": None,
+            }
+            if idempotency_key is not None:
+                self._keys[idempotency_key] = task_id
+            return True
+
+    def claim(self, worker_id: str) -> Optional[Task]:
+        with self._lock:
+            now = _now()
+            running = {}
+            for t in self.tasks.values():
+                if t["status"] == RUNNING and t["hr_id"] is not None:
+                    running[t["hr_id"]] = running.get(t["hr_id"], 0) + 1
+            due = sorted((t for t in self.tasks.values() if t["status"] == PENDING and t["run_at"] <= now),
+                         key=lambda t: (t["run_at"], t["id"]))
+            for t in due:
+                if t["hr_id"] is not None and self.hr_concurrency and running.get(t["hr_id"], 0) >= self.hr_concurrency:
+                    continue
+                t["status"] = RUNNING
+                t["attempts"] += 1
+                return Task(t["id"], t["name"], t["payload"], t["attempts"], t["max_attempts"], t["hr_id"])
+            return None
+
+    def complete(self, task: Task):
+        with self._lock:
+            self.tasks[task.id].update(status=DONE, last_error=None)
+
+    def fail(self, task: Task, error: str, retry: bool = True):
+        with self._lock:
+            t = self.tasks[task.id]
+            t["last_error"] = error
+            if retry and task.attempts < task.max_attempts:
+                t.update(status=PENDING, run_at=_now() + retry_delay(task.attempts))
+            else:
+                t["status"] = FAILED
+
+    def purge_finished(self, older_than: timedelta = timedelta(days=7)) -> int:
+        with self._lock:
+            done = [i for i, t in self.tasks.items() if t["status"] in (DONE, FAILED)]
+            for i in done:
+                self._keys.pop(self.tasks.pop(i)["idempotency_key"], None)
+            return len(done)
+
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+def get_task_queue():
+    global _queue
+    if _queue is None:
+        with _queue_lock:
+            if _queue is None:
+                _queue = MemoryTaskQueue() if settings.TASK_QUEUE_BACKEND == "memory" else PostgresTaskQueue()
+    return _queue
+
+
+def set_task_queue(queue):
+    """Swap the process-wide queue, e.g. for a MemoryTaskQueue in tests."""
+    global _queue
+    _queue = queue
+
+
+def enqueue(name: str, payload: Dict[str, Any], **options) -> bool:
+    return get_task_queue().enqueue(name, payload, **options)
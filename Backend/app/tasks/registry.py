@@ -0,0 +1,37 @@
+from typing import Callable, Dict, Optional
+
+_TASKS: Dict[str, Callable] = {}
+
+
+class PermanentTaskError(Exception):
+    """Raise from a task to mark it failed without further retries."""
+
+
+class RetryableTaskError(Exception):
+    """Raise from a task to retry it with backoff (any other exception does the same)."""
+
+
+def task(name: str, on_failure: Optional[Callable] = None):
+    """
+    Register a function as a queue task. Tasks receive their JSON payload as
+    keyword arguments.
+
+    `on_failure(error, **payload)` runs once when the task is given up on
+    (permanent error or attempts exhausted), to undo what the task was
+    supposed to complete.
+    """
+    def decorator(fn: Callable) -> Callable:
+        if name in _TASKS and _TASKS[name] is not fn:
+            raise ValueError(f"Task {name!r} is already registered")
+        _TASKS[name] = fn
+        fn.task_name = name
+        fn.on_failure = on_failure
+        return fn
+    return decorator
+
+
+def get_task(name: str) -> Callable:
+    try:
+        return _TASKS[name]
+    except KeyError:
+        raise PermanentTaskError(f"Unknown task {name!r}")
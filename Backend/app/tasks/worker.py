@@ -0,0 +1,144 @@
+"""
+Task queue worker.
+
+    python -m app.tasks.worker --concurrency 4
+
+Run as many worker processes as needed; they coordinate through the
+task_queue table. Stops after the running tasks finish on SIGINT/SIGTERM.
+"""
+import argparse
+import logging
+import os
+import signal
+import socket
+import threading
+from datetime import timedelta
+from typing import Optional
+
+from app.core.config import settings
+from app.services.email_templates import precompile_email_templates
+from app.tasks.queue import Task, get_task_queue
+from app.tasks.registry import get_task, PermanentTaskError
+
+# registers the task functions
+import app.tasks.bookings  # noqa: F401
+import app.tasks.notifications  # noqa: F401
+
+logger = logging.getLogger(__name__)
+
+PURGE_INTERVAL_SEC = 3600
+
+
+def _give_up(fn, task: Task, error: str):
+    on_failure = getattr(fn, "on_failure", None)
+    if on_failure is None:
+        return
+    try:
+        on_failure(error, **task.payload)
+    except Exception:
+        logger.exception("Failure handler of task %s %s failed", task.id, task.name)
+
+
+def run_task(queue, task: Task):
+    fn = None
+    try:
+        fn = get_task(task.name)
+        if task.lease_expired:
+            raise PermanentTaskError(f"Lease expired on each of {task.attempts} attempts")
+        fn(**task.payload)
+    except PermanentTaskError as e:
+        logger.warning("Task %s %s failed permanently: %s", task.id, task.name, e)
+        queue.fail(task, str(e), retry=False)
+        _give_up(fn, task, str(e))
+    except Exception as e:
+        logger.exception("Task %s %s failed (attempt %s/%s)", task.id, task.name, task.attempts, task.max_attempts)
+        queue.fail(task, repr(e))
+        if task.attempts >= task.max_attempts:
+            _give_up(fn, task, repr(e))
+    else:
+        queue.complete(task)
+
+
+class Worker:
+    def __init__(self, queue=None, concurrency: Optional[int] = None, poll_interval: Optional[float] = None):
+        self.queue = queue or get_task_queue()
+        self.concurrency = concurrency or settings.TASK_WORKER_CONCURRENCY
+        self.poll_interval = settings.TASK_POLL_INTERVAL_SEC if poll_interval is None else poll_interval
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._stop = threading.Event()
+        self._threads = []
+
+    def _loop(self, n: int):
+        worker_id = f"{self.worker_id}:{n}"
+        while not self._stop.is_set():
+            try:
+                task = self.queue.claim(worker_id)
+            except Exception:
+                logger.exception("Claiming a task failed")
+                task = None
+            if task is None:
+                self._stop.wait(self.poll_interval)
+                continue
+            run_task(self.queue, task)
+
+    def _purge_loop(self):
+        # finished rows would otherwise pile up and keep their idempotency keys reserved forever
+        retention = timedelta(days=float(settings.TASK_RETENTION_DAYS))
+        while True:
+            try:
+                purged = self.queue.purge_finished(retention)
+                if purged:
+                    logger.info("Purged %s finished tasks", purged)
+            except Exception:
+                logger.exception("Purging finished tasks failed")
+            if self._stop.wait(PURGE_INTERVAL_SEC):
+                return
+
+    def start(self):
+        precompile_email_templates()
+        for n in range(self.concurrency):
+            thread = threading.Thread(target=self._loop, args=(n,), name=f"task-worker-{n}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        thread = threading.Thread(target=self._purge_loop, name="task-worker-purge", daemon=True)
+        thread.start()
+        self._threads.append(thread)
+
+    def stop(self, timeout: Optional[float] = None):
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def run_pending(self) -> int:
+        """Run due tasks in the calling thread until none are claimable. Returns how many ran."""
+        ran = 0
+        while (task := self.queue.claim(f"{self.worker_id}:inline")) is not None:
+            run_task(self.queue, task)
+            ran += 1
+        return ran
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the background task worker.")
+    parser.add_argument("--concurrency", type=int, default=settings.TASK_WORKER_CONCURRENCY)
+    parser.add_argument("--poll-interval", type=float, default=settings.TASK_POLL_INTERVAL_SEC)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    worker = Worker(concurrency=args.concurrency, poll_interval=args.poll_interval)
+
+    stopping = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stopping.set())
+    signal.signal(signal.SIGINT, lambda *_: stopping.set())
+
+    worker.start()
+    logger.info("Worker %s started with %s threads", worker.worker_id, worker.concurrency)
+    while not stopping.wait(60):  # a timed wait keeps the main thread responsive to signals
+        pass
+    logger.info("Stopping worker %s", worker.worker_id)
+    worker.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+"""
+Populate candidate_skill (and the skill taxonomy) from the comma-joined
+skills already stored on candidates and resume parsings. New resumes are
+linked by the analyzer as they are parsed; this covers the rows from before
+the table existed. Idempotent, commits per batch, and can resume:
+
+    python scripts/backfill_candidate_skills.py --batch-size 2000 --after-id 0
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy.orm import Session
+
+from app.database import engine
+from app.services.skills import backfill_candidate_skills
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--after-id", type=int, default=0, help="skip candidates up to this candidate_id")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    with Session(engine) as db:
+        done = backfill_candidate_skills(db, batch_size=args.batch_size, after_id=args.after_id)
+    print(f"linked skills for {done} candidates in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Benchmark the "selected candidates without an interview" query as the
+interview table grows, comparing the old global NOT IN subquery with the
+job-scoped NOT EXISTS anti-join used for scheduling and bulk invites.
+
+Filler jobs, candidates and interviews are inserted inside a transaction that
+is rolled back at the end, so this is safe to run against a dev database:
+
+    python scripts/bench_candidates_without_interview.py --sizes 0 10000 100000
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy import select, text
+from sqlalchemy.orm import Session
+
+from app.database import engine
+from app.db import models
+from app.services.candidate import candidates_without_interview_query
+
+
+def not_in_query(hr_id: int, job_id: int):
+    return (
+        select(models.Candidate)
+        .join(models.Job, models.Candidate.job_id == models.Job.job_id)
+        .where(models.Job.hr_id == hr_id, models.Candidate.job_id == job_id)
+        .where(models.Candidate.selected_for_interview == True)
+        .where(~models.Candidate.candidate_id.in_(select(models.Interview.candidate_id)))
+    )
+
+
+def timed(db: Session, stmt, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        db.execute(stmt).scalars().all()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def seed(db: Session, hr_id: int, company_id: int, candidates: int):
+    """Target job with `candidates` selected candidates plus a filler job whose candidates get the interviews."""
+    ids = {}
+    for name in ("target", "filler"):
+        job = models.Job(hr_id=hr_id, company_id=company_id, title=f"bench {name}")
+        db.add(job)
+        db.flush()
+        ids[name] = job.job_id
+        db.execute(text(
+            "INSERT INTO candidate (job_id, company_id, name, email, selected_for_interview) "
+            "SELECT :job, :co, 'bench ' || g, 'bench' || g || '@example.com', true FROM generate_series(1, :n) g"
+        ), {"job": ids[name], "co": company_id, "n": candidates})
+    return ids["target"], ids["filler"]
+
+
+def grow_interviews(db: Session, filler_job_id: int, count: int):
+    if count <= 0:
+        return
+    # Filler candidates were inserted in one statement, so their ids are contiguous.
+    db.execute(text(
+        "INSERT INTO interview (candidate_id, job_id, status, scheduled_time, created_at) "
+        "SELECT r.lo + g % (r.hi - r.lo + 1), :job, 'Scheduled', now(), now() "
+        "FROM generate_series(1, :n) g, "
+        "(SELECT min(candidate_id) lo, max(candidate_id) hi FROM candidate WHERE job_id = :job) r"
+    ), {"job": filler_job_id, "n": count})
+    db.execute(text("ANALYZE interview"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[0, 10_000, 50_000, 200_000],
+                        help="total interview rows to add, cumulative steps")
+    parser.add_argument("--candidates", type=int, default=1000, help="candidates in the target job")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with Session(engine) as db:
+        hr = db.query(models.HRManager).first()
+        if hr is None:
+            sys.exit("Need at least one HR manager to attach the benchmark jobs to.")
+        target_job, filler_job = seed(db, hr.id, hr.company_id, args.candidates)
+
+        print(f"{'interviews':>12} {'NOT IN ms':>10} {'NOT EXISTS ms':>14}")
+        added = 0
+        for size in sorted(args.sizes):
+            grow_interviews(db, filler_job, size - added)
+            added = max(added, size)
+            old = timed(db, not_in_query(hr.id, target_job), args.repeat)
+            new = timed(db, candidates_without_interview_query(hr.id, target_job), args.repeat)
+            print(f"{added:>12} {old:>10.2f} {new:>14.2f}")
+
+        db.rollback()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Precision/recall of skill normalization on a labelled set, against the
+previous substring/gazetteer matching as a baseline:
+
+  canonical  whole-name lookups ("k8s" -> Kubernetes, "Excel" -> unknown)
+  find       skills mentioned in resume text
+  match      resume skills a requirements text asks for
+
+Labels only cover skills in the taxonomy; discovering unknown skills is the
+NLP step's job. Add cases to scripts/data/skill_normalization_eval.json.
+
+    python scripts/eval_skill_normalizer.py [--cases path] [--verbose]
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.analyzer.skill_normalizer import skill_normalizer
+from app.analyzer.skill_taxonomy import SKILL_TAXONOMY
+
+DEFAULT_CASES = os.path.join(os.path.dirname(__file__), "data", "skill_normalization_eval.json")
+
+# The gazetteer extract_skills used before the normalizer, for the baseline.
+LEGACY_SKILL_DB = {
+    "python", "java", "c++", "c#", "javascript", "typescript", "ruby", "php", "swift", "kotlin", "go", "rust", "sql", "html", "css",
+    "react", "angular", "vue", "node.js", "django", "flask", "fastapi", "spring", "spring boot", "net core", "laravel", "pandas", "numpy", "scikit-learn", "tensorflow", "pytorch", "keras",
+    "docker", "kubernetes", "aws", "azure", "gcp", "git", "jenkins", "jira", "linux", "unix", "redis", "mongodb", "postgresql", "mysql", "oracle",
+    "machine learning", "deep learning", "nlp", "computer vision", "data science", "agile", "scrum", "devops", "ci/cd", "rest api", "graphql", "microservices",
+}
+_LEGACY_KEYS = {name.casefold().lstrip("."): name for name in SKILL_TAXONOMY}
+
+
+def legacy_canonical(name):
+    lowered = name.strip().lower()
+    return _LEGACY_KEYS.get(lowered) if lowered in LEGACY_SKILL_DB else None
+
+
+def legacy_find(text):
+    lowered = text.lower()
+    return [_LEGACY_KEYS[s] for s in LEGACY_SKILL_DB if re.search(r"\b" + re.escape(s) + r"\b", lowered)]
+
+
+def legacy_match(skills, requirements):
+    req_lower = requirements.lower()
+    return [s.strip() for s in skills.split(",") if s.strip().lower() in req_lower]
+
+
+def key(name):
+    return (name or "").casefold()
+
+
+class Score:
+    def __init__(self):
+        self.tp = self.fp = self.fn = 0
+
+    def add(self, predicted, expected):
+        predicted, expected = {key(p) for p in predicted if p}, {key(e) for e in expected if e}
+        self.tp += len(predicted & expected)
+        self.fp += len(predicted - expected)
+        self.fn += len(expected - predicted)
+        return predicted - expected, expected - predicted
+
+    def row(self, label):
+        precision = self.tp / (self.tp + self.fp) if self.tp + self.fp else 1.0
+        recall = self.tp / (self.tp + self.fn) if self.tp + self.fn else 1.0
+        f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+        return f"{label:<22} {precision:>9.3f} {recall:>7.3f} {f1:>6.3f}   (tp={self.tp} fp={self.fp} fn={self.fn})"
+
+
+def evaluate(cases, canonical, find, match, verbose=False, label=""):
+    scores = {task: Score() for task in ("canonical", "find", "match")}
+    problems = []
+    for name, expected in cases["canonical"]:
+        extra, missed = scores["canonical"].add([canonical(name)], [expected])
+        if extra or missed:
+            problems.append(f"canonical {name!r}: got {canonical(name)!r}, want {expected!r}")
+    for case in cases["find"]:
+        extra, missed = scores["find"].add(find(case["text"]), case["skills"])
+        if extra or missed:
+            problems.append(f"find {case['text'][:50]!r}: extra {sorted(extra)} missed {sorted(missed)}")
+    for case in cases["match"]:
+        extra, missed = scores["match"].add(match(case["skills"], case["requirements"]), case["expected"])
+        if extra or missed:
+            problems.append(f"match {case['skills']!r} vs {case['requirements']!r}: extra {sorted(extra)} missed {sorted(missed)}")
+    for task, score in scores.items():
+        print(score.row(f"{label} {task}"))
+    if verbose:
+        for problem in problems:
+            print("   ", problem)
+    return scores
+
+
+def timed(fn, inputs, repeat=200):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for value in inputs:
+            fn(value)
+    return (time.perf_counter() - start) / (repeat * len(inputs)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cases", default=DEFAULT_CASES)
+    parser.add_argument("--verbose", action="store_true", help="list every miss")
+    args = parser.parse_args()
+
+    with open(args.cases) as f:
+        cases = json.load(f)
+    print(f"{len(cases['canonical'])} lookups, {len(cases['find'])} texts, {len(cases['match'])} matches\n")
+    print(f"{'':<22} {'precision':>9} {'recall':>7} {'f1':>6}")
+    evaluate(cases, legacy_canonical, legacy_find, legacy_match, args.verbose, "legacy")
+    evaluate(cases, skill_normalizer.canonical, skill_normalizer.find, skill_normalizer.match, args.verbose, "normalizer")
+
+    names = [name for name, _ in cases["canonical"]]
+    texts = [case["text"] for case in cases["find"]]
+    print()
+    print(f"canonical lookup  legacy {timed(legacy_canonical, names):6.2f} us   normalizer {timed(skill_normalizer.canonical, names):6.2f} us")
+    print(f"find per text     legacy {timed(legacy_find, texts, 20):6.1f} us   normalizer {timed(skill_normalizer.find, texts, 20):6.1f} us")
+
+
+if __name__ == "__main__":
+    main()
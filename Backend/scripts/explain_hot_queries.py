@@ -0,0 +1,120 @@
+"""
+EXPLAIN the hot list/lookup queries and report which ones still scan tables.
+
+Uses DATABASE_URL from the environment (.env) like the app. Sample ids are
+taken from existing rows. On small dev databases the planner prefers
+sequential scans regardless of indexes, so pass --no-seqscan there to check
+that every query *can* be served by an index:
+
+    python scripts/explain_hot_queries.py --no-seqscan --strict
+"""
+import argparse
+import json
+import os
+import sys
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy import select, text, desc, asc
+from sqlalchemy.dialects import postgresql
+
+from app.database import engine
+from app.db import models
+from app.services.candidate import candidate_page_query, DEFAULT_CANDIDATE_LIST_FIELDS
+
+# Tables large enough that a sequential scan is a problem.
+LARGE_TABLES = {"candidate", "interview", "resume_parsing", "answer", "job"}
+
+
+def sample_ids(conn):
+    row = conn.execute(text(
+        "SELECT c.job_id, c.company_id, c.candidate_id, c.email, j.hr_id "
+        "FROM candidate c JOIN job j ON j.job_id = c.job_id LIMIT 1"
+    )).first()
+    if row is None:
+        sys.exit("No candidates found; load some data before explaining queries.")
+    return row
+
+
+def hot_queries(job_id, company_id, candidate_id, email, hr_id):
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    Candidate, Interview, Job = models.Candidate, models.Interview, models.Job
+    return {
+        "candidates by job (keyset page)": candidate_page_query(DEFAULT_CANDIDATE_LIST_FIELDS, 50, job_id=job_id),
+        "candidates by company (keyset page)": candidate_page_query(DEFAULT_CANDIDATE_LIST_FIELDS, 50, company_id=company_id),
+        "selected for interview by job": select(Candidate).where(Candidate.job_id == job_id, Candidate.selected_for_interview == True),
+        "interviewed by job": select(Candidate).where(Candidate.job_id == job_id, Candidate.interviewed == True),
+        "selected by job": select(Candidate).where(Candidate.job_id == job_id, Candidate.selected == True),
+        "candidate by email": select(Candidate).where(Candidate.email == email),
+        "dashboard next interview": (
+            select(Interview).join(Job, Interview.job_id == Job.job_id)
+            .where(Job.hr_id == hr_id, Interview.status == "Scheduled", Interview.scheduled_time >= now)
+            .order_by(asc(Interview.scheduled_time)).limit(1)
+        ),
+        "latest interview for candidate": (
+            select(Interview)
+            .where(Interview.candidate_id == candidate_id, Interview.status == "Scheduled")
+            .order_by(desc(Interview.scheduled_time)).limit(1)
+        ),
+        "interviews by job": select(Interview).where(Interview.job_id == job_id),
+        "resume parsing by candidate": select(models.ResumeParsing).where(models.ResumeParsing.candidate_id == candidate_id),
+        "answers by candidate": select(models.Answer).where(models.Answer.candidate_id == candidate_id),
+        "jobs by company": select(Job).where(Job.company_id == company_id),
+        "selected availability": (
+            select(models.HRAvailability)
+            .where(models.HRAvailability.hr_id == hr_id, models.HRAvailability.is_selected == True)
+        ),
+    }
+
+
+def walk(plan):
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from walk(child)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--analyze", action="store_true", help="run EXPLAIN ANALYZE (executes the queries)")
+    parser.add_argument("--no-seqscan", action="store_true", help="SET enable_seqscan = off for this session")
+    parser.add_argument("--strict", action="store_true", help="exit 1 if any query seq-scans a large table")
+    args = parser.parse_args()
+
+    options = "FORMAT JSON, ANALYZE, BUFFERS" if args.analyze else "FORMAT JSON"
+    failures = []
+
+    with engine.connect() as conn:
+        if args.no_seqscan:
+            conn.execute(text("SET enable_seqscan = off"))
+
+        for name, stmt in hot_queries(*sample_ids(conn)).items():
+            sql = str(stmt.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+            plan = conn.execute(text(f"EXPLAIN ({options}) {sql}")).scalar()
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            root = plan[0]["Plan"]
+
+            nodes = list(walk(root))
+            indexes = sorted({n["Index Name"] for n in nodes if "Index Name" in n})
+            seq_scans = sorted({n["Relation Name"] for n in nodes if n["Node Type"] == "Seq Scan"})
+            bad = [t for t in seq_scans if t in LARGE_TABLES]
+
+            status = "SEQ SCAN" if bad else "ok"
+            timing = f" {plan[0]['Execution Time']:.2f}ms" if args.analyze else ""
+            print(f"[{status:8}] {name}: cost={root['Total Cost']:.1f}{timing}")
+            if indexes:
+                print(f"           indexes: {', '.join(indexes)}")
+            if seq_scans:
+                print(f"           seq scans: {', '.join(seq_scans)}")
+            if bad:
+                failures.append(name)
+
+    if failures:
+        print(f"\n{len(failures)} queries scan large tables: {', '.join(failures)}")
+        if args.strict:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
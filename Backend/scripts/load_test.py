@@ -0,0 +1,69 @@
+"""
+Concurrency load test for the read endpoints.
+
+Fires a fixed number of requests at each path with N in-flight at a time and
+reports throughput and latency percentiles. Run it against a single uvicorn
+worker before and after a change to compare how far concurrency scales:
+
+    python scripts/load_test.py --base-url http://localhost:8000 \\
+        --token <HR access token> --concurrency 200 --requests 2000 \\
+        /candidates/by-job/1 /jobs/get-all
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+
+async def run_path(client: httpx.AsyncClient, path: str, total: int, concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    errors = 0
+
+    async def one():
+        nonlocal errors
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                resp = await client.get(path)
+                if resp.status_code >= 400:
+                    errors += 1
+            except httpx.HTTPError:
+                errors += 1
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(total)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    pct = lambda p: latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000
+    print(
+        f"{path}\n"
+        f"  requests={total} concurrency={concurrency} errors={errors}\n"
+        f"  throughput={total / elapsed:.1f} req/s\n"
+        f"  latency ms: mean={statistics.mean(latencies) * 1000:.1f} "
+        f"p50={pct(0.50):.1f} p95={pct(0.95):.1f} p99={pct(0.99):.1f}"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("paths", nargs="+")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--token", default=None, help="HR bearer token for authenticated endpoints")
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=1000)
+    args = parser.parse_args()
+
+    headers = {"Authorization": f"Bearer {args.token}"} if args.token else {}
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.base_url, headers=headers, limits=limits, timeout=60) as client:
+        for path in args.paths:
+            await run_path(client, path, args.requests, args.concurrency)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
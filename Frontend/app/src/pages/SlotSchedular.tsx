@@ -22,7 +22,7 @@ const InterviewScheduler: React.FC = () => {
   const [bookingLoading, setBookingLoading] = useState(false);
   const [error, setError] = useState<string | null>(null);
   const [isExpired, setIsExpired] = useState(false);
-  const [successData, setSuccessData] = useState<{ link: string; time: string } | null>(null);
+  const [successData, setSuccessData] = useState<{ link: string | null; time: string } | null>(null);
 
   // Helper function to format 24h string (e.g. "14:30") to 12h string ("2:30 PM")
   const formatTo12Hour = (time24: string) => {
@@ -114,9 +114,13 @@ const InterviewScheduler: React.FC = () => {
             <p className="text-xs font-bold text-slate-400 uppercase tracking-widest">Meeting Details</p>
             <div className="flex items-center justify-center gap-2 text-blue-600 font-medium">
               <Video size={18} />
-              <a href={successData.link} target="_blank" rel="noreferrer" className="hover:underline">
-                Join Google Meet
-              </a>
+              {successData.link ? (
+                <a href={successData.link} target="_blank" rel="noreferrer" className="hover:underline">
+                  Join Google Meet
+                </a>
+              ) : (
+                <span>Your Google Meet link will be emailed to you shortly</span>
+              )}
             </div>
           </div>
           <p className="text-xs text-slate-400 mt-6">
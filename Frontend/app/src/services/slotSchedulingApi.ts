@@ -17,7 +17,10 @@ export interface BookSlotRequest {
 export interface BookingConfirmation {
   status: string;
   message: string;
-  meet_link: string;
+  interview_id: number;
+  // created in the background; the Meet link arrives by email
+  meet_link: string | null;
+  scheduled_at: string;
 }
 
 export interface BulkInvitePayload {